@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='last_checkin_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,90 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:43
+
+import core.ids
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+from django.utils.dateparse import parse_datetime
+from django.utils.text import slugify
+
+
+def copy_json_awards(apps, schema_editor):
+    """Move the UserProfile.badges/achievements JSON lists into award rows."""
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    Badge = apps.get_model('authentication', 'Badge')
+    UserBadge = apps.get_model('authentication', 'UserBadge')
+
+    badges = {}
+    awards = []
+    profiles = UserProfile.objects.values_list('user_id', 'badges', 'achievements')
+    for user_id, badge_list, achievement_list in profiles.iterator():
+        for kind, items in (('badge', badge_list), ('achievement', achievement_list)):
+            for item in items if isinstance(items, list) else []:
+                code = slugify(str(item.get('id', '')))[:64]
+                if not code:
+                    continue
+                if code not in badges:
+                    badges[code], _ = Badge.objects.get_or_create(code=code, defaults={
+                        'kind': kind,
+                        'name': item.get('name') or code,
+                        'description': item.get('description') or '',
+                    })
+                awarded_at = parse_datetime(item.get('awarded_at') or '') or django.utils.timezone.now()
+                awards.append(UserBadge(user_id=user_id, badge=badges[code], awarded_at=awarded_at))
+    UserBadge.objects.bulk_create(awards, ignore_conflicts=True, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0003_time_ordered_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Badge',
+            fields=[
+                ('id', models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('code', models.SlugField(max_length=64, unique=True)),
+                ('kind', models.CharField(choices=[('badge', 'Badge'), ('achievement', 'Achievement')], default='badge', max_length=16)),
+                ('name', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='UserBadge',
+            fields=[
+                ('id', models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('awarded_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('badge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='awards', to='authentication.badge')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='awards', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['awarded_at'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='userbadge',
+            constraint=models.UniqueConstraint(fields=('user', 'badge'), name='unique_user_badge'),
+        ),
+        migrations.RunPython(copy_json_awards, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='achievements',
+        ),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='badges',
+        ),
+    ]
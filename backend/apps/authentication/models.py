@@ -1,8 +1,30 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
-from core.models import BaseModel
+from django.utils import timezone
+from django.utils.text import slugify
+from core.models import ActiveManager, BaseModel, BaseQuerySet
+from core.realtime import publish
+from core.user_cache import forget_unknown, invalidate_user, invalidate_users
 from django.utils.translation import gettext_lazy as _
 
+class CachedUserQuerySet(BaseQuerySet):
+    """
+    Set-based soft delete and restore that also drop the cached entries
+    (``core.user_cache``) of the users whose rows they change.
+    """
+    user_field = 'pk'
+
+    def _set_active(self, active):
+        user_ids = list(self.values_list(self.user_field, flat=True))
+        count = super()._set_active(active)
+        invalidate_users(user_ids)
+        return count
+
+
+class ProfileQuerySet(CachedUserQuerySet):
+    user_field = 'user_id'
+
+
 class User(AbstractUser, BaseModel):
     """
     Custom user model that extends Django's AbstractUser and our BaseModel.
@@ -21,6 +43,9 @@ class User(AbstractUser, BaseModel):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['username']  # Email & password are required by default
 
+    objects = UserManager()
+    all_objects = CachedUserQuerySet.as_manager()
+
     class Meta:
         verbose_name = _('user')
         verbose_name_plural = _('users')
@@ -29,6 +54,15 @@ class User(AbstractUser, BaseModel):
     def __str__(self):
         return self.email
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_user(self.pk)
+        forget_unknown(self.username)
+
+    def _set_active(self, active):
+        super()._set_active(active)
+        invalidate_user(self.pk)
+
     def get_full_name(self):
         """
         Return the first_name plus the last_name, with a space in between.
@@ -59,55 +93,114 @@ class UserProfile(BaseModel):
     progress_points = models.IntegerField(default=0)
     streak_count = models.IntegerField(default=0)
     last_checkin = models.DateTimeField(null=True, blank=True)
+    last_checkin_date = models.DateField(null=True, blank=True)  # Local calendar day
     completed_exercises = models.IntegerField(default=0)
     completed_quizzes = models.IntegerField(default=0)
-    badges = models.JSONField(default=list)
     preferences = models.JSONField(default=dict)
     goals = models.JSONField(default=list)
-    achievements = models.JSONField(default=list)
+
+    objects = ActiveManager.from_queryset(ProfileQuerySet)()
+    all_objects = ProfileQuerySet.as_manager()
 
     def __str__(self):
         return f"Profile for {self.user.email}"
 
-    def update_streak(self):
-        """Update the user's streak count."""
-        from django.utils import timezone
-        now = timezone.now()
-        
-        if not self.last_checkin:
-            self.streak_count = 1
-        else:
-            time_diff = now - self.last_checkin
-            if time_diff.days == 1:
-                self.streak_count += 1
-            elif time_diff.days > 1:
-                self.streak_count = 1
-        
-        self.last_checkin = now
-        self.save()
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        invalidate_user(self.user_id)
+
+    def _set_active(self, active):
+        super()._set_active(active)
+        invalidate_user(self.user_id)
+
+    def update_streak(self, timestamp=None):
+        """
+        Record a check-in at ``timestamp`` (default: now) in the user's streak.
+
+        See ``apps.checkins.streaks`` for the atomic, timezone-aware rules.
+        """
+        from apps.checkins.streaks import record_checkins
+        record_checkins(self.user, [timestamp or timezone.now()])
+        self.refresh_from_db(fields=['streak_count', 'last_checkin', 'last_checkin_date'])
 
     def add_badge(self, badge_data):
-        """Add a new badge to the user's collection."""
-        if not isinstance(self.badges, list):
-            self.badges = []
-        
-        self.badges.append({
-            'id': badge_data['id'],
-            'name': badge_data['name'],
-            'description': badge_data['description'],
-            'awarded_at': timezone.now().isoformat()
-        })
-        self.save()
+        """Award a badge to the user, defining it on first use."""
+        Badge.define(badge_data, kind=Badge.BADGE).award_to([self.user_id])
 
     def add_achievement(self, achievement_data):
-        """Add a new achievement to the user's collection."""
-        if not isinstance(self.achievements, list):
-            self.achievements = []
-        
-        self.achievements.append({
-            'id': achievement_data['id'],
-            'name': achievement_data['name'],
-            'description': achievement_data['description'],
-            'awarded_at': timezone.now().isoformat()
+        """Award an achievement to the user, defining it on first use."""
+        Badge.define(achievement_data, kind=Badge.ACHIEVEMENT).award_to([self.user_id])
+
+
+class Badge(BaseModel):
+    """
+    A badge or achievement that can be awarded to users.
+    """
+    BADGE = 'badge'
+    ACHIEVEMENT = 'achievement'
+    KIND_CHOICES = [
+        (BADGE, _('Badge')),
+        (ACHIEVEMENT, _('Achievement')),
+    ]
+
+    code = models.SlugField(max_length=64, unique=True)
+    kind = models.CharField(max_length=16, choices=KIND_CHOICES, default=BADGE)
+    name = models.CharField(max_length=100)
+    description = models.TextField(blank=True)
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def define(cls, data, kind=BADGE):
+        """Return the badge for ``data['id']``, creating it if needed."""
+        badge, _ = cls.all_objects.get_or_create(
+            code=slugify(str(data['id']))[:64],
+            defaults={'kind': kind, 'name': data['name'],
+                      'description': data.get('description', '')},
+        )
+        return badge
+
+    def award_to(self, users, awarded_at=None):
+        """
+        Grant this badge to ``users`` (a User queryset, or users/ids) who do
+        not hold it yet, in one SELECT and one INSERT, and notify only them.
+        Returns the number of users newly awarded.
+        """
+        if isinstance(users, models.QuerySet):
+            user_ids = list(users.exclude(awards__badge=self).values_list('pk', flat=True))
+        else:
+            user_ids = list(dict.fromkeys(getattr(user, 'pk', user) for user in users))
+            held = set(UserBadge.all_objects.filter(badge=self, user_id__in=user_ids)
+                       .values_list('user_id', flat=True))
+            user_ids = [user_id for user_id in user_ids if user_id not in held]
+        if not user_ids:
+            return 0
+        awarded_at = awarded_at or timezone.now()
+        # A concurrent award of the same badge is still skipped by the unique constraint.
+        UserBadge.objects.bulk_create([
+            UserBadge(user_id=user_id, badge=self, awarded_at=awarded_at) for user_id in user_ids
+        ], ignore_conflicts=True)
+        publish(user_ids, 'badge', {
+            'code': self.code, 'kind': self.kind, 'name': self.name,
+            'description': self.description, 'awarded_at': awarded_at,
         })
-        self.save() 
\ No newline at end of file
+        return len(user_ids)
+
+
+class UserBadge(BaseModel):
+    """
+    A badge or achievement held by a user.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='awards')
+    badge = models.ForeignKey(Badge, on_delete=models.CASCADE, related_name='awards')
+    awarded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['awarded_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'badge'], name='unique_user_badge'),
+        ]
+
+    def __str__(self):
+        return f"{self.badge} for {self.user_id}"
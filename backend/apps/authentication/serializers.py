@@ -1,10 +1,15 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
 from django.contrib.auth.password_validation import validate_password
-from .models import UserProfile
+from django.db.models import Prefetch
+from core.serialization import compile_serializer
+from .models import Badge, UserBadge, UserProfile
 
 User = get_user_model()
 
+# Prefetch for User querysets serialized with UserSerializer.
+AWARDS_PREFETCH = Prefetch('awards', queryset=UserBadge.objects.select_related('badge'))
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration.
@@ -27,15 +32,45 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         UserProfile.objects.create(user=user)
         return user
 
+class UserBadgeSerializer(serializers.ModelSerializer):
+    """
+    Serializer for an awarded badge or achievement.
+    """
+    id = serializers.CharField(source='badge.code')
+    name = serializers.CharField(source='badge.name')
+    description = serializers.CharField(source='badge.description')
+
+    class Meta:
+        model = UserBadge
+        fields = ('id', 'name', 'description', 'awarded_at')
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for user profile information.
+
+    Badges and achievements are read from ``user.awards``; views should
+    prefetch them with ``AWARDS_PREFETCH``.
     """
+    badges = serializers.SerializerMethodField()
+    achievements = serializers.SerializerMethodField()
+
     class Meta:
         model = UserProfile
         fields = '__all__'
         read_only_fields = ('user', 'progress_points', 'streak_count', 'completed_exercises', 
-                          'completed_quizzes', 'badges', 'achievements')
+                          'completed_quizzes')
+
+    def _awards(self, profile, kind):
+        serialize_award = compile_serializer(UserBadgeSerializer)
+        return [serialize_award(award) for award in profile.user.awards.all()
+                if award.badge.kind == kind]
+
+    def get_badges(self, profile):
+        return self._awards(profile, Badge.BADGE)
+
+    def get_achievements(self, profile):
+        return self._awards(profile, Badge.ACHIEVEMENT)
 
 class UserSerializer(serializers.ModelSerializer):
     """
@@ -49,6 +84,14 @@ class UserSerializer(serializers.ModelSerializer):
                  'bio', 'date_of_birth', 'timezone', 'notification_preferences', 'profile')
         read_only_fields = ('email',)
 
+
+def serialize_user(user):
+    """
+    Fast path for ``UserSerializer(user).data`` on hot reads. Same output;
+    load ``profile`` with the user and prefetch ``AWARDS_PREFETCH`` first.
+    """
+    return compile_serializer(UserSerializer)(user)
+
 class PasswordChangeSerializer(serializers.Serializer):
     """
     Serializer for password change.
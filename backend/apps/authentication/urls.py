@@ -4,7 +4,7 @@ from . import views
 app_name = 'authentication'
 
 urlpatterns = [
-    path('login/', views.UserLoginView.as_view(), name='login'),
+    path('login/', views.user_login, name='login'),
     path('logout/', views.UserLogoutView.as_view(), name='logout'),
     path('profile/', views.UserProfileView.as_view(), name='profile'),
     path('profile/update/', views.UserProfileUpdateView.as_view(), name='profile-update'),
@@ -1,48 +1,84 @@
+import json
+from asgiref.sync import sync_to_async
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from django.contrib.auth import get_user_model, login, logout
-from django.core.exceptions import ObjectDoesNotExist
+from django.contrib.auth import alogin, get_user_model, logout
+from django.db.models import prefetch_related_objects
+from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
-from django.utils.decorators import method_decorator
+from django.views.decorators.http import require_POST
+from core.passwords import PasswordVerifierBusy, dummy_hash, get_verifier
+from core.throttling import throttle
+from core.user_cache import aremember_unknown, ais_unknown, invalidate_user
 from .serializers import (
+    AWARDS_PREFETCH,
     UserSerializer,
     PasswordChangeSerializer,
+    serialize_user,
 )
 
 User = get_user_model()
 
-@method_decorator(csrf_exempt, name='dispatch')
-class UserLoginView(APIView):
+async def _read_credentials(request):
+    if request.content_type == 'application/json':
+        try:
+            body = json.loads(request.body or b'{}')
+        except ValueError:
+            return None, None
+        return body.get('username'), body.get('password')
+    return request.POST.get('username'), request.POST.get('password')
+
+
+@csrf_exempt
+@require_POST
+@throttle('login', key='ip')
+async def user_login(request):
     """
     Simple login for personal use.
+
+    Identifiers that recently matched no user skip the user query (cached),
+    but every attempt, known user or not, checks one password hash on the
+    bounded verifier pool (``core.passwords``) instead of the request worker,
+    so failures take the same time. Hashes are upgraded if the hashing
+    policy changed.
     """
-    permission_classes = (permissions.AllowAny,)
+    username, password = await _read_credentials(request)
 
-    def post(self, request):
-        username = request.data.get('username')
-        password = request.data.get('password')
+    if not username or not password:
+        return JsonResponse({"error": "Username and password required"}, status=400)
 
-        if not username or not password:
-            return Response({"error": "Username and password required"}, status=status.HTTP_400_BAD_REQUEST)
+    user = None
+    if not await ais_unknown(username):
+        user = await User.objects.select_related('profile').filter(username=username).afirst()
+        if user is None:
+            await aremember_unknown(username)
 
-        try:
-            user = User.objects.get(username=username)
-        except ObjectDoesNotExist:
-            return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
+    try:
+        encoded = user.password if user is not None else dummy_hash()
+        valid, new_hash = await get_verifier().acheck(password, encoded)
+    except PasswordVerifierBusy:
+        response = JsonResponse({"error": "Too many login attempts, try again shortly"}, status=429)
+        response['Retry-After'] = '1'
+        return response
 
-        if not user.check_password(password):
-            return Response({"error": "Invalid credentials"}, status=status.HTTP_401_UNAUTHORIZED)
+    if user is None or not valid:
+        return JsonResponse({"error": "Invalid credentials"}, status=401)
 
-        if not user.is_active:
-            return Response({"error": "User account is disabled"}, status=status.HTTP_401_UNAUTHORIZED)
+    if not user.is_active:
+        return JsonResponse({"error": "User account is disabled"}, status=401)
 
-        login(request, user)
-        
-        return Response({
-            "user": UserSerializer(user).data,
-            "message": "Login successful"
-        })
+    if new_hash:
+        user.password = new_hash
+        await user.asave(update_fields=['password'])
+
+    await alogin(request, user)
+    await sync_to_async(prefetch_related_objects)([user], AWARDS_PREFETCH)
+
+    return JsonResponse({
+        "user": serialize_user(user),
+        "message": "Login successful"
+    })
 
 class UserLogoutView(APIView):
     """
@@ -51,6 +87,7 @@ class UserLogoutView(APIView):
     permission_classes = (permissions.IsAuthenticated,)
 
     def post(self, request):
+        invalidate_user(request.user.pk)
         logout(request)
         return Response({"message": "Logout successful"})
 
@@ -62,7 +99,14 @@ class UserProfileView(generics.RetrieveAPIView):
     serializer_class = UserSerializer
 
     def get_object(self):
-        return self.request.user
+        user = self.request.user
+        prefetch_related_objects([user], 'profile', AWARDS_PREFETCH)
+        return user
+
+    def retrieve(self, request, *args, **kwargs):
+        # The session user arrives with its profile (core.authentication), so
+        # this is one awards query plus the precompiled serializer.
+        return Response(serialize_user(self.get_object()))
 
 class UserProfileUpdateView(generics.UpdateAPIView):
     """
@@ -80,6 +124,7 @@ class UserProfileUpdateView(generics.UpdateAPIView):
         
         if serializer.is_valid():
             serializer.save()
+            invalidate_user(user.pk)
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
@@ -98,6 +143,7 @@ class PasswordChangeView(APIView):
             
             user.set_password(serializer.validated_data['new_password'])
             user.save()
+            invalidate_user(user.pk)
             return Response({"message": "Password updated successfully"})
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
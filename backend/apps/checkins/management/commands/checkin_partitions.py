@@ -0,0 +1,33 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from apps.checkins import partitions
+
+
+class Command(BaseCommand):
+    help = 'Create upcoming monthly check-in partitions, or detach old ones (PostgreSQL).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=None,
+                            help='Months to prepare beyond the current one.')
+        parser.add_argument('--detach-before', metavar='YYYY-MM',
+                            help='Detach partitions for months before this one.')
+        parser.add_argument('--drop', action='store_true',
+                            help='Drop detached partitions instead of keeping them for archiving.')
+
+    def handle(self, *args, **options):
+        if not partitions.is_partitioned():
+            self.stdout.write('The check-in table is not partitioned on this database.')
+            return
+        if options['detach_before']:
+            try:
+                year, month = map(int, options['detach_before'].split('-'))
+                before = date(year, month, 1)
+            except ValueError:
+                raise CommandError('--detach-before must look like YYYY-MM.')
+            for name in partitions.detach_partitions(before, drop=options['drop']):
+                self.stdout.write(f"{'Dropped' if options['drop'] else 'Detached'} {name}")
+        for name in partitions.ensure_partitions(options['months_ahead']):
+            self.stdout.write(f'Created {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(partitions.list_partitions())} check-in partitions attached.'
+        ))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from apps.checkins.streaks import recompute_streaks
+
+
+class Command(BaseCommand):
+    help = 'Rebuild streak counters from check-in history (repair job).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='user_ids',
+                            help='Only recompute this user id (repeatable).')
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        updated = recompute_streaks(user_ids=options['user_ids'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Recomputed streaks for {updated} profiles.'))
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('checkins', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='checkin',
+            name='checkins_ch_user_id_472405_idx',
+        ),
+        migrations.AddIndex(
+            model_name='checkin',
+            index=models.Index(fields=['user', '-timestamp', '-id'], name='checkins_ch_user_id_681330_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:42
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('checkins', '0002_checkin_history_index'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='checkin',
+            name='id',
+            field=models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('checkins', '0003_time_ordered_ids'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='checkin',
+            name='checkins_ch_user_id_681330_idx',
+        ),
+        migrations.AddIndex(
+            model_name='checkin',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-timestamp', '-id'], name='checkin_active_user_time_idx'),
+        ),
+    ]
@@ -0,0 +1,90 @@
+"""
+Partition the check-in table by month on PostgreSQL (see
+``apps.checkins.partitions``). Other databases keep the plain table, and the
+model state is unchanged.
+"""
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+from apps.checkins.partitions import (
+    DEFAULT_PARTITION, TABLE, add_months, create_partition_sql, month_start,
+)
+
+LEGACY = f'{TABLE}_legacy'
+ACTIVE_INDEX = (
+    f'CREATE INDEX checkin_active_user_time_idx ON "{TABLE}" '
+    f'(user_id, "timestamp" DESC, id DESC) WHERE is_active'
+)
+
+
+def _user_index_and_foreign_key(apps, schema_editor):
+    """
+    Recreate the user_id index and foreign key under Django's own names;
+    ``LIKE`` copies neither, and later migrations look them up by name.
+    """
+    model = apps.get_model('checkins', 'CheckIn')
+    field = model._meta.get_field('user')
+    schema_editor.execute(schema_editor._create_index_sql(model, fields=[field]))
+    schema_editor.execute(schema_editor._create_fk_sql(model, field, '_fk_%(to_table)s_%(to_column)s'))
+
+
+def partition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    execute = schema_editor.execute
+    execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY}"')
+    execute(
+        f'CREATE TABLE "{TABLE}" (LIKE "{LEGACY}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE ("timestamp")'
+    )
+    execute(f'CREATE TABLE "{DEFAULT_PARTITION}" PARTITION OF "{TABLE}" DEFAULT')
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f'SELECT MIN("timestamp") FROM "{LEGACY}"')
+        (earliest,) = cursor.fetchone()
+    today = timezone.now().date()
+    month = month_start(min(earliest.date(), today) if earliest else today)
+    last = add_months(month_start(today), settings.CHECKIN_PARTITION_MONTHS_AHEAD)
+    while month <= last:
+        execute(create_partition_sql(month))
+        month = add_months(month, 1)
+
+    # Load before indexing, then drop the old table to free its index names.
+    execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{LEGACY}"')
+    execute(f'DROP TABLE "{LEGACY}"')
+    execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT checkins_checkin_pkey PRIMARY KEY (id, "timestamp")')
+    execute(
+        f'ALTER TABLE "{TABLE}" ADD CONSTRAINT unique_checkin_idempotency_key '
+        f'UNIQUE (user_id, idempotency_key, "timestamp")'
+    )
+    _user_index_and_foreign_key(apps, schema_editor)
+    execute(ACTIVE_INDEX)
+
+
+def unpartition(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    execute = schema_editor.execute
+    execute(f'ALTER TABLE "{TABLE}" RENAME TO "{LEGACY}"')
+    execute(f'CREATE TABLE "{TABLE}" (LIKE "{LEGACY}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+    execute(f'INSERT INTO "{TABLE}" SELECT * FROM "{LEGACY}"')
+    execute(f'DROP TABLE "{LEGACY}" CASCADE')
+    execute(f'ALTER TABLE "{TABLE}" ADD CONSTRAINT checkins_checkin_pkey PRIMARY KEY (id)')
+    execute(
+        f'ALTER TABLE "{TABLE}" ADD CONSTRAINT unique_checkin_idempotency_key '
+        f'UNIQUE (user_id, idempotency_key)'
+    )
+    _user_index_and_foreign_key(apps, schema_editor)
+    execute(ACTIVE_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('checkins', '0004_active_partial_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, unpartition),
+    ]
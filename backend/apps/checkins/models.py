@@ -1,6 +1,114 @@
-from django.db import models
-from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models, transaction
+from core.models import ActiveManager, BaseModel, BaseQuerySet, active_index
+from .partitions import lock_idempotency_keys
 
-User = get_user_model()
 
-# Checkins app models will be implemented here 
\ No newline at end of file
+class CheckInQuerySet(BaseQuerySet):
+    """
+    QuerySet with the bulk ingestion path used by the offline sync endpoint.
+    """
+
+    def ingest(self, user, rows):
+        """
+        Bulk insert check-ins for a user, skipping rows already ingested.
+
+        ``rows`` is a list of dicts of validated CheckIn field values. Rows
+        carrying an ``idempotency_key`` that the user has already sent (in an
+        earlier request or earlier in the same batch) are reported as
+        duplicates instead of being inserted again, soft-deleted ones
+        included. Returns a list of
+        ``(checkin_id, idempotency_key, created)`` tuples in input order.
+        """
+        keys = {row['idempotency_key'] for row in rows if row.get('idempotency_key')}
+        with transaction.atomic():
+            if keys:
+                lock_idempotency_keys(user.pk)
+            existing = dict(
+                self.model.all_objects.filter(user=user, idempotency_key__in=keys)
+                .values_list('idempotency_key', 'id')
+            ) if keys else {}
+
+            results = []
+            to_create = []
+            for row in rows:
+                key = row.get('idempotency_key') or None
+                if key and key in existing:
+                    results.append((existing[key], key, False))
+                    continue
+                checkin = self.model(user=user, **{**row, 'idempotency_key': key})
+                if key:
+                    existing[key] = checkin.id
+                to_create.append(checkin)
+                results.append((checkin.id, key, True))
+
+            # ignore_conflicts covers a concurrent retry that slipped in
+            # between the lookup above and this insert; re-reading the keys
+            # shows which rows were really inserted.
+            self.bulk_create(to_create, ignore_conflicts=True)
+            created_keys = [checkin.idempotency_key for checkin in to_create
+                            if checkin.idempotency_key]
+            stored = dict(
+                self.model.all_objects.filter(user=user, idempotency_key__in=created_keys)
+                .values_list('idempotency_key', 'id')
+            ) if created_keys else {}
+            results = [
+                (stored[key], key, False) if created and key and stored[key] != checkin_id
+                else (checkin_id, key, created)
+                for checkin_id, key, created in results
+            ]
+            inserted = [
+                checkin for checkin in to_create
+                if not checkin.idempotency_key or stored[checkin.idempotency_key] == checkin.id
+            ]
+
+            if inserted:
+                from apps.dashboard.rollups import add_checkins
+                from apps.tips import ranking
+                from .streaks import record_checkins
+                record_checkins(user, [checkin.timestamp for checkin in inserted])
+                add_checkins(user, inserted)
+                transaction.on_commit(lambda: ranking.add_checkins(user.pk, inserted))
+        return results
+
+
+class CheckIn(BaseModel):
+    """
+    A quick check-in: mood and urge levels with optional trigger context.
+
+    On PostgreSQL the table is partitioned by month of ``timestamp``; see
+    ``apps.checkins.partitions``.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='checkins'
+    )
+    timestamp = models.DateTimeField()
+    mood = models.PositiveSmallIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(10)]
+    )
+    urge_level = models.PositiveSmallIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(10)]
+    )
+    trigger_context = models.CharField(max_length=255, blank=True)
+    note = models.TextField(blank=True)
+    exercise_completed = models.BooleanField(default=False)
+    idempotency_key = models.CharField(max_length=64, null=True, blank=True)
+
+    objects = ActiveManager.from_queryset(CheckInQuerySet)()
+    all_objects = CheckInQuerySet.as_manager()
+
+    class Meta:
+        ordering = ['-timestamp']
+        indexes = [
+            active_index('user', '-timestamp', '-id', name='checkin_active_user_time_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'idempotency_key'],
+                name='unique_checkin_idempotency_key',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Check-in for {self.user_id} at {self.timestamp}"
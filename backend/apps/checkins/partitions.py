@@ -0,0 +1,167 @@
+"""
+Monthly range partitions of the check-in table on PostgreSQL.
+
+Migration ``0005_partition_by_month`` turns ``checkins_checkin`` into a
+table partitioned by ``timestamp``: one partition per UTC calendar month
+plus a default partition for rows outside every month created so far
+(offline check-ins far in the past, clock-skewed clients). Queries bounded
+on ``timestamp`` only touch the matching months, and an old month is
+removed with a metadata-only ``DETACH PARTITION`` instead of a bulk DELETE.
+
+Postgres requires the partition key in every unique index, so on Postgres
+the primary key is ``(id, timestamp)`` and the idempotency constraint is
+``(user_id, idempotency_key, timestamp)``. That constraint lets the same key
+through under another timestamp, so ``CheckInQuerySet.ingest`` holds a
+per-user advisory lock (``lock_idempotency_keys``) across its key lookup and
+insert; concurrent retries of one user's check-ins take turns.
+
+Future months are created ahead of time by ``ensure_partitions`` (Celery
+beat runs it daily, or ``manage.py checkin_partitions``). On other
+databases the table is a plain table and every function here is a no-op.
+"""
+from datetime import date
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+TABLE = 'checkins_checkin'
+DEFAULT_PARTITION = f'{TABLE}_default'
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    years, index = divmod(month.month - 1 + count, 12)
+    return date(month.year + years, index + 1, 1)
+
+
+def partition_name(month):
+    return f'{TABLE}_y{month.year}m{month.month:02d}'
+
+
+def partition_month(name):
+    """The month a partition covers, or None for the default partition."""
+    suffix = name[len(TABLE) + 1:]
+    if len(suffix) != 8 or suffix[0] != 'y' or suffix[5] != 'm':
+        return None
+    return date(int(suffix[1:5]), int(suffix[6:8]), 1)
+
+
+def _bounds(month):
+    return f"'{month.isoformat()} 00:00:00+00'", f"'{add_months(month, 1).isoformat()} 00:00:00+00'"
+
+
+def create_partition_sql(month, table=TABLE):
+    lower, upper = _bounds(month)
+    return (
+        f'CREATE TABLE IF NOT EXISTS "{partition_name(month)}" PARTITION OF "{table}" '
+        f'FOR VALUES FROM ({lower}) TO ({upper})'
+    )
+
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table pt JOIN pg_class c ON c.oid = pt.partrelid '
+            'WHERE c.relname = %s',
+            [TABLE],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions():
+    """Names of the attached partitions, oldest month first, default last."""
+    if not is_partitioned():
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT c.relname FROM pg_inherits i '
+            'JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_class p ON p.oid = i.inhparent '
+            'WHERE p.relname = %s ORDER BY c.relname',
+            [TABLE],
+        )
+        names = [name for (name,) in cursor.fetchall()]
+    return sorted(names, key=lambda name: partition_month(name) or date.max)
+
+
+def create_partition(month):
+    """
+    Attach the partition for ``month``. Rows for that month already sitting
+    in the default partition are moved into it, since Postgres refuses to
+    attach a range the default partition overlaps.
+    """
+    lower, upper = _bounds(month)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT 1 FROM "{DEFAULT_PARTITION}" '
+            f'WHERE "timestamp" >= {lower} AND "timestamp" < {upper} LIMIT 1'
+        )
+        if cursor.fetchone() is None:
+            cursor.execute(create_partition_sql(month))
+            return
+        cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{DEFAULT_PARTITION}"')
+        cursor.execute(create_partition_sql(month))
+        cursor.execute(
+            f'WITH moved AS (DELETE FROM "{DEFAULT_PARTITION}" '
+            f'WHERE "timestamp" >= {lower} AND "timestamp" < {upper} RETURNING *) '
+            f'INSERT INTO "{TABLE}" SELECT * FROM moved'
+        )
+        cursor.execute(f'ALTER TABLE "{TABLE}" ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT')
+
+
+def lock_idempotency_keys(user_id):
+    """
+    Serialise ``user_id``'s keyed ingests until the transaction ends, which
+    makes ``(user_id, idempotency_key)`` unique without a unique index.
+    """
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_xact_lock(hashtext(%s))', [f'{TABLE}:{user_id}'])
+
+
+def ensure_partitions(months_ahead=None, today=None):
+    """
+    Create the partitions for the current month and ``months_ahead`` more
+    (default ``CHECKIN_PARTITION_MONTHS_AHEAD``). Returns the names created.
+    """
+    if not is_partitioned():
+        return []
+    if months_ahead is None:
+        months_ahead = settings.CHECKIN_PARTITION_MONTHS_AHEAD
+    current = month_start(today or timezone.now().date())
+    existing = set(list_partitions())
+    created = []
+    for offset in range(months_ahead + 1):
+        month = add_months(current, offset)
+        if partition_name(month) not in existing:
+            create_partition(month)
+            created.append(partition_name(month))
+    return created
+
+
+def detach_partitions(before, drop=False):
+    """
+    Detach every monthly partition older than the month of ``before``; the
+    detached tables keep their rows for archiving unless ``drop`` is set.
+    Returns the names detached.
+    """
+    cutoff = month_start(before)
+    detached = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Postgres refuses to drop a table with deferred FK checks pending.
+            cursor.execute('SET CONSTRAINTS ALL IMMEDIATE')
+        for name in list_partitions():
+            month = partition_month(name)
+            if month is None or month >= cutoff:
+                continue
+            cursor.execute(f'ALTER TABLE "{TABLE}" DETACH PARTITION "{name}"')
+            if drop:
+                cursor.execute(f'DROP TABLE "{name}"')
+            detached.append(name)
+    return detached
@@ -0,0 +1,32 @@
+from django.conf import settings
+from rest_framework import serializers
+from .models import CheckIn
+
+
+class CheckInSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a single check-in.
+    """
+    class Meta:
+        model = CheckIn
+        fields = ('id', 'timestamp', 'mood', 'urge_level', 'trigger_context', 'note',
+                  'exercise_completed', 'idempotency_key', 'created_at')
+        read_only_fields = ('id', 'created_at')
+        # Uniqueness of idempotency keys is enforced by the ingestion path,
+        # which reports repeats as duplicates instead of rejecting them.
+        validators = []
+
+
+class CheckInBatchSerializer(serializers.Serializer):
+    """
+    Serializer for a batch of check-ins flushed from the app's offline queue.
+    """
+    checkins = CheckInSerializer(many=True, allow_empty=False)
+
+    def validate_checkins(self, value):
+        max_size = settings.CHECKIN_BATCH_MAX_SIZE
+        if len(value) > max_size:
+            raise serializers.ValidationError(
+                f"A batch may contain at most {max_size} check-ins."
+            )
+        return value
@@ -0,0 +1,167 @@
+"""
+Streak engine.
+
+A streak is the number of consecutive local calendar days, in the user's own
+timezone, on which the user checked in. Incremental updates run as a single
+conditional UPDATE on the profile row so concurrent check-ins cannot lose
+increments; anything the incremental path cannot decide exactly (late or
+out-of-order offline check-ins) falls back to a recompute from history.
+"""
+from datetime import timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.contrib.auth import get_user_model
+from django.db.models import Case, F, Q, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from apps.authentication.models import UserProfile
+from core.realtime import publish
+from core.user_cache import invalidate_user, invalidate_users
+from .models import CheckIn
+
+User = get_user_model()
+
+
+def get_zone(tz_name):
+    """Return the ZoneInfo for a user's timezone name, falling back to UTC."""
+    try:
+        return ZoneInfo(tz_name or 'UTC')
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo('UTC')
+
+
+def local_date(timestamp, tz_name):
+    """Return the calendar date of ``timestamp`` in the given timezone."""
+    return timestamp.astimezone(get_zone(tz_name)).date()
+
+
+def trailing_run(dates):
+    """
+    Return ``(start, end)`` of the consecutive-day run ending at the latest
+    of ``dates``.
+    """
+    days = sorted(set(dates))
+    end = start = days[-1]
+    for day in reversed(days[:-1]):
+        if day != start - timedelta(days=1):
+            break
+        start = day
+    return start, end
+
+
+def current_streak(profile, tz_name, today=None):
+    """
+    Return the streak to display: the stored streak if it is still alive
+    (last check-in today or yesterday, locally), otherwise zero.
+    """
+    if not profile.last_checkin_date:
+        return 0
+    today = today or local_date(timezone.now(), tz_name)
+    if profile.last_checkin_date < today - timedelta(days=1):
+        return 0
+    return profile.streak_count
+
+
+def record_checkins(user, timestamps):
+    """
+    Fold newly stored check-ins into the user's streak.
+
+    The common case, check-ins on or after the profile's last check-in day,
+    is one UPDATE whose CASE arms enumerate the few possible values of
+    ``last_checkin_date`` that join the new run. When that UPDATE matches no
+    row, the new check-ins may bridge older gaps, so the streak is rebuilt
+    from history instead.
+    """
+    if not timestamps:
+        return
+    dates = [local_date(ts, user.timezone) for ts in timestamps]
+    start, end = trailing_run(dates)
+    run_length = (end - start).days + 1
+    latest = max(timestamps)
+
+    joins = []
+    extend_cases = []
+    day = start - timedelta(days=1)
+    while day <= end:
+        # The stored streak ends on ``day``; it joins the new run exactly when
+        # it does not reach back before ``start`` (else history might bridge).
+        joins.append(Q(last_checkin_date=day, streak_count__gte=(day - start).days + 1))
+        extend_cases.append(When(last_checkin_date=day, then=F('streak_count') + (end - day).days))
+        day += timedelta(days=1)
+
+    is_exact = (
+        Q(last_checkin_date__isnull=True)
+        | Q(last_checkin_date__lt=start - timedelta(days=1))
+        | Q(*joins, _connector=Q.OR)
+    )
+    if len(set(dates)) != run_length:
+        # New check-ins with gaps between them need the full history.
+        updated = 0
+    else:
+        updated = UserProfile.objects.filter(Q(user=user) & is_exact).update(
+            streak_count=Case(*extend_cases, default=Value(run_length)),
+            last_checkin_date=Value(end),
+            last_checkin=Greatest(Coalesce(F('last_checkin'), Value(latest)), Value(latest)),
+            updated_at=timezone.now(),
+        )
+    if not updated:
+        recompute_streaks(user_ids=[user.pk])
+    else:
+        invalidate_user(user.pk)
+    publish([user.pk], 'streak', _streak_event)
+
+
+def _streak_event(user_id):
+    return UserProfile.objects.filter(user_id=user_id).values(
+        'streak_count', 'last_checkin', 'last_checkin_date'
+    ).first()
+
+
+def recompute_streaks(user_ids=None, batch_size=500):
+    """
+    Rebuild streaks from check-in history, ``batch_size`` users at a time.
+
+    Reads only ``(user_id, timestamp)`` pairs and writes with one
+    ``bulk_update`` per batch. Returns the number of profiles updated.
+    """
+    users = User.objects.filter(profile__isnull=False).order_by('pk')
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+    user_rows = list(users.values_list('pk', 'timezone'))
+
+    updated = 0
+    for offset in range(0, len(user_rows), batch_size):
+        zones = dict(user_rows[offset:offset + batch_size])
+        dates = {pk: set() for pk in zones}
+        latest = {}
+        history = (
+            CheckIn.objects.filter(user_id__in=zones)
+            .order_by()
+            .values_list('user_id', 'timestamp')
+        )
+        for user_id, ts in history.iterator(chunk_size=2000):
+            dates[user_id].add(local_date(ts, zones[user_id]))
+            if user_id not in latest or ts > latest[user_id]:
+                latest[user_id] = ts
+
+        profiles = list(UserProfile.objects.filter(user_id__in=zones).only('id', 'user_id'))
+        now = timezone.now()
+        for profile in profiles:
+            days = dates[profile.user_id]
+            if days:
+                start, end = trailing_run(days)
+                profile.streak_count = (end - start).days + 1
+                profile.last_checkin_date = end
+            else:
+                profile.streak_count = 0
+                profile.last_checkin_date = None
+            profile.last_checkin = latest.get(profile.user_id)
+            profile.updated_at = now
+        UserProfile.objects.bulk_update(
+            profiles,
+            ['streak_count', 'last_checkin', 'last_checkin_date', 'updated_at'],
+        )
+        invalidate_users(zones)
+        updated += len(profiles)
+    return updated
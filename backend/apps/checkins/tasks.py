@@ -0,0 +1,14 @@
+import logging
+from celery import shared_task
+from . import partitions
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def ensure_checkin_partitions():
+    """Create upcoming monthly check-in partitions (periodic; no-op off PostgreSQL)."""
+    created = partitions.ensure_partitions()
+    if created:
+        logger.info('Created check-in partitions: %s', ', '.join(created))
+    return created
@@ -1,5 +1,9 @@
 from django.urls import path
+from . import views
 
 app_name = 'checkins'
 
-urlpatterns = []
+urlpatterns = [
+    path('', views.CheckInListCreateView.as_view(), name='checkin-list'),
+    path('batch/', views.CheckInBatchView.as_view(), name='checkin-batch'),
+]
@@ -0,0 +1,77 @@
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from core.pagination import KeysetPagination
+from .models import CheckIn
+from .serializers import CheckInSerializer, CheckInBatchSerializer
+
+
+def _ingest_response(results):
+    """Build the ingestion summary returned by the create endpoints."""
+    created = sum(1 for _, _, was_created in results if was_created)
+    return {
+        "created": created,
+        "duplicates": len(results) - created,
+        "results": [
+            {
+                "id": checkin_id,
+                "idempotency_key": key,
+                "status": "created" if was_created else "duplicate",
+            }
+            for checkin_id, key, was_created in results
+        ],
+    }
+
+
+class CheckInHistoryPagination(KeysetPagination):
+    """
+    Check-in history is scrolled in check-in time order, which for synced
+    offline check-ins differs from insertion order.
+    """
+    ordering = ('-timestamp', '-id')
+
+
+class CheckInListCreateView(generics.ListCreateAPIView):
+    """
+    List the user's check-ins or create a single one.
+
+    An ``Idempotency-Key`` header is used as the check-in's idempotency key
+    when the body does not carry one, so client retries are not duplicated.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = CheckInSerializer
+    throttle_scope = {'POST': 'checkins'}
+    pagination_class = CheckInHistoryPagination
+
+    def get_queryset(self):
+        return CheckIn.objects.filter(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        row = dict(serializer.validated_data)
+        if not row.get('idempotency_key'):
+            row['idempotency_key'] = request.headers.get('Idempotency-Key')
+
+        [(checkin_id, _, created)] = CheckIn.objects.ingest(request.user, [row])
+        checkin = CheckIn.all_objects.get(pk=checkin_id)
+        return Response(
+            self.get_serializer(checkin).data,
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK,
+        )
+
+
+class CheckInBatchView(APIView):
+    """
+    Ingest a batch of check-ins in one request and one transaction.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    throttle_scope = 'checkins'
+
+    def post(self, request):
+        serializer = CheckInBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        results = CheckIn.objects.ingest(request.user, serializer.validated_data['checkins'])
+        return Response(_ingest_response(results), status=status.HTTP_201_CREATED)
@@ -0,0 +1,181 @@
+"""
+Craving-trend analytics over raw check-ins, vectorised with NumPy.
+
+Check-in columns are read with ``values_list`` (no model instances) into
+arrays, folded into one slot per local day with ``bincount``, and the
+rolling, exponentially weighted and correlation statistics are computed on
+whole arrays. The per-day series is then downsampled with
+Largest-Triangle-Three-Buckets to at most ``MAX_POINTS`` points, so a
+year or all of history costs the client the same as a month.
+"""
+from datetime import datetime, time
+import numpy as np
+from django.db.models.functions import TruncDate
+from apps.checkins.models import CheckIn
+from apps.checkins.streaks import get_zone
+
+MAX_POINTS = 120  # Chart points returned, however long the range
+ROLLING_DAYS = 7  # Trailing window of the rolling averages
+EWMA_HALFLIFE_DAYS = 7  # A day's weight halves after this many days
+TOP_TRIGGERS = 10
+MAX_DECAY_RANGE = 1e150  # Largest decay**-k factor allowed inside one block
+
+
+def load_checkins(user, start=None):
+    """
+    The user's active check-ins from local day ``start`` on, oldest first,
+    as ``(days, mood, urge, triggers)`` arrays; ``days`` are local dates.
+    """
+    zone = get_zone(user.timezone)
+    rows = CheckIn.objects.filter(user=user)
+    if start is not None:
+        rows = rows.filter(timestamp__gte=datetime.combine(start, time.min, tzinfo=zone))
+    rows = list(rows.order_by('timestamp').values_list(
+        TruncDate('timestamp', tzinfo=zone), 'mood', 'urge_level', 'trigger_context'
+    ))
+    if not rows:
+        return (np.empty(0, dtype='datetime64[D]'), np.empty(0), np.empty(0),
+                np.empty(0, dtype=object))
+    days, mood, urge, triggers = zip(*rows)
+    return (np.array(days, dtype='datetime64[D]'), np.array(mood, dtype=float),
+            np.array(urge, dtype=float), np.array(triggers, dtype=object))
+
+
+def _ratio(numerator, denominator):
+    """``numerator / denominator``, NaN where the denominator is zero."""
+    out = np.full(len(numerator), np.nan)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out
+
+
+def rolling_sum(values, window):
+    """Sum of each trailing ``window`` of ``values`` (shorter at the start)."""
+    totals = np.cumsum(values)
+    out = totals.copy()
+    out[window:] -= totals[:-window]
+    return out
+
+
+def decayed_sum(values, decay):
+    """
+    ``out[t] = sum(decay ** (t - k) * values[k] for k <= t)`` without a
+    Python loop per element. Blocks are short enough that ``decay ** -k``
+    stays finite; the running total is carried from block to block.
+    """
+    block = max(1, int(np.log(MAX_DECAY_RANGE) / -np.log(decay)))
+    out = np.empty(len(values))
+    carry = 0.0
+    for start in range(0, len(values), block):
+        chunk = values[start:start + block]
+        powers = decay ** np.arange(len(chunk))
+        out[start:start + len(chunk)] = (np.cumsum(chunk / powers) + carry * decay) * powers
+        carry = out[start + len(chunk) - 1]
+    return out
+
+
+def correlation(x, y):
+    """Pearson correlation of ``x`` and ``y``, or None when it is undefined."""
+    if len(x) < 3 or x.std() == 0 or y.std() == 0:
+        return None
+    return round(float(np.corrcoef(x, y)[0, 1]), 3)
+
+
+def trigger_breakdown(triggers, urge, limit=TOP_TRIGGERS):
+    """The most frequent trigger contexts with their share and mean urge."""
+    labels = np.char.lower(np.char.strip(triggers.astype(str)))
+    given = labels != ''
+    if not given.any():
+        return []
+    names, index, counts = np.unique(labels[given], return_inverse=True, return_counts=True)
+    urge_totals = np.bincount(index, weights=urge[given])
+    order = np.argsort(-counts, kind='stable')[:limit]
+    return [
+        {
+            "trigger": str(names[i]),
+            "count": int(counts[i]),
+            "share": round(float(counts[i] / given.sum()), 3),
+            "avg_urge": round(float(urge_totals[i] / counts[i]), 2),
+        }
+        for i in order
+    ]
+
+
+def lttb(x, y, threshold):
+    """
+    Indices of at most ``threshold`` points of ``(x, y)`` chosen by
+    Largest-Triangle-Three-Buckets: first and last points, plus in each
+    bucket the point forming the largest triangle with the previous pick
+    and the next bucket's mean. Keeps peaks and troughs a stride would drop.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        low, high = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < len(edges):
+            next_low, next_high = edges[bucket + 1], edges[bucket + 2]
+        else:
+            next_low, next_high = n - 1, n
+        mean_x, mean_y = x[next_low:next_high].mean(), y[next_low:next_high].mean()
+        area = np.abs((x[previous] - mean_x) * (y[low:high] - y[previous])
+                      - (x[previous] - x[low:high]) * (mean_y - y[previous]))
+        previous = low + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def _value(value, digits=2):
+    return None if np.isnan(value) else round(float(value), digits)
+
+
+def craving_trend(user, start, end, max_points=MAX_POINTS):
+    """
+    Chart series and summary statistics for local days ``start`` (None: the
+    first check-in) to ``end``, downsampled to at most ``max_points`` days.
+    """
+    days, mood, urge, triggers = load_checkins(user, start)
+    first = np.datetime64(start, 'D') if start is not None else (days[0] if len(days) else None)
+    if first is None:
+        return {"points": [], "total_days": 0, "triggers": [],
+                "correlation": {"mood_urge": None}}
+
+    length = max(int((np.datetime64(end, 'D') - first).astype(int)) + 1, 0)
+    index = (days - first).astype(int)
+    counts = np.bincount(index, minlength=length).astype(float)[:length]
+    urge_totals = np.bincount(index, weights=urge, minlength=length)[:length]
+    mood_totals = np.bincount(index, weights=mood, minlength=length)[:length]
+
+    # Check-in weighted: a day with three check-ins counts three times.
+    window_counts = rolling_sum(counts, ROLLING_DAYS)
+    urge_rolling = _ratio(rolling_sum(urge_totals, ROLLING_DAYS), window_counts)
+    mood_rolling = _ratio(rolling_sum(mood_totals, ROLLING_DAYS), window_counts)
+    decay = 0.5 ** (1 / EWMA_HALFLIFE_DAYS)
+    urge_ewma = _ratio(decayed_sum(urge_totals, decay), decayed_sum(counts, decay))
+
+    # Days before the first check-in in range have nothing to chart.
+    charted = np.flatnonzero(~np.isnan(urge_rolling))
+    picks = charted[lttb(charted.astype(float), urge_rolling[charted], max_points)]
+    urge_daily = _ratio(urge_totals, counts)
+    mood_daily = _ratio(mood_totals, counts)
+    dates = first + picks
+    return {
+        "points": [
+            {
+                "date": str(date),
+                "checkins": int(counts[i]),
+                "urge": _value(urge_daily[i]),
+                "mood": _value(mood_daily[i]),
+                "urge_rolling": _value(urge_rolling[i]),
+                "mood_rolling": _value(mood_rolling[i]),
+                "urge_ewma": _value(urge_ewma[i]),
+            }
+            for i, date in zip(picks.tolist(), dates)
+        ],
+        "total_days": len(charted),
+        "triggers": trigger_breakdown(triggers, urge),
+        "correlation": {"mood_urge": correlation(mood, urge)},
+    }
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from apps.dashboard.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the daily and weekly dashboard rollups from raw activity.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', action='append', dest='user_ids',
+                            help='Only rebuild this user id (repeatable).')
+
+    def handle(self, *args, **options):
+        rebuilt = rebuild_rollups(user_ids=options['user_ids'])
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt rollups for {rebuilt} users.'))
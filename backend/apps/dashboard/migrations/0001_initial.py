@@ -0,0 +1,72 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:40
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('period_start', models.DateField()),
+                ('checkin_count', models.PositiveIntegerField(default=0)),
+                ('mood_total', models.PositiveIntegerField(default=0)),
+                ('urge_total', models.PositiveIntegerField(default=0)),
+                ('urge_peak', models.PositiveSmallIntegerField(default=0)),
+                ('quiz_count', models.PositiveIntegerField(default=0)),
+                ('quiz_questions', models.PositiveIntegerField(default=0)),
+                ('quiz_correct', models.PositiveIntegerField(default=0)),
+                ('exercise_count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['period_start'],
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='WeeklyRollup',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('period_start', models.DateField()),
+                ('checkin_count', models.PositiveIntegerField(default=0)),
+                ('mood_total', models.PositiveIntegerField(default=0)),
+                ('urge_total', models.PositiveIntegerField(default=0)),
+                ('urge_peak', models.PositiveSmallIntegerField(default=0)),
+                ('quiz_count', models.PositiveIntegerField(default=0)),
+                ('quiz_questions', models.PositiveIntegerField(default=0)),
+                ('quiz_correct', models.PositiveIntegerField(default=0)),
+                ('exercise_count', models.PositiveIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['period_start'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='dailyrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'period_start'), name='unique_daily_rollup'),
+        ),
+        migrations.AddConstraint(
+            model_name='weeklyrollup',
+            constraint=models.UniqueConstraint(fields=('user', 'period_start'), name='unique_weekly_rollup'),
+        ),
+    ]
@@ -1,6 +1,52 @@
+from django.conf import settings
 from django.db import models
-from django.contrib.auth import get_user_model
+from core.models import BaseModel
 
-User = get_user_model()
 
-# Dashboard app models will be implemented here 
\ No newline at end of file
+class Rollup(BaseModel):
+    """
+    Per-user activity counters for one period, in the user's local calendar.
+    Averages are derived at read time from the stored totals.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    period_start = models.DateField()
+    checkin_count = models.PositiveIntegerField(default=0)
+    mood_total = models.PositiveIntegerField(default=0)
+    urge_total = models.PositiveIntegerField(default=0)
+    urge_peak = models.PositiveSmallIntegerField(default=0)
+    quiz_count = models.PositiveIntegerField(default=0)
+    quiz_questions = models.PositiveIntegerField(default=0)
+    quiz_correct = models.PositiveIntegerField(default=0)
+    exercise_count = models.PositiveIntegerField(default=0)
+
+    class Meta(BaseModel.Meta):
+        abstract = True
+        ordering = ['period_start']
+
+    @property
+    def avg_mood(self):
+        return round(self.mood_total / self.checkin_count, 2) if self.checkin_count else None
+
+    @property
+    def avg_urge(self):
+        return round(self.urge_total / self.checkin_count, 2) if self.checkin_count else None
+
+
+class DailyRollup(Rollup):
+    """
+    Activity counters for one local calendar day.
+    """
+    class Meta(Rollup.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'period_start'], name='unique_daily_rollup'),
+        ]
+
+
+class WeeklyRollup(Rollup):
+    """
+    Activity counters for one local week, starting on Monday.
+    """
+    class Meta(Rollup.Meta):
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'period_start'], name='unique_weekly_rollup'),
+        ]
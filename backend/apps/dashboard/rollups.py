@@ -0,0 +1,160 @@
+"""
+Incremental maintenance of the daily and weekly rollup tables.
+
+Writers call ``add_checkins``/``add_quiz`` right after they store activity
+(exercises are counted from check-ins marked ``exercise_completed``); each touched period is bumped with one ``UPDATE ... SET
+x = x + n`` (inserting the row on first use). ``rebuild_rollups`` recomputes
+everything from the raw tables for repairs and backfills.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from apps.checkins.models import CheckIn
+from apps.checkins.streaks import local_date
+from apps.quizzes.models import QuizAttempt
+from core.realtime import publish
+from .models import DailyRollup, WeeklyRollup
+
+User = get_user_model()
+
+
+def week_start(day):
+    """Return the Monday of the week containing ``day``."""
+    return day - timedelta(days=day.weekday())
+
+
+def _bump(model, user, period_start, deltas, urge_peak=0):
+    """Add ``deltas`` to one rollup row, creating it if needed."""
+    updates = {field: F(field) + value for field, value in deltas.items()}
+    if urge_peak:
+        updates['urge_peak'] = Greatest(F('urge_peak'), Value(urge_peak))
+    updates['updated_at'] = timezone.now()
+
+    rows = model.all_objects.filter(user=user, period_start=period_start)
+    if rows.update(**updates):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(
+                user=user, period_start=period_start, urge_peak=urge_peak, **deltas
+            )
+    except IntegrityError:
+        # A concurrent writer created the row first; add on top of theirs.
+        rows.update(**updates)
+
+
+def _bump_periods(user, day_deltas):
+    """Apply per-day deltas to the daily rows and the enclosing weeks."""
+    weeks = defaultdict(lambda: defaultdict(int))
+    week_peaks = defaultdict(int)
+    for day, (deltas, peak) in sorted(day_deltas.items()):
+        _bump(DailyRollup, user, day, deltas, peak)
+        week = week_start(day)
+        for field, value in deltas.items():
+            weeks[week][field] += value
+        week_peaks[week] = max(week_peaks[week], peak)
+    for week, deltas in weeks.items():
+        _bump(WeeklyRollup, user, week, dict(deltas), week_peaks[week])
+    # Deltas, not totals: clients add them to the dashboard they already show.
+    publish([user.pk], 'rollup', {
+        'daily': [{'period_start': day, 'urge_peak': peak, **deltas}
+                  for day, (deltas, peak) in sorted(day_deltas.items())],
+        'weekly': [{'period_start': week, 'urge_peak': week_peaks[week], **deltas}
+                   for week, deltas in sorted(weeks.items())],
+    })
+
+
+def add_checkins(user, checkins):
+    """Fold newly stored check-ins into the user's rollups."""
+    day_deltas = {}
+    for checkin in checkins:
+        day = local_date(checkin.timestamp, user.timezone)
+        deltas, peak = day_deltas.get(day, ({'checkin_count': 0, 'mood_total': 0,
+                                             'urge_total': 0, 'exercise_count': 0}, 0))
+        deltas['checkin_count'] += 1
+        deltas['mood_total'] += checkin.mood
+        deltas['urge_total'] += checkin.urge_level
+        deltas['exercise_count'] += checkin.exercise_completed
+        day_deltas[day] = (deltas, max(peak, checkin.urge_level))
+    _bump_periods(user, day_deltas)
+
+
+def add_quiz(user, timestamp, questions, correct):
+    """Record a submitted quiz in the user's rollups."""
+    deltas = {'quiz_count': 1, 'quiz_questions': questions, 'quiz_correct': correct}
+    _bump_periods(user, {local_date(timestamp, user.timezone): (deltas, 0)})
+
+
+def _collect(user, tz_name):
+    """Compute daily rollup rows for one user from the raw tables."""
+    days = {}
+
+    def row(day):
+        if day not in days:
+            days[day] = DailyRollup(user=user, period_start=day)
+        return days[day]
+
+    checkins = (
+        CheckIn.objects.filter(user=user)
+        .order_by()
+        .values_list('timestamp', 'mood', 'urge_level', 'exercise_completed')
+    )
+    for ts, mood, urge, exercised in checkins.iterator(chunk_size=2000):
+        daily = row(local_date(ts, tz_name))
+        daily.checkin_count += 1
+        daily.mood_total += mood
+        daily.urge_total += urge
+        daily.exercise_count += exercised
+        daily.urge_peak = max(daily.urge_peak, urge)
+
+    attempts = (
+        QuizAttempt.objects.filter(user=user, submitted_at__isnull=False)
+        .order_by()
+        .values_list('submitted_at', 'score', 'quiz__questions')
+    )
+    for ts, score, questions in attempts.iterator(chunk_size=500):
+        daily = row(local_date(ts, tz_name))
+        daily.quiz_count += 1
+        daily.quiz_questions += len(questions)
+        daily.quiz_correct += score or 0
+    return days
+
+
+def _weeks_from_days(user, days):
+    """Sum daily rollup rows into weekly ones."""
+    weeks = {}
+    for day, daily in days.items():
+        start = week_start(day)
+        weekly = weeks.setdefault(start, WeeklyRollup(user=user, period_start=start))
+        for field in ('checkin_count', 'mood_total', 'urge_total', 'quiz_count',
+                      'quiz_questions', 'quiz_correct', 'exercise_count'):
+            setattr(weekly, field, getattr(weekly, field) + getattr(daily, field))
+        weekly.urge_peak = max(weekly.urge_peak, daily.urge_peak)
+    return weeks
+
+
+def rebuild_rollups(user_ids=None):
+    """
+    Recompute the rollup tables from raw activity. Returns the number of
+    users rebuilt.
+    """
+    users = User.objects.order_by('pk')
+    if user_ids is not None:
+        users = users.filter(pk__in=user_ids)
+
+    rebuilt = 0
+    for user in users.only('id', 'timezone').iterator(chunk_size=200):
+        days = _collect(user, user.timezone)
+        with transaction.atomic():
+            DailyRollup.all_objects.filter(user=user).delete()
+            WeeklyRollup.all_objects.filter(user=user).delete()
+            DailyRollup.objects.bulk_create(days.values(), batch_size=1000)
+            WeeklyRollup.objects.bulk_create(_weeks_from_days(user, days).values(), batch_size=1000)
+        rebuilt += 1
+    return rebuilt
@@ -1,5 +1,9 @@
 from django.urls import path
+from . import views
 
 app_name = 'dashboard'
 
-urlpatterns = []
+urlpatterns = [
+    path('', views.DashboardView.as_view(), name='dashboard'),
+    path('craving-trend/', views.CravingTrendView.as_view(), name='craving-trend'),
+]
@@ -0,0 +1,102 @@
+from datetime import timedelta
+from django.db.models import Max, Sum
+from django.utils import timezone
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.authentication.models import Badge, UserProfile
+from apps.authentication.serializers import UserBadgeSerializer
+from apps.checkins.streaks import current_streak, local_date
+from .analytics import craving_trend
+from .models import DailyRollup, WeeklyRollup
+from .rollups import week_start
+
+# Range name -> number of local days covered (None: all history).
+RANGES = {'7d': 7, '30d': 30, '90d': 90, '1y': 365, 'all': None}
+DEFAULT_RANGE = '30d'
+DAILY_MAX_DAYS = 90  # Longer ranges are charted per week
+
+COUNTER_FIELDS = ('checkin_count', 'mood_total', 'urge_total', 'quiz_count',
+                  'quiz_questions', 'quiz_correct', 'exercise_count')
+
+
+def invalid_range():
+    return Response(
+        {"error": f"range must be one of: {', '.join(RANGES)}"},
+        status=status.HTTP_400_BAD_REQUEST,
+    )
+
+
+class DashboardView(APIView):
+    """
+    Progress dashboard for a range, read from the daily/weekly rollup tables.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request):
+        range_name = request.query_params.get('range', DEFAULT_RANGE)
+        if range_name not in RANGES:
+            return invalid_range()
+
+        user = request.user
+        today = local_date(timezone.now(), user.timezone)
+        days = RANGES[range_name]
+        if days is not None and days <= DAILY_MAX_DAYS:
+            model, start = DailyRollup, today - timedelta(days=days - 1)
+        else:
+            model = WeeklyRollup
+            start = week_start(today - timedelta(days=days - 1)) if days else None
+
+        rows = model.objects.filter(user=user)
+        if start is not None:
+            rows = rows.filter(period_start__gte=start)
+        totals = rows.aggregate(urge_peak=Max('urge_peak'),
+                                **{field: Sum(field) for field in COUNTER_FIELDS})
+
+        profile = UserProfile.objects.filter(user=user).first()
+        return Response({
+            "range": range_name,
+            "granularity": "day" if model is DailyRollup else "week",
+            "streak": current_streak(profile, user.timezone, today) if profile else 0,
+            "badges": UserBadgeSerializer(
+                user.awards.select_related('badge').filter(badge__kind=Badge.BADGE), many=True
+            ).data,
+            "craving_trend": [
+                {
+                    "period_start": row.period_start,
+                    "checkins": row.checkin_count,
+                    "avg_mood": row.avg_mood,
+                    "avg_urge": row.avg_urge,
+                    "peak_urge": row.urge_peak,
+                }
+                for row in rows.only('period_start', 'checkin_count', 'mood_total',
+                                     'urge_total', 'urge_peak')
+            ],
+            "checkins": totals['checkin_count'] or 0,
+            "quizzes": {
+                "completed": totals['quiz_count'] or 0,
+                "questions": totals['quiz_questions'] or 0,
+                "correct": totals['quiz_correct'] or 0,
+            },
+            "exercises": totals['exercise_count'] or 0,
+        })
+
+
+class CravingTrendView(APIView):
+    """
+    Craving trend chart for a range, computed from raw check-ins: daily urge
+    and mood with rolling and exponentially weighted averages, the trigger
+    breakdown and the mood/urge correlation. Long ranges are downsampled to
+    a fixed number of points (see ``analytics``).
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request):
+        range_name = request.query_params.get('range', DEFAULT_RANGE)
+        if range_name not in RANGES:
+            return invalid_range()
+
+        today = local_date(timezone.now(), request.user.timezone)
+        days = RANGES[range_name]
+        start = today - timedelta(days=days - 1) if days else None
+        return Response({"range": range_name, **craving_trend(request.user, start, today)})
@@ -1,5 +1,8 @@
 from django.urls import path
+from . import views
 
 app_name = 'exercises'
 
-urlpatterns = []
+urlpatterns = [
+    path('audio/', views.generate_audio, name='exercise-audio'),
+]
@@ -0,0 +1,44 @@
+import re
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+from core.ai.client import get_client
+from core.ai.exceptions import AIError
+from core.ai.prompts import EXERCISE_SCRIPT
+from core.streaming import async_login_required, read_json
+from core.throttling import throttle
+
+DEFAULT_THEME = 'calming an urge'
+WORDS_PER_SECOND = 2.2  # Unhurried text-to-speech pace
+PAUSE_SECONDS = 3
+
+
+def script_duration(script):
+    """Estimated spoken length of a script in seconds, pauses included."""
+    pauses = script.count('[pause]')
+    words = len(re.findall(r'\w+', script.replace('[pause]', '')))
+    return round(words / WORDS_PER_SECOND + pauses * PAUSE_SECONDS)
+
+
+@require_POST
+@async_login_required
+@throttle('ai')
+async def generate_audio(request):
+    """POST /exercises/audio?theme=...: a guided audio script for text-to-speech."""
+    body = read_json(request)
+    if body is None:
+        return JsonResponse({"error": "Invalid JSON body"}, status=400)
+    theme = str(request.GET.get('theme') or body.get('theme') or DEFAULT_THEME).strip()[:120]
+    try:
+        completion = await get_client().acomplete(
+            EXERCISE_SCRIPT, {'theme': theme}, user=request.user, feature='exercises',
+        )
+    except AIError:
+        return JsonResponse({"error": "Exercise generation is unavailable, try again shortly"},
+                            status=503)
+    script = completion.text.strip()
+    return JsonResponse({
+        'type': 'audio',
+        'title': theme[:1].upper() + theme[1:],
+        'payload': {'script': script, 'pause_marker': '[pause]', 'pause_seconds': PAUSE_SECONDS},
+        'duration_sec': script_duration(script),
+    })
@@ -0,0 +1,53 @@
+# Generated by Django 5.0.1 on 2026-10-17 23:45
+
+import core.ids
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Quiz',
+            fields=[
+                ('id', models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('domain', models.CharField(choices=[('rdr2', 'RDR2'), ('cyberpunk_2077', 'Cyberpunk 2077'), ('ghost_of_tsushima', 'Ghost of Tsushima'), ('football_manager', 'Football Manager'), ('tech_trivia', 'Tech Trivia'), ('real_madrid', 'Real Madrid'), ('historical_events', 'Historical Events'), ('sci_fi', 'Sci-Fi'), ('sherlock_holmes', 'Sherlock Holmes'), ('guitar_basics', 'Guitar Basics'), ('harry_potter', 'Harry Potter')], max_length=32)),
+                ('difficulty', models.CharField(choices=[('easy', 'Easy'), ('medium', 'Medium'), ('hard', 'Hard')], default='easy', max_length=16)),
+                ('questions', models.JSONField(default=list)),
+                ('serve_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['domain', 'difficulty', 'serve_count'], name='quizzes_qui_domain_24f9cd_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='QuizAttempt',
+            fields=[
+                ('id', models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('answers', models.JSONField(default=list)),
+                ('score', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('submitted_at', models.DateTimeField(blank=True, null=True)),
+                ('quiz', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attempts', to='quizzes.quiz')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='quiz_attempts', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='quizattempt',
+            constraint=models.UniqueConstraint(fields=('user', 'quiz'), name='unique_quiz_per_user'),
+        ),
+    ]
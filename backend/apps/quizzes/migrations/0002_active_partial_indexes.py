@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quizzes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='quiz',
+            name='quizzes_qui_domain_24f9cd_idx',
+        ),
+        migrations.AddIndex(
+            model_name='quiz',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['domain', 'difficulty', 'serve_count'], name='quiz_active_pool_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quizattempt',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-created_at'], name='quizattempt_active_user_idx'),
+        ),
+    ]
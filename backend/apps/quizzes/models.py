@@ -1,6 +1,72 @@
+from django.conf import settings
 from django.db import models
-from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
+from core.models import BaseModel, active_index
 
-User = get_user_model()
+DOMAIN_CHOICES = [
+    ('rdr2', 'RDR2'),
+    ('cyberpunk_2077', 'Cyberpunk 2077'),
+    ('ghost_of_tsushima', 'Ghost of Tsushima'),
+    ('football_manager', 'Football Manager'),
+    ('tech_trivia', 'Tech Trivia'),
+    ('real_madrid', 'Real Madrid'),
+    ('historical_events', 'Historical Events'),
+    ('sci_fi', 'Sci-Fi'),
+    ('sherlock_holmes', 'Sherlock Holmes'),
+    ('guitar_basics', 'Guitar Basics'),
+    ('harry_potter', 'Harry Potter'),
+]
 
-# Quizzes app models will be implemented here 
\ No newline at end of file
+DIFFICULTY_CHOICES = [
+    ('easy', _('Easy')),
+    ('medium', _('Medium')),
+    ('hard', _('Hard')),
+]
+
+
+class Quiz(BaseModel):
+    """
+    A generated quiz held in the per-domain pool. A pooled quiz is served to
+    at most ``QUIZ_POOL_MAX_SERVES`` users and never twice to the same user.
+    """
+    domain = models.CharField(max_length=32, choices=DOMAIN_CHOICES)
+    difficulty = models.CharField(max_length=16, choices=DIFFICULTY_CHOICES, default='easy')
+    questions = models.JSONField(default=list)
+    serve_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            active_index('domain', 'difficulty', 'serve_count', name='quiz_active_pool_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_domain_display()} quiz ({self.difficulty})"
+
+
+class QuizAttempt(BaseModel):
+    """
+    A quiz served to a user, and the user's answers once submitted.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='quiz_attempts'
+    )
+    quiz = models.ForeignKey(Quiz, on_delete=models.CASCADE, related_name='attempts')
+    answers = models.JSONField(default=list)
+    score = models.PositiveSmallIntegerField(null=True, blank=True)
+    submitted_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            active_index('user', '-created_at', name='quizattempt_active_user_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'quiz'], name='unique_quiz_per_user'),
+        ]
+
+    def __str__(self):
+        return f"{self.quiz} for {self.user_id}"
+
+    @property
+    def is_submitted(self):
+        return self.submitted_at is not None
@@ -0,0 +1,191 @@
+"""
+Pre-generated quiz pool.
+
+Quizzes are generated ahead of time per (domain, difficulty) by Celery, so
+serving one is a database pop rather than a model round-trip. When a pop
+leaves the stock below ``QUIZ_POOL_LOW_WATER`` a refill task is queued (at
+most one per pool at a time); an empty pool falls back to generating inline.
+Concurrent inline generations for one pool are coalesced: callers share one
+generated quiz and claim it from the pool like any other.
+
+``apop_quiz`` is the async variant for ASGI views: the database steps run
+in a worker thread and inline generation awaits the model on the event loop.
+"""
+import json
+import uuid
+from functools import partial
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from core.ai.client import get_client
+from core.ai.exceptions import AIUpstreamError
+from core.ai.prompts import QUIZ
+from core.ai.singleflight import SingleFlight
+from .models import DOMAIN_CHOICES, Quiz, QuizAttempt
+
+REFILL_LOCK_TTL = 300  # seconds
+QUIZ_PARAMS = {'cache': False, 'feature': 'quizzes', 'response_format': {'type': 'json_object'}}
+
+# Inline generations, coalesced per pool and counted apart from AI requests.
+inline_flight = SingleFlight()
+
+
+def available(domain, difficulty):
+    """Return the pool's quizzes that can still be served."""
+    return Quiz.objects.filter(
+        domain=domain, difficulty=difficulty,
+        serve_count__lt=settings.QUIZ_POOL_MAX_SERVES,
+    )
+
+
+def stock(domain, difficulty):
+    """Return how many servable quizzes the pool holds."""
+    return available(domain, difficulty).count()
+
+
+def _quiz_inputs(domain, difficulty):
+    return {'domain': dict(DOMAIN_CHOICES)[domain], 'difficulty': difficulty,
+            'count': settings.QUIZ_QUESTION_COUNT}
+
+
+def _parse_questions(completion):
+    try:
+        questions = json.loads(completion.text)['questions']
+        for question in questions:
+            question['id'] = str(uuid.uuid4())
+            if not 0 <= question['correct_answer'] < len(question['options']):
+                raise ValueError('correct_answer out of range')
+    except (ValueError, KeyError, TypeError) as exc:
+        raise AIUpstreamError(f'Malformed quiz: {exc}') from exc
+    return questions
+
+
+def generate_quiz(domain, difficulty):
+    """Generate one quiz with the model and add it to the pool."""
+    completion = get_client().complete(QUIZ, _quiz_inputs(domain, difficulty), **QUIZ_PARAMS)
+    questions = _parse_questions(completion)
+    return Quiz.objects.create(domain=domain, difficulty=difficulty, questions=questions)
+
+
+async def agenerate_quiz(domain, difficulty):
+    """Async variant of ``generate_quiz``."""
+    completion = await get_client().acomplete(QUIZ, _quiz_inputs(domain, difficulty), **QUIZ_PARAMS)
+    questions = _parse_questions(completion)
+    return await Quiz.objects.acreate(domain=domain, difficulty=difficulty, questions=questions)
+
+
+def _flight_key(domain, difficulty):
+    return f'quizzes:generate:{domain}:{difficulty}'
+
+
+def _unseen(user, domain, difficulty):
+    """
+    True once the pool holds a quiz ``user`` can be served, else None (the
+    single-flight lookup for a quiz generated in another worker).
+    """
+    return available(domain, difficulty).exclude(attempts__user=user).exists() or None
+
+
+async def _aunseen(user, domain, difficulty):
+    return await available(domain, difficulty).exclude(attempts__user=user).aexists() or None
+
+
+def request_refill(domain, difficulty):
+    """Queue a refill for the pool unless one is already pending."""
+    from .tasks import refill_quiz_pool
+    if cache.add(f'quizzes:refill:{domain}:{difficulty}', True, REFILL_LOCK_TTL):
+        refill_quiz_pool.delay(domain, difficulty)
+
+
+def refill(domain, difficulty):
+    """Generate quizzes until the pool reaches ``QUIZ_POOL_TARGET``."""
+    created = 0
+    try:
+        for _ in range(max(0, settings.QUIZ_POOL_TARGET - stock(domain, difficulty))):
+            generate_quiz(domain, difficulty)
+            created += 1
+    finally:
+        cache.delete(f'quizzes:refill:{domain}:{difficulty}')
+    return created
+
+
+def claim_pooled(user, domain, difficulty):
+    """
+    Serve the oldest pooled quiz the user has not seen and return the new
+    QuizAttempt, or None if the pool has nothing left for the user. Each
+    candidate is claimed with a conditional UPDATE on its serve counter, so
+    concurrent pops never oversubscribe a quiz.
+    """
+    candidates = (
+        available(domain, difficulty)
+        .exclude(attempts__user=user)
+        .order_by('serve_count', 'created_at')
+    )
+    for quiz in candidates[:5]:
+        claimed = Quiz.objects.filter(
+            pk=quiz.pk, serve_count__lt=settings.QUIZ_POOL_MAX_SERVES
+        ).update(serve_count=F('serve_count') + 1)
+        if not claimed:
+            continue
+        try:
+            with transaction.atomic():
+                # The attempt carries its quiz, so serializing it needs no query.
+                return QuizAttempt.objects.create(user=user, quiz=quiz)
+        except IntegrityError:
+            # The same user popped this quiz concurrently; give the slot back.
+            Quiz.objects.filter(pk=quiz.pk).update(serve_count=F('serve_count') - 1)
+    return None
+
+
+def serve_new(user, quiz):
+    """Serve a freshly generated ``quiz`` to ``user``."""
+    Quiz.objects.filter(pk=quiz.pk).update(serve_count=F('serve_count') + 1)
+    return QuizAttempt.objects.create(user=user, quiz=quiz)
+
+
+def _refill_if_low(domain, difficulty):
+    if stock(domain, difficulty) < settings.QUIZ_POOL_LOW_WATER:
+        request_refill(domain, difficulty)
+
+
+def pop_quiz(user, domain, difficulty):
+    """Serve a pooled quiz, generating one inline if the pool is empty for the user."""
+    attempt = claim_pooled(user, domain, difficulty)
+    if attempt is None:
+        inline_flight.do(_flight_key(domain, difficulty),
+                         partial(generate_quiz, domain, difficulty),
+                         partial(_unseen, user, domain, difficulty))
+        # A shared quiz can be out of serves by now; generate one of our own.
+        attempt = (claim_pooled(user, domain, difficulty)
+                   or serve_new(user, generate_quiz(domain, difficulty)))
+    _refill_if_low(domain, difficulty)
+    return attempt
+
+
+def _claim_and_refill(user, domain, difficulty):
+    attempt = claim_pooled(user, domain, difficulty)
+    if attempt is not None:
+        _refill_if_low(domain, difficulty)
+    return attempt
+
+
+def _serve_and_refill(user, quiz):
+    attempt = serve_new(user, quiz)
+    _refill_if_low(quiz.domain, quiz.difficulty)
+    return attempt
+
+
+async def apop_quiz(user, domain, difficulty):
+    """Async variant of ``pop_quiz``: one thread hop when the pool has a quiz."""
+    attempt = await sync_to_async(_claim_and_refill)(user, domain, difficulty)
+    if attempt is None:
+        await inline_flight.ado(_flight_key(domain, difficulty),
+                                partial(agenerate_quiz, domain, difficulty),
+                                partial(_aunseen, user, domain, difficulty))
+        attempt = await sync_to_async(_claim_and_refill)(user, domain, difficulty)
+    if attempt is None:
+        quiz = await agenerate_quiz(domain, difficulty)
+        attempt = await sync_to_async(_serve_and_refill)(user, quiz)
+    return attempt
@@ -0,0 +1,44 @@
+from rest_framework import serializers
+from .models import DIFFICULTY_CHOICES, DOMAIN_CHOICES, QuizAttempt
+
+# Question keys that give the answer away; sent only once the quiz is submitted.
+ANSWER_KEYS = ('correct_answer', 'explanation', 'tip')
+
+
+class QuizRequestSerializer(serializers.Serializer):
+    """
+    Serializer for a quiz request.
+    """
+    domain = serializers.ChoiceField(choices=DOMAIN_CHOICES)
+    difficulty = serializers.ChoiceField(choices=DIFFICULTY_CHOICES, default='easy')
+
+
+class QuizAttemptSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a quiz served to the user. Until the attempt is
+    submitted, questions are sent without their answers, explanations and tips.
+    """
+    domain = serializers.CharField(source='quiz.domain', read_only=True)
+    difficulty = serializers.CharField(source='quiz.difficulty', read_only=True)
+    questions = serializers.SerializerMethodField()
+
+    class Meta:
+        model = QuizAttempt
+        fields = ('id', 'domain', 'difficulty', 'questions', 'answers', 'score',
+                  'submitted_at', 'created_at')
+        read_only_fields = fields
+
+    def get_questions(self, attempt):
+        if attempt.is_submitted:
+            return attempt.quiz.questions
+        return [
+            {key: value for key, value in question.items() if key not in ANSWER_KEYS}
+            for question in attempt.quiz.questions
+        ]
+
+
+class QuizSubmitSerializer(serializers.Serializer):
+    """
+    Serializer for quiz answers: one option index per question, in order.
+    """
+    answers = serializers.ListField(child=serializers.IntegerField(min_value=0))
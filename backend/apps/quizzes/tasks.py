@@ -0,0 +1,27 @@
+import logging
+from celery import shared_task
+from django.conf import settings
+from core.ai.exceptions import AIError
+from . import pool
+from .models import DIFFICULTY_CHOICES, DOMAIN_CHOICES
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=30)
+def refill_quiz_pool(self, domain, difficulty):
+    """Top one (domain, difficulty) pool up to its target size."""
+    try:
+        return pool.refill(domain, difficulty)
+    except AIError as exc:
+        logger.warning('Quiz pool refill failed for %s/%s: %s', domain, difficulty, exc)
+        raise self.retry(exc=exc)
+
+
+@shared_task
+def top_up_quiz_pools():
+    """Queue refills for every pool below its low-water mark (periodic)."""
+    for domain, _ in DOMAIN_CHOICES:
+        for difficulty, _ in DIFFICULTY_CHOICES:
+            if pool.stock(domain, difficulty) < settings.QUIZ_POOL_LOW_WATER:
+                pool.request_refill(domain, difficulty)
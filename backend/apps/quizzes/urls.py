@@ -1,5 +1,10 @@
 from django.urls import path
+from . import views
 
 app_name = 'quizzes'
 
-urlpatterns = []
+urlpatterns = [
+    path('', views.quizzes, name='quiz-list'),
+    path('<uuid:pk>/submit/', views.QuizSubmitView.as_view(), name='quiz-submit'),
+    path('<uuid:pk>/tips/', views.QuizTipsView.as_view(), name='quiz-tips'),
+]
@@ -0,0 +1,132 @@
+from asgiref.sync import sync_to_async
+from django.db import transaction
+from django.db.models import F
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from apps.authentication.models import UserProfile
+from apps.dashboard.rollups import add_quiz
+from apps.tips import ranking
+from apps.tips.serializers import TipSerializer
+from core.ai.exceptions import AIError
+from core.streaming import async_login_required, read_json
+from core.throttling import throttle
+from core.user_cache import invalidate_user
+from .models import QuizAttempt
+from .pool import apop_quiz
+from .serializers import QuizAttemptSerializer, QuizRequestSerializer, QuizSubmitSerializer
+
+
+class QuizListView(generics.ListAPIView):
+    """
+    List the user's quiz history.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+    serializer_class = QuizAttemptSerializer
+
+    def get_queryset(self):
+        return QuizAttempt.objects.filter(user=self.request.user).select_related('quiz')
+
+
+quiz_history = QuizListView.as_view()
+
+
+@async_login_required
+@throttle('ai')
+async def create_quiz(request):
+    """POST /quizzes: serve a new quiz from the pool, generating one if it is empty."""
+    body = read_json(request)
+    if body is None:
+        return JsonResponse({"error": "Invalid JSON body"}, status=400)
+    serializer = QuizRequestSerializer(data=body)
+    if not serializer.is_valid():
+        return JsonResponse(serializer.errors, status=400)
+    try:
+        attempt = await apop_quiz(request.user, **serializer.validated_data)
+    except AIError:
+        return JsonResponse({"error": "Quiz generation is unavailable, try again shortly"},
+                            status=503)
+    return JsonResponse(QuizAttemptSerializer(attempt).data, status=201)
+
+
+async def quizzes(request):
+    """
+    GET lists the history (sync DRF view), POST serves a quiz natively async
+    so waiting on the model does not hold a worker thread.
+    """
+    if request.method == 'POST':
+        return await create_quiz(request)
+    return await sync_to_async(quiz_history)(request)
+
+
+class QuizSubmitView(APIView):
+    """
+    Score the user's answers to a served quiz.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def post(self, request, pk):
+        attempt = get_object_or_404(
+            QuizAttempt.objects.select_related('quiz'), pk=pk, user=request.user
+        )
+        if attempt.is_submitted:
+            return Response({"error": "Quiz already submitted"}, status=status.HTTP_400_BAD_REQUEST)
+
+        serializer = QuizSubmitSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        answers = serializer.validated_data['answers']
+        questions = attempt.quiz.questions
+        if len(answers) != len(questions):
+            return Response({"error": f"Expected {len(questions)} answers"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        results = [
+            {
+                "question_id": question['id'],
+                "correct": answer == question['correct_answer'],
+                "correct_answer": question['correct_answer'],
+                "explanation": question.get('explanation', ''),
+                "tip": question.get('tip', ''),
+            }
+            for question, answer in zip(questions, answers)
+        ]
+        score = sum(result['correct'] for result in results)
+        submitted_at = timezone.now()
+        # Claim the submission in one UPDATE so a concurrent submit cannot count twice.
+        claimed = QuizAttempt.objects.filter(
+            pk=pk, user=request.user, submitted_at__isnull=True
+        ).update(answers=answers, score=score, submitted_at=submitted_at, updated_at=submitted_at)
+        if not claimed:
+            return Response({"error": "Quiz already submitted"}, status=status.HTTP_400_BAD_REQUEST)
+
+        UserProfile.objects.filter(user=request.user).update(
+            completed_quizzes=F('completed_quizzes') + 1
+        )
+        invalidate_user(request.user.pk)
+        add_quiz(request.user, submitted_at, len(questions), score)
+        domain = attempt.quiz.domain
+        transaction.on_commit(lambda: ranking.add_quiz(request.user.pk, domain))
+        return Response({"score": score, "total": len(questions), "results": results})
+
+
+class QuizTipsView(APIView):
+    """
+    Tips for a served quiz: each question's lesson tip once it is submitted,
+    and the user's top-ranked tips, those tagged with the quiz's domain first.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request, pk):
+        attempt = get_object_or_404(
+            QuizAttempt.objects.select_related('quiz'), pk=pk, user=request.user
+        )
+        tip_ids = ranking.quiz_tips(request.user.pk, attempt.quiz.domain)
+        return Response({
+            "lesson_tips": [
+                question['tip'] for question in attempt.quiz.questions if question.get('tip')
+            ] if attempt.is_submitted else [],
+            "tips": TipSerializer(ranking.load_tips(tip_ids), many=True).data,
+        })
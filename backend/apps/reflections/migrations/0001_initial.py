@@ -0,0 +1,39 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:27
+
+import core.ids
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WeeklyReflection',
+            fields=[
+                ('id', models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('week_start', models.DateField()),
+                ('summary', models.JSONField(default=dict)),
+                ('recap', models.TextField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_reflections', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-week_start'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='weeklyreflection',
+            constraint=models.UniqueConstraint(fields=('user', 'week_start'), name='unique_weekly_reflection'),
+        ),
+    ]
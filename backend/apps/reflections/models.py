@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.db import models
+from core.models import BaseModel
+
+
+class WeeklyReflection(BaseModel):
+    """
+    A user's finished week: the chart summary and the AI-written recap,
+    precomputed by ``apps.reflections.tasks`` (see ``apps.reflections.weekly``).
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='weekly_reflections'
+    )
+    week_start = models.DateField()
+    summary = models.JSONField(default=dict)
+    recap = models.TextField()
+
+    class Meta(BaseModel.Meta):
+        ordering = ['-week_start']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'week_start'], name='unique_weekly_reflection'),
+        ]
+
+    def __str__(self):
+        return f"Reflection for {self.user_id}, week of {self.week_start}"
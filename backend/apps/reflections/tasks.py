@@ -0,0 +1,14 @@
+import logging
+from celery import shared_task
+from . import weekly
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def generate_weekly_reflections():
+    """Precompute reflections for users whose local week has ended (periodic)."""
+    stored = weekly.generate_due()
+    if stored:
+        logger.info('Stored %d weekly reflections', stored)
+    return stored
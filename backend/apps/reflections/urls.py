@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'reflections'
+
+urlpatterns = [
+    path('weekly/', views.weekly_reflection, name='weekly-reflection'),
+    path('weekly/stream/', views.weekly_recap_stream, name='weekly-recap-stream'),
+]
@@ -0,0 +1,56 @@
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+from core.ai.client import get_client
+from core.ai.exceptions import AIError
+from core.ai.prompts import WEEKLY_RECAP
+from core.streaming import async_login_required, sse_event, sse_response
+from core.throttling import throttle
+from .weekly import aget_or_generate, aweek_summary, last_week
+
+
+@require_GET
+@async_login_required
+@throttle('ai')
+async def weekly_reflection(request):
+    """
+    GET /reflections/weekly: the summary chart and recap of the last finished
+    week. Normally one stored row; computed live only if it is missing.
+    """
+    try:
+        reflection = await aget_or_generate(request.user)
+    except AIError:
+        return JsonResponse({"error": "Reflection is unavailable, try again shortly"}, status=503)
+    return JsonResponse({
+        "week_start": reflection.week_start,
+        "summary": reflection.summary,
+        "recap": reflection.recap,
+    })
+
+
+async def stream_recap(user, start, summary):
+    yield sse_event('summary', {'week_start': start, **summary})
+    try:
+        # Cached: the same week summary always gets the same recap.
+        async for delta in get_client().astream(
+            WEEKLY_RECAP, {'week_start': start.isoformat(), 'summary': summary}, cache=True,
+            user=user.pk, feature='reflections',
+        ):
+            yield sse_event('token', {'text': delta})
+    except AIError:
+        yield sse_event('error', {'error': 'Recap is unavailable, try again shortly'})
+        return
+    yield sse_event('done', {'week_start': start})
+
+
+@require_GET
+@async_login_required
+@throttle('ai')
+async def weekly_recap_stream(request):
+    """
+    GET /reflections/weekly/stream: the summary of the same week as
+    ``weekly_reflection`` (the last finished one) first, then the recap
+    token by token.
+    """
+    start = last_week(request.user.timezone)
+    summary = await aweek_summary(request.user.pk, start)
+    return sse_response(stream_recap(request.user, start, summary))
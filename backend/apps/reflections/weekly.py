@@ -0,0 +1,168 @@
+"""
+Weekly reflections: a summary chart and an AI-written recap per local week.
+
+Celery beat runs ``generate_due`` hourly. A user's week (Monday to Sunday in
+``User.timezone``) is due once it has ended locally, so every user is served
+within an hour of their own Monday midnight. Due users with activity that
+week are processed in batches of ``REFLECTION_BATCH_SIZE``:
+
+* one query loads the daily rollups of the whole batch;
+* recaps are generated concurrently, at most ``REFLECTION_AI_CONCURRENCY``
+  at a time, so the batch never takes the whole AI limiter;
+* one ``bulk_create`` stores the finished ``WeeklyReflection`` rows.
+
+A user whose recap failed is picked up again by the next run. The endpoint
+reads the stored row, and computes and stores it live only when it is
+missing (a quiet week, or a run that has not reached the user yet).
+"""
+import asyncio
+import logging
+from datetime import timedelta
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from apps.checkins.streaks import local_date
+from apps.dashboard.models import DailyRollup
+from apps.dashboard.rollups import week_start
+from core.ai.client import get_client
+from core.ai.exceptions import AIError
+from core.ai.prompts import WEEKLY_RECAP
+from .models import WeeklyReflection
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+ROLLUP_FIELDS = ('user_id', 'period_start', 'checkin_count', 'mood_total', 'urge_total',
+                 'quiz_count', 'exercise_count')
+
+
+def last_week(tz_name, now=None):
+    """The Monday of the most recent week that has ended in ``tz_name``."""
+    return week_start(local_date(now or timezone.now(), tz_name)) - timedelta(days=7)
+
+
+def _average(total, count):
+    return round(total / count, 1) if count else None
+
+
+def summarise(start, rows):
+    """Totals and a per-day chart series for one week of daily rollup rows."""
+    days = {row['period_start']: row for row in rows}
+    chart = []
+    for offset in range(7):
+        day = start + timedelta(days=offset)
+        row = days.get(day)
+        count = row['checkin_count'] if row else 0
+        chart.append({
+            'date': day.isoformat(),
+            'checkins': count,
+            'avg_mood': _average(row['mood_total'], count) if row else None,
+            'avg_urge': _average(row['urge_total'], count) if row else None,
+        })
+    checkins = sum(row['checkin_count'] for row in rows)
+    return {
+        'checkins': checkins,
+        'avg_mood': _average(sum(row['mood_total'] for row in rows), checkins),
+        'avg_urge': _average(sum(row['urge_total'] for row in rows), checkins),
+        'quizzes': sum(row['quiz_count'] for row in rows),
+        'exercises': sum(row['exercise_count'] for row in rows),
+        'days': chart,
+    }
+
+
+def _rollups(user_ids, start):
+    return DailyRollup.objects.filter(
+        user_id__in=user_ids, period_start__gte=start, period_start__lt=start + timedelta(days=7)
+    ).values(*ROLLUP_FIELDS)
+
+
+def week_summaries(user_ids, start):
+    """``{user_id: summary}`` for every user in ``user_ids``, in one query."""
+    rows = {user_id: [] for user_id in user_ids}
+    for row in _rollups(user_ids, start):
+        rows[row['user_id']].append(row)
+    return {user_id: summarise(start, user_rows) for user_id, user_rows in rows.items()}
+
+
+async def aweek_summary(user_id, start):
+    """Async summary of one user's week."""
+    return summarise(start, [row async for row in _rollups([user_id], start)])
+
+
+async def arecap(user_id, start, summary):
+    """
+    Generate the recap text. Cached by content, so the streamed recap of the
+    same week (``weekly_recap_stream``) reuses it.
+    """
+    completion = await get_client().acomplete(
+        WEEKLY_RECAP, {'week_start': start.isoformat(), 'summary': summary}, cache=True,
+        user=user_id, feature='reflections',
+    )
+    return completion.text
+
+
+async def _recaps(start, summaries):
+    """``{user_id: recap}`` for the users whose recap could be generated."""
+    slots = asyncio.Semaphore(settings.REFLECTION_AI_CONCURRENCY)
+
+    async def one(user_id, summary):
+        async with slots:
+            try:
+                return user_id, await arecap(user_id, start, summary)
+            except AIError as exc:
+                logger.warning('Weekly recap failed for user %s, week %s: %s', user_id, start, exc)
+                return user_id, None
+
+    results = await asyncio.gather(*(one(user_id, summary) for user_id, summary in summaries.items()))
+    return {user_id: recap for user_id, recap in results if recap is not None}
+
+
+def due_user_ids(tz_name, start):
+    """Active users in ``tz_name`` with activity in the week of ``start`` but no reflection yet."""
+    return list(User.objects.filter(
+        is_active=True, timezone=tz_name,
+        dailyrollup__period_start__gte=start, dailyrollup__period_start__lt=start + timedelta(days=7),
+    ).exclude(weekly_reflections__week_start=start).values_list('pk', flat=True).distinct())
+
+
+def generate_batch(user_ids, start):
+    """Compute and store the reflections of one batch; returns the number stored."""
+    summaries = week_summaries(user_ids, start)
+    recaps = async_to_sync(_recaps)(start, summaries)
+    WeeklyReflection.objects.bulk_create([
+        WeeklyReflection(user_id=user_id, week_start=start, summary=summaries[user_id], recap=recap)
+        for user_id, recap in recaps.items()
+    ], ignore_conflicts=True)
+    return len(recaps)
+
+
+def generate_due(now=None, batch_size=None):
+    """Store the reflections of every user whose local week has ended; returns the count."""
+    batch_size = batch_size or settings.REFLECTION_BATCH_SIZE
+    stored = 0
+    zones = User.objects.filter(is_active=True).values_list('timezone', flat=True).distinct()
+    for tz_name in list(zones):
+        start = last_week(tz_name, now)
+        user_ids = due_user_ids(tz_name, start)
+        for offset in range(0, len(user_ids), batch_size):
+            stored += generate_batch(user_ids[offset:offset + batch_size], start)
+    return stored
+
+
+async def aget_or_generate(user):
+    """
+    The reflection for ``user``'s last finished week: the stored row, or one
+    computed and stored now. Raises ``AIError`` if the recap cannot be generated.
+    """
+    start = last_week(user.timezone)
+    reflection = await WeeklyReflection.objects.filter(user=user, week_start=start).afirst()
+    if reflection is not None:
+        return reflection
+    summary = await aweek_summary(user.pk, start)
+    recap = await arecap(user.pk, start, summary)
+    reflection = WeeklyReflection(user=user, week_start=start, summary=summary, recap=recap)
+    # A concurrent request may have stored the same week first; both hold the cached recap.
+    await WeeklyReflection.objects.abulk_create([reflection], ignore_conflicts=True)
+    return reflection
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('simulations', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='simulation',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', '-created_at'], name='simulation_active_user_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+from core.models import BaseModel, active_index
+
+
+class Simulation(BaseModel):
+    """
+    An AI-driven branching scenario. ``steps`` holds one entry per scene:
+    ``{"narrative": str, "choices": [str], "chosen": int | None}``.
+    """
+    ACTIVE = 'active'
+    COMPLETED = 'completed'
+    STATUS_CHOICES = [
+        (ACTIVE, _('Active')),
+        (COMPLETED, _('Completed')),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='simulations'
+    )
+    scenario = models.CharField(max_length=255)
+    triggers = models.JSONField(default=list)
+    steps = models.JSONField(default=list)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default=ACTIVE)
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            active_index('user', '-created_at', name='simulation_active_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"Simulation '{self.scenario}' for {self.user_id}"
+
+    @property
+    def history(self):
+        """The story so far as plain text, for the next prompt."""
+        lines = []
+        for step in self.steps:
+            lines.append(step['narrative'])
+            if step.get('chosen') is not None:
+                lines.append(f"> {step['choices'][step['chosen']]}")
+        return '\n'.join(lines)
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'simulations'
+
+urlpatterns = [
+    path('start/', views.start_simulation, name='simulation-start'),
+    path('<uuid:pk>/choose/', views.choose, name='simulation-choose'),
+]
@@ -0,0 +1,99 @@
+from django.conf import settings
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+from apps.checkins.models import CheckIn
+from core.ai.client import get_client
+from core.ai.exceptions import AIError
+from core.ai.prompts import SIMULATION_STEP
+from core.streaming import async_login_required, read_json, sse_event, sse_response
+from core.throttling import throttle
+from .models import Simulation
+
+DEFAULT_SCENARIO = 'A stressful evening alone after a long day'
+
+
+def parse_scene(text):
+    """Split a generated scene into its narrative and its choices line."""
+    narrative, marker, choices = text.rpartition('Choices:')
+    if not marker:
+        return text.strip(), []
+    return narrative.strip(), [choice.strip() for choice in choices.split('|') if choice.strip()]
+
+
+async def stream_step(simulation, instruction):
+    """Generate the next scene, streaming it as SSE and saving it at the end."""
+    yield sse_event('simulation', {'id': simulation.id})
+
+    inputs = {
+        'scenario': simulation.scenario,
+        'triggers': ', '.join(simulation.triggers) or 'none recorded',
+        'history': simulation.history or '(none yet)',
+        'instruction': instruction,
+    }
+    parts = []
+    try:
+        async for delta in get_client().astream(
+            SIMULATION_STEP, inputs, temperature=0.8,
+            user=simulation.user_id, feature='simulations',
+        ):
+            parts.append(delta)
+            yield sse_event('token', {'text': delta})
+    except AIError:
+        yield sse_event('error', {'error': 'Simulation is unavailable, try again shortly'})
+        return
+
+    narrative, choices = parse_scene(''.join(parts))
+    simulation.steps.append({'narrative': narrative, 'choices': choices, 'chosen': None})
+    if not choices or len(simulation.steps) >= settings.SIMULATION_MAX_STEPS:
+        simulation.status = Simulation.COMPLETED
+    await simulation.asave(update_fields=['steps', 'status', 'updated_at'])
+    yield sse_event('done', {
+        'id': simulation.id,
+        'choices': choices,
+        'completed': simulation.status == Simulation.COMPLETED,
+    })
+
+
+@require_POST
+@async_login_required
+@throttle('ai')
+async def start_simulation(request):
+    """POST /simulations/start: begin a scenario and stream its first scene."""
+    body = read_json(request)
+    if body is None:
+        return JsonResponse({"error": "Invalid JSON body"}, status=400)
+    scenario = str(body.get('scenario') or DEFAULT_SCENARIO)[:255]
+
+    recent = (
+        CheckIn.objects.filter(user=request.user).exclude(trigger_context='')
+        .values_list('trigger_context', flat=True)[:5]
+    )
+    triggers = [trigger async for trigger in recent]
+    simulation = await Simulation.objects.acreate(
+        user=request.user, scenario=scenario, triggers=triggers
+    )
+    return sse_response(stream_step(simulation, 'Begin the scenario.'))
+
+
+@require_POST
+@async_login_required
+@throttle('ai')
+async def choose(request, pk):
+    """POST /simulations/{id}/choose: pick an option and stream the next scene."""
+    simulation = await Simulation.objects.filter(
+        pk=pk, user=request.user, status=Simulation.ACTIVE
+    ).afirst()
+    if simulation is None:
+        return JsonResponse({"error": "Simulation not found"}, status=404)
+
+    body = read_json(request)
+    choices = simulation.steps[-1]['choices'] if simulation.steps else []
+    choice = body.get('choice') if body else None
+    if not isinstance(choice, int) or not 0 <= choice < len(choices):
+        return JsonResponse({"error": f"choice must be an index below {len(choices)}"}, status=400)
+
+    simulation.steps[-1]['chosen'] = choice
+    instruction = f'The player chose: {choices[choice]}. Continue the scenario.'
+    if len(simulation.steps) + 1 >= settings.SIMULATION_MAX_STEPS:
+        instruction += ' This is the final scene: conclude it and offer no choices.'
+    return sse_response(stream_step(simulation, instruction))
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:34
+
+import core.ids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tip',
+            fields=[
+                ('id', models.UUIDField(default=core.ids.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('title', models.CharField(max_length=200)),
+                ('content', models.TextField()),
+                ('tags', models.JSONField(blank=True, default=list)),
+                ('triggers', models.JSONField(blank=True, default=list)),
+            ],
+            options={
+                'ordering': ['-id'],
+                'abstract': False,
+            },
+        ),
+    ]
@@ -1,6 +1,82 @@
+import re
 from django.db import models
-from django.contrib.auth import get_user_model
+from core.models import ActiveManager, BaseModel, BaseQuerySet
 
-User = get_user_model()
+WORD = re.compile(r"[\w']+")
 
-# Tips app models will be implemented here 
\ No newline at end of file
+
+def normalise_terms(values):
+    """Lower-cased words of each label, de-duplicated, in their original order."""
+    labels = (' '.join(WORD.findall(value.lower())) for value in values)
+    return list(dict.fromkeys(label for label in labels if label))
+
+
+class TipQuerySet(BaseQuerySet):
+    """
+    Bulk writes that normalise terms and drop the tips index like
+    ``Tip.save`` does. ``soft_delete``, ``restore`` and ``bulk_update`` run
+    through ``update``.
+    """
+
+    def update(self, **kwargs):
+        from .ranking import invalidate_index
+        for field in ('tags', 'triggers'):
+            if isinstance(kwargs.get(field), list):
+                kwargs[field] = normalise_terms(kwargs[field])
+        count = super().update(**kwargs)
+        invalidate_index()
+        return count
+
+    def bulk_create(self, objs, *args, **kwargs):
+        from .ranking import invalidate_index
+        for tip in objs:
+            tip.tags = normalise_terms(tip.tags)
+            tip.triggers = normalise_terms(tip.triggers)
+        created = super().bulk_create(objs, *args, **kwargs)
+        invalidate_index()
+        return created
+
+    def delete(self):
+        from .ranking import invalidate_index
+        deleted = super().delete()
+        invalidate_index()
+        return deleted
+
+
+class Tip(BaseModel):
+    """
+    A coping tip. ``tags`` name topics and quiz domains (by domain code),
+    ``triggers`` the urge triggers it addresses; both feed the inverted index in
+    ``apps.tips.ranking``, which is rebuilt whenever a tip changes.
+    """
+    title = models.CharField(max_length=200)
+    content = models.TextField()
+    tags = models.JSONField(default=list, blank=True)
+    triggers = models.JSONField(default=list, blank=True)
+
+    objects = ActiveManager.from_queryset(TipQuerySet)()
+    all_objects = TipQuerySet.as_manager()
+
+    class Meta(BaseModel.Meta):
+        ordering = ['-id']
+
+    def __str__(self):
+        return self.title
+
+    def save(self, *args, **kwargs):
+        from .ranking import invalidate_index
+        self.tags = normalise_terms(self.tags)
+        self.triggers = normalise_terms(self.triggers)
+        super().save(*args, **kwargs)
+        invalidate_index()
+
+    def _set_active(self, active):
+        from .ranking import invalidate_index
+        super()._set_active(active)
+        invalidate_index()
+
+    def delete(self, *args, **kwargs):
+        from .ranking import invalidate_index
+        deleted = super().delete(*args, **kwargs)
+        invalidate_index()
+        return deleted
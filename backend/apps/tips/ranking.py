@@ -0,0 +1,211 @@
+"""
+Precomputed, per-user ranked tips.
+
+Two structures live in the cache (``TIPS_CACHE_ALIAS``):
+
+* the **index**, shared by all users: an inverted index from terms
+  (``tag:<tag>``, ``trigger:<trigger>``) to tip ids, and every active tip
+  id newest first. It is rebuilt with one query after any tip changes,
+  under a new version.
+* one **ranking** per user: term weights learnt from the user's check-in
+  triggers and quiz domains, each matched tip's score, and the resulting
+  ranked id list.
+
+Check-ins and quiz submits update a cached ranking in place: only the
+tips posted under the changed terms are rescored before the list is
+re-sorted, with no queries. Feed pages are slices of the ranked list. A
+missing ranking is rebuilt from the database (``TIPS_HISTORY_DAYS`` of
+history), and a ranking made against an older index is re-ranked from its
+stored weights.
+
+Updates are read-modify-write on the cache. Two concurrent writes for one
+user can lose an increment. That only shifts a weight a little, and the
+TTL rebuild corrects it.
+"""
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Sum
+from django.utils import timezone
+from .models import WORD, Tip
+
+INDEX_KEY = 'tips:index'
+USER_PREFIX = 'tips:user:'
+MAX_NGRAM = 3  # Words per trigger phrase matched against tip triggers
+
+
+def _cache():
+    return caches[settings.TIPS_CACHE_ALIAS]
+
+
+def user_key(user_id):
+    return f'{USER_PREFIX}{user_id}'
+
+
+def tag_term(tag):
+    return f'tag:{tag}'
+
+
+def trigger_terms(text):
+    """
+    Index terms for free-text trigger context: each run of up to
+    ``MAX_NGRAM`` words, so "work stress" matches tips for "work",
+    "stress" and "work stress".
+    """
+    words = WORD.findall(text.lower())
+    return {
+        'trigger:' + ' '.join(words[start:start + size])
+        for size in range(1, MAX_NGRAM + 1)
+        for start in range(len(words) - size + 1)
+    }
+
+
+def tip_terms(tags, triggers):
+    return [tag_term(tag) for tag in tags] + [f'trigger:{trigger}' for trigger in triggers]
+
+
+def build_index():
+    """Read every active tip into a fresh index and cache it."""
+    terms = {}
+    recent = []
+    for tip_id, tags, triggers in Tip.objects.order_by('-id').values_list('id', 'tags', 'triggers'):
+        tip_id = str(tip_id)
+        recent.append(tip_id)
+        for term in tip_terms(tags, triggers):
+            terms.setdefault(term, []).append(tip_id)
+    index = {'version': uuid.uuid4().hex, 'terms': terms, 'recent': recent}
+    _cache().set(INDEX_KEY, index, settings.TIPS_CACHE_TTL)
+    return index
+
+
+def get_index():
+    return _cache().get(INDEX_KEY) or build_index()
+
+
+def invalidate_index():
+    """Drop the index; rankings made against it are re-ranked on their next read."""
+    _cache().delete(INDEX_KEY)
+
+
+def _score(tip_ids, weights, index):
+    """Scores of ``tip_ids``, summing the weights of the terms each tip is indexed under."""
+    scores = dict.fromkeys(tip_ids, 0.0)
+    for term, weight in weights.items():
+        for tip_id in index['terms'].get(term, ()):
+            if tip_id in scores:
+                scores[tip_id] += weight
+    return scores
+
+
+def _order(scores, index):
+    """Matched tips by score (newest first on ties), then the rest newest first."""
+    position = {tip_id: rank for rank, tip_id in enumerate(index['recent'])}
+    matched = sorted((tip_id for tip_id, score in scores.items() if score > 0),
+                     key=lambda tip_id: (-scores[tip_id], position[tip_id]))
+    rest = (tip_id for tip_id in index['recent'] if not scores.get(tip_id))
+    return (matched + list(rest))[:settings.TIPS_RANKED_MAX]
+
+
+def rank(weights, index):
+    """A full ranking for ``weights``."""
+    matched = {tip_id for term in weights for tip_id in index['terms'].get(term, ())}
+    scores = {tip_id: score for tip_id, score in _score(matched, weights, index).items() if score}
+    return {'version': index['version'], 'weights': weights, 'scores': scores,
+            'ranked': _order(scores, index)}
+
+
+def history_weights(user_id):
+    """Term weights from the user's recent check-in triggers and submitted quizzes."""
+    from apps.checkins.models import CheckIn
+    from apps.quizzes.models import QuizAttempt
+
+    since = timezone.now() - timedelta(days=settings.TIPS_HISTORY_DAYS)
+    weights = {}
+    triggers = (CheckIn.objects.filter(user_id=user_id, timestamp__gte=since)
+                .exclude(trigger_context='').values_list('trigger_context')
+                .annotate(urge=Sum('urge_level')))
+    for context, urge in triggers:
+        for term in trigger_terms(context):
+            weights[term] = weights.get(term, 0.0) + urge / 10
+    domains = (QuizAttempt.objects.filter(user_id=user_id, submitted_at__gte=since)
+               .values_list('quiz__domain').annotate(count=Count('id')))
+    for domain, count in domains:
+        weights[tag_term(domain)] = weights.get(tag_term(domain), 0.0) + count
+    return weights
+
+
+def get_ranking(user_id):
+    """The user's cached ranking, rebuilt from history or re-ranked if stale."""
+    index = get_index()
+    ranking = _cache().get(user_key(user_id))
+    if ranking is None:
+        ranking = rank(history_weights(user_id), index)
+    elif ranking['version'] != index['version']:
+        ranking = rank(ranking['weights'], index)
+    else:
+        return ranking
+    _cache().set(user_key(user_id), ranking, settings.TIPS_CACHE_TTL)
+    return ranking
+
+
+def ranked_ids(user_id):
+    return get_ranking(user_id)['ranked']
+
+
+def _apply(user_id, deltas):
+    """
+    Add ``deltas`` to a cached ranking's weights and rescore only the tips
+    indexed under those terms. Without a cached ranking there is nothing to
+    update: the next read rebuilds it from history, which includes this
+    activity. Against a stale index only the weights are updated, and the
+    next read re-ranks from them.
+    """
+    ranking = _cache().get(user_key(user_id))
+    if ranking is None:
+        return
+    weights = ranking['weights']
+    for term, delta in deltas.items():
+        weights[term] = weights.get(term, 0.0) + delta
+    index = _cache().get(INDEX_KEY)
+    if index is not None and index['version'] == ranking['version']:
+        touched = {tip_id for term in deltas for tip_id in index['terms'].get(term, ())}
+        scores = ranking['scores']
+        for tip_id, score in _score(touched, weights, index).items():
+            if score:
+                scores[tip_id] = score
+            else:
+                scores.pop(tip_id, None)
+        if touched:
+            ranking['ranked'] = _order(scores, index)
+    _cache().set(user_key(user_id), ranking, settings.TIPS_CACHE_TTL)
+
+
+def add_checkins(user_id, checkins):
+    """Fold new check-ins' triggers into the user's ranking."""
+    deltas = {}
+    for checkin in checkins:
+        for term in trigger_terms(checkin.trigger_context):
+            deltas[term] = deltas.get(term, 0.0) + checkin.urge_level / 10
+    if deltas:
+        _apply(user_id, deltas)
+
+
+def add_quiz(user_id, domain):
+    """Fold a submitted quiz's domain into the user's ranking."""
+    _apply(user_id, {tag_term(domain): 1.0})
+
+
+def quiz_tips(user_id, domain, count=None):
+    """The user's top tips for a quiz: those tagged with its domain first."""
+    count = count or settings.TIPS_PER_QUIZ
+    ranked = ranked_ids(user_id)
+    tagged = set(get_index()['terms'].get(tag_term(domain), ()))
+    return ([tip_id for tip_id in ranked if tip_id in tagged]
+            + [tip_id for tip_id in ranked if tip_id not in tagged])[:count]
+
+
+def load_tips(tip_ids):
+    """The active tips for ``tip_ids`` in that order, in one query."""
+    tips = {str(pk): tip for pk, tip in Tip.objects.in_bulk(tip_ids).items()}
+    return [tips[tip_id] for tip_id in tip_ids if tip_id in tips]
@@ -0,0 +1,12 @@
+from rest_framework import serializers
+from .models import Tip
+
+
+class TipSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a tip in the feed.
+    """
+    class Meta:
+        model = Tip
+        fields = ('id', 'title', 'content', 'tags', 'triggers', 'created_at')
+        read_only_fields = fields
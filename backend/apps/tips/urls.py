@@ -1,5 +1,8 @@
 from django.urls import path
+from . import views
 
 app_name = 'tips'
 
-urlpatterns = []
+urlpatterns = [
+    path('', views.TipFeedView.as_view(), name='tip-feed'),
+]
@@ -0,0 +1,18 @@
+from rest_framework import permissions
+from rest_framework.views import APIView
+from core.pagination import RankedListPagination
+from .ranking import load_tips, ranked_ids
+from .serializers import TipSerializer
+
+
+class TipFeedView(APIView):
+    """
+    Personalised infinite-scroll tips feed. Pages are slices of the user's
+    cached ranking (``apps.tips.ranking``); each costs one query for the rows.
+    """
+    permission_classes = (permissions.IsAuthenticated,)
+
+    def get(self, request):
+        paginator = RankedListPagination()
+        page = paginator.paginate_ids(ranked_ids(request.user.pk), request)
+        return paginator.get_paginated_response(TipSerializer(load_tips(page), many=True).data)
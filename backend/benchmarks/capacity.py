@@ -0,0 +1,170 @@
+"""
+Concurrent-request capacity of one worker under WSGI and under ASGI.
+
+Starts gunicorn with a single worker twice, once as a sync WSGI worker
+(``config.wsgi``) and once as a uvicorn ASGI worker (``config.asgi``),
+against a seeded SQLite database and the local OpenAI stub. For each
+server it fires ``--concurrency`` AI-bound requests at once (audio
+exercise scripts, each waiting ``--latency`` seconds on the stub) while
+a second client keeps reading check-in history, and reports:
+
+* AI throughput and how many AI requests the worker held in flight;
+* the latency of the check-in reads made while the AI requests were
+  waiting, i.e. whether slow model calls starve everything else.
+
+    cd backend
+    python -m benchmarks.capacity
+    python -m benchmarks.capacity --concurrency 50 --latency 1 --wsgi-threads 4
+
+Throttles and the AI limiter are opened up (``benchmarks.settings``), so
+the numbers describe the server rather than the rate limits.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+SERVERS = {
+    'wsgi': ['config.wsgi:application'],
+    'asgi': ['config.asgi:application', '-k', 'uvicorn.workers.UvicornWorker'],
+}
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(kind, env, threads=1):
+    """Start one single-worker gunicorn server; returns ``(process, base_url)``."""
+    import httpx
+
+    port = _free_port()
+    command = [sys.executable, '-m', 'gunicorn', *SERVERS[kind], '--workers', '1',
+               '--bind', f'127.0.0.1:{port}', '--timeout', '120', '--log-level', 'warning']
+    if kind == 'wsgi' and threads > 1:
+        command += ['--threads', str(threads)]
+    process = subprocess.Popen(command, cwd=BACKEND, env=env)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f'{base_url}/metrics', timeout=1)
+            return process, base_url
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f'{kind} server did not start')
+
+
+async def _load(base_url, username, password, concurrency):
+    import httpx
+
+    limits = httpx.Limits(max_connections=concurrency + 4)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        login = await client.post('/api/v1/auth/login/',
+                                  json={'username': username, 'password': password})
+        login.raise_for_status()
+
+        async def ai_call():
+            theme = f'focus {uuid.uuid4().hex[:8]}'  # distinct, so the AI cache never answers
+            response = await client.post(f'/api/v1/exercises/audio/?theme={theme}', json={})
+            return response.status_code
+
+        reads = []
+
+        async def read_while(tasks):
+            while not all(task.done() for task in tasks):
+                started = time.perf_counter()
+                response = await client.get('/api/v1/checkins/')
+                response.raise_for_status()
+                reads.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(ai_call()) for _ in range(concurrency)]
+        reader = asyncio.create_task(read_while(tasks))
+        statuses = await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+        await reader
+    return statuses, elapsed, reads
+
+
+def measure(kind, env, user, password, concurrency, latency, threads):
+    process, base_url = start_server(kind, env, threads)
+    try:
+        statuses, elapsed, reads = asyncio.run(_load(base_url, user, password, concurrency))
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    ok = sum(status == 200 for status in statuses)
+    return {
+        'ok': ok,
+        'failed': len(statuses) - ok,
+        'seconds': elapsed,
+        'ai_per_second': ok / elapsed,
+        # Little's law: throughput x service time = requests held in flight.
+        'in_flight': ok / elapsed * latency,
+        'reads': len(reads),
+        'read_p50_ms': statistics.median(reads) if reads else None,
+        'read_max_ms': max(reads) if reads else None,
+    }
+
+
+def report(results, stream=sys.stdout):
+    stream.write(f'{"server":<8}{"ai ok":>7}{"failed":>8}{"secs":>8}{"ai/s":>8}'
+                 f'{"in flight":>11}{"reads":>7}{"read p50":>10}{"read max":>10}\n')
+    for kind, row in results.items():
+        p50 = f'{row["read_p50_ms"]:.0f}ms' if row['reads'] else '-'
+        worst = f'{row["read_max_ms"]:.0f}ms' if row['reads'] else '-'
+        stream.write(f'{kind:<8}{row["ok"]:>7}{row["failed"]:>8}{row["seconds"]:>8.2f}'
+                     f'{row["ai_per_second"]:>8.2f}{row["in_flight"]:>11.1f}'
+                     f'{row["reads"]:>7}{p50:>10}{worst:>10}\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='WSGI vs ASGI capacity per worker.')
+    parser.add_argument('--concurrency', type=int, default=20,
+                        help='AI-bound requests fired at once.')
+    parser.add_argument('--latency', type=float, default=0.5,
+                        help='Seconds the stub model takes per completion.')
+    parser.add_argument('--wsgi-threads', type=int, default=1,
+                        help='Threads for the WSGI worker (gunicorn gthread when > 1).')
+    parser.add_argument('--servers', default='wsgi,asgi')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='phoenix-capacity-')
+    os.environ['DATABASE_URL'] = f'sqlite:///{workdir}/capacity.sqlite3'
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'benchmarks.settings'
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from core.ai.stub import start_in_thread
+    from .seed import PASSWORD, seed
+
+    call_command('migrate', verbosity=0)
+    user = seed(users=1, days=30)[0]
+    stub = start_in_thread(port=0, latency=args.latency)
+    env = {**os.environ, 'OPENAI_API_KEY': 'bench',
+           'AI_BASE_URL': 'http://%s:%s/v1' % stub.server_address}
+    results = {}
+    try:
+        for kind in args.servers.split(','):
+            results[kind] = measure(kind, env, user.username, PASSWORD,
+                                    args.concurrency, args.latency, args.wsgi_threads)
+    finally:
+        stub.shutdown()
+    report(results)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""
+Endpoint latency and query-budget benchmarks.
+
+Seeds a SQLite database with realistic volumes (``benchmarks.seed``), drives
+every ``api/v1/`` endpoint in-process through the Django test client, and
+reports p50/p95/p99 latency and SQL queries per request. AI-backed
+endpoints talk to the local OpenAI-compatible stub, so nothing leaves the
+machine and the numbers measure our own overhead. Password hashing uses the
+test settings' fast hasher; its cost is bounded separately (core.passwords).
+
+    cd backend
+    python -m benchmarks.endpoints                   # compare with baseline.json
+    python -m benchmarks.endpoints --save-baseline   # record a new baseline
+
+The run fails (exit status 1) when an endpoint's p95 exceeds the SPEC's
+200 ms budget, its p50 grows beyond ``--threshold`` times the baseline, or
+it makes more queries than the baseline. Baselines are machine-specific:
+record one on the machine that runs the comparison.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+
+BASELINE = Path(__file__).with_name('baseline.json')
+BUDGET_MS = 200.0  # SPEC: API response time < 200ms
+NOISE_FLOOR_MS = 2.0  # Regressions smaller than this are timer noise
+CALIBRATION = '_calibration_ms'
+
+
+@dataclass
+class Endpoint:
+    name: str
+    method: str
+    prepare: object  # ctx -> (path, body)
+    anonymous: bool = False
+
+
+def _endpoints():
+    from django.urls import reverse
+    from apps.quizzes.models import QuizAttempt
+    from apps.quizzes.pool import pop_quiz
+    from apps.simulations.models import Simulation
+    from .seed import BENCH_DOMAIN, PASSWORD
+
+    def checkin(ctx):
+        return {'timestamp': '2026-01-05T09:00:00Z', 'mood': 6, 'urge_level': 4,
+                'idempotency_key': uuid.uuid4().hex}
+
+    def submit(ctx):
+        attempt = pop_quiz(ctx['user'], BENCH_DOMAIN, 'medium')
+        return reverse('quizzes:quiz-submit', args=[attempt.pk]), {'answers': [0] * 5}
+
+    def quiz_tips(ctx):
+        attempt = QuizAttempt.objects.filter(user=ctx['user']).first()
+        return reverse('quizzes:quiz-tips', args=[attempt.pk]), None
+
+    def choose(ctx):
+        simulation = Simulation.objects.create(
+            user=ctx['user'], scenario='Payday evening', triggers=['payday'],
+            steps=[{'narrative': 'You get paid.', 'choices': ['Walk', 'Call'], 'chosen': None}],
+        )
+        return reverse('simulations:simulation-choose', args=[simulation.pk]), {'choice': 0}
+
+    return [
+        Endpoint('GET auth/profile', 'get', lambda ctx: (reverse('authentication:profile'), None)),
+        Endpoint('PATCH auth/profile/update', 'patch',
+                 lambda ctx: (reverse('authentication:profile-update'), {'bio': 'Benchmarking'})),
+        Endpoint('POST auth/login', 'post', lambda ctx: (
+            reverse('authentication:login'),
+            {'username': ctx['user'].username, 'password': PASSWORD},
+        ), anonymous=True),
+        Endpoint('GET checkins', 'get', lambda ctx: (reverse('checkins:checkin-list'), None)),
+        Endpoint('POST checkins', 'post',
+                 lambda ctx: (reverse('checkins:checkin-list'), checkin(ctx))),
+        Endpoint('POST checkins/batch', 'post', lambda ctx: (
+            reverse('checkins:checkin-batch'), {'checkins': [checkin(ctx) for _ in range(20)]},
+        )),
+        Endpoint('GET dashboard 7d', 'get',
+                 lambda ctx: (reverse('dashboard:dashboard') + '?range=7d', None)),
+        Endpoint('GET dashboard 90d', 'get',
+                 lambda ctx: (reverse('dashboard:dashboard') + '?range=90d', None)),
+        Endpoint('GET dashboard 1y', 'get',
+                 lambda ctx: (reverse('dashboard:dashboard') + '?range=1y', None)),
+        Endpoint('GET craving-trend 30d', 'get',
+                 lambda ctx: (reverse('dashboard:craving-trend') + '?range=30d', None)),
+        Endpoint('GET craving-trend 1y', 'get',
+                 lambda ctx: (reverse('dashboard:craving-trend') + '?range=1y', None)),
+        Endpoint('GET quizzes', 'get', lambda ctx: (reverse('quizzes:quiz-list'), None)),
+        Endpoint('POST quizzes', 'post', lambda ctx: (
+            reverse('quizzes:quiz-list'), {'domain': BENCH_DOMAIN, 'difficulty': 'easy'},
+        )),
+        Endpoint('POST quizzes/submit', 'post', submit),
+        Endpoint('GET quizzes/tips', 'get', quiz_tips),
+        Endpoint('GET tips', 'get', lambda ctx: (reverse('tips:tip-feed'), None)),
+        Endpoint('POST exercises/audio', 'post', lambda ctx: (
+            reverse('exercises:exercise-audio') + f'?theme=focus {uuid.uuid4().hex[:8]}', {},
+        )),
+        Endpoint('POST simulations/start', 'post',
+                 lambda ctx: (reverse('simulations:simulation-start'), {})),
+        Endpoint('POST simulations/choose', 'post', choose),
+        Endpoint('GET reflections/weekly', 'get',
+                 lambda ctx: (reverse('reflections:weekly-reflection'), None)),
+        Endpoint('GET reflections/weekly/stream', 'get',
+                 lambda ctx: (reverse('reflections:weekly-recap-stream'), None)),
+    ]
+
+
+async def _drain(response):
+    return b''.join([chunk async for chunk in response.streaming_content])
+
+
+def _percentile(samples, pct):
+    return statistics.quantiles(samples, n=100, method='inclusive')[pct - 1]
+
+
+def measure(client, endpoint, ctx, rounds, warmup=2):
+    """Time ``rounds`` requests (after ``warmup``) and return the summary."""
+    from asgiref.sync import async_to_sync
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings, queries = [], []
+    for round_ in range(warmup + rounds):
+        path, body = endpoint.prepare(ctx)
+        kwargs = {'content_type': 'application/json'} if body is not None else {}
+        with CaptureQueriesContext(connection) as captured:
+            started = time.perf_counter()
+            response = getattr(client, endpoint.method)(path, body, **kwargs)
+            if response.streaming:
+                # SSE endpoints: time the whole stream, as a client would see it.
+                if response.is_async:
+                    async_to_sync(_drain)(response)
+                else:
+                    b''.join(response.streaming_content)
+            elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code >= 400:
+            raise RuntimeError(f'{endpoint.name} answered {response.status_code}')
+        if round_ >= warmup:
+            timings.append(elapsed)
+            queries.append(len(captured))
+    return {
+        'p50_ms': round(_percentile(timings, 50), 2),
+        'p95_ms': round(_percentile(timings, 95), 2),
+        'p99_ms': round(_percentile(timings, 99), 2),
+        'queries': int(statistics.median(queries)),
+    }
+
+
+def run(user, rounds=30, only=None):
+    """Benchmark every endpoint as ``user``; returns ``{name: summary}``."""
+    from django.conf import settings
+    from django.test import Client, override_settings
+    from core.ai import client as ai_client
+    from core.ai.stub import start_in_thread
+
+    stub = start_in_thread(port=0, latency=0)
+    unlimited = {scope: '1000000/min' for scope in settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']}
+    overrides = override_settings(
+        OPENAI_API_KEY='bench',
+        AI_BASE_URL='http://%s:%s/v1' % stub.server_address,
+        QUIZ_POOL_LOW_WATER=0,
+        REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': unlimited},
+    )
+    results = {}
+    with overrides:
+        ai_client._client = None
+        client, anonymous = Client(), Client()
+        client.force_login(user)
+        ctx = {'user': user}
+        try:
+            for endpoint in _endpoints():
+                if only and only not in endpoint.name:
+                    continue
+                results[endpoint.name] = measure(
+                    anonymous if endpoint.anonymous else client, endpoint, ctx, rounds
+                )
+        finally:
+            ai_client._client = None
+            stub.shutdown()
+            stub.server_close()
+    return results
+
+
+def calibrate(repeat=7):
+    """
+    Time a fixed CPU workload (ms, best of ``repeat``). Stored with the
+    baseline so comparisons on a slower or busier machine are scaled.
+    """
+    def workload():
+        payload = [{'id': n, 'text': 'x' * 20, 'values': list(range(10))} for n in range(2000)]
+        return len(json.loads(json.dumps(payload)))
+
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        workload()
+        best = min(best, time.perf_counter() - started)
+    return round(best * 1000, 3)
+
+
+def compare(results, baseline, threshold):
+    """Return a list of failure messages for budget, latency and query regressions."""
+    failures = []
+    scale = 1.0
+    if baseline.get(CALIBRATION) and results.get(CALIBRATION):
+        scale = max(results[CALIBRATION] / baseline[CALIBRATION], 1.0)
+    for name, current in results.items():
+        if name == CALIBRATION:
+            continue
+        if current['p95_ms'] > BUDGET_MS:
+            failures.append(f'{name}: p95 {current["p95_ms"]}ms exceeds the {BUDGET_MS:.0f}ms budget')
+        base = baseline.get(name)
+        if base is None:
+            continue
+        # Regressions are judged on the median: tail latency is too noisy
+        # between runs to compare, and is held to the absolute budget instead.
+        expected = base['p50_ms'] * scale
+        allowed = max(expected * threshold, expected + NOISE_FLOOR_MS)
+        if current['p50_ms'] > allowed:
+            failures.append(f'{name}: p50 {current["p50_ms"]}ms vs baseline {base["p50_ms"]}ms')
+        if current['queries'] > base['queries']:
+            failures.append(f'{name}: {current["queries"]} queries vs baseline {base["queries"]}')
+    return failures
+
+
+def report(results, stream=sys.stdout):
+    stream.write(f'{"endpoint":<34}{"p50 ms":>9}{"p95 ms":>9}{"p99 ms":>9}{"queries":>9}\n')
+    for name, row in results.items():
+        if name == CALIBRATION:
+            continue
+        stream.write(f'{name:<34}{row["p50_ms"]:>9.2f}{row["p95_ms"]:>9.2f}'
+                     f'{row["p99_ms"]:>9.2f}{row["queries"]:>9}\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Endpoint latency and query benchmarks.')
+    parser.add_argument('--users', type=int, default=10)
+    parser.add_argument('--days', type=int, default=365)
+    parser.add_argument('--rounds', type=int, default=30)
+    parser.add_argument('--only', help='Only endpoints whose name contains this text.')
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=1.5,
+                        help='Allowed p50 growth over the baseline (default 1.5x).')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='phoenix-bench-')
+    os.environ['DATABASE_URL'] = f'sqlite:///{workdir}/bench.sqlite3'
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from django.test.utils import setup_test_environment
+    from .seed import seed
+
+    setup_test_environment()
+    call_command('migrate', verbosity=0)
+    started = time.perf_counter()
+    users = seed(users=args.users, days=args.days)
+    print(f'Seeded {args.users} users x {args.days} days in {time.perf_counter() - started:.1f}s')
+
+    results = run(users[0], rounds=args.rounds, only=args.only)
+    report(results)
+    results[CALIBRATION] = calibrate()
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(results, indent=2) + '\n')
+        print(f'Baseline saved to {args.baseline}')
+        return 0
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    failures = compare(results, baseline, args.threshold)
+    for failure in failures:
+        print(f'FAIL {failure}')
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Micro-benchmark: precompiled profile serialization against the DRF serializer.
+
+Serializes an in-memory user with a profile and prefetched awards, so it
+measures serializer overhead only (no database):
+
+    cd backend && python -m benchmarks.profile_serialization [--rounds 20000]
+"""
+import argparse
+import datetime
+import os
+import timeit
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
+os.environ.setdefault('DATABASE_URL', 'sqlite://:memory:')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from apps.authentication.models import Badge, User, UserBadge, UserProfile  # noqa: E402
+from apps.authentication.serializers import UserSerializer, serialize_user  # noqa: E402
+
+
+def sample_user(awards=6):
+    now = timezone.now()
+    user = User(username='phoenix', email='phoenix@example.com', first_name='Ash',
+                timezone='Europe/Madrid', date_of_birth=datetime.date(1990, 5, 17),
+                notification_preferences={'daily': True})
+    profile = UserProfile(user=user, streak_count=12, last_checkin=now,
+                          last_checkin_date=now.date(), goals=['sleep by 23:00'],
+                          preferences={'theme': 'dark'}, created_at=now, updated_at=now)
+    user.profile = profile
+    badges = [
+        Badge(code=f'badge-{n}', name=f'Badge {n}', description='Earned',
+              kind=Badge.BADGE if n % 2 else Badge.ACHIEVEMENT)
+        for n in range(awards)
+    ]
+    user._prefetched_objects_cache = {
+        'awards': [UserBadge(user=user, badge=badge, awarded_at=now) for badge in badges]
+    }
+    return user
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rounds', type=int, default=20000)
+    rounds = parser.parse_args().rounds
+
+    user = sample_user()
+    assert serialize_user(user) == UserSerializer(user).data
+    drf = min(timeit.repeat(lambda: UserSerializer(user).data, number=rounds, repeat=3))
+    fast = min(timeit.repeat(lambda: serialize_user(user), number=rounds, repeat=3))
+    print(f'DRF serializer:  {drf / rounds * 1e6:8.1f} us/op')
+    print(f'precompiled:     {fast / rounds * 1e6:8.1f} us/op  ({drf / fast:.1f}x faster)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+"""
+Seed realistic data volumes for the endpoint benchmarks.
+
+Every user gets a profile, a year of check-ins (a few a day), submitted
+quizzes and badges; the quiz pools get enough quizzes that serving never
+needs a refill, and the tips catalogue covers the seeded triggers and
+quiz domains. Rollups and streaks are then rebuilt the way the
+management commands would.
+"""
+import random
+import uuid
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from apps.authentication.models import Badge, UserProfile
+from apps.checkins.models import CheckIn
+from apps.checkins.streaks import recompute_streaks
+from apps.dashboard.rollups import rebuild_rollups
+from apps.quizzes.models import DIFFICULTY_CHOICES, DOMAIN_CHOICES, Quiz, QuizAttempt
+from apps.tips.models import Tip
+
+User = get_user_model()
+
+BENCH_DOMAIN = 'real_madrid'
+PASSWORD = 'bench-pass-1234'
+TRIGGERS = ['', '', 'boredom', 'stress after work', 'late night alone', 'argument', 'payday']
+TIP_TOPICS = ['focus', 'sleep', 'exercise', 'money', 'relationships']
+
+
+def _questions(rng, count=5):
+    return [
+        {
+            'id': str(uuid.uuid4()),
+            'question': f'Question {n}?',
+            'options': ['A', 'B', 'C', 'D'],
+            'correct_answer': rng.randrange(4),
+            'explanation': 'Because.',
+            'tip': 'Pause before acting.',
+        }
+        for n in range(count)
+    ]
+
+
+def seed(users=10, days=365, checkins_per_day=3, pool_size=200, attempts_per_user=50,
+         tips=300, rng_seed=7):
+    """Create the benchmark dataset and return the seeded users."""
+    rng = random.Random(rng_seed)
+    now = timezone.now()
+
+    Tip.objects.bulk_create([
+        Tip(title=f'Tip {n}', content='Notice the urge, name it, and wait ten minutes.',
+            tags=rng.sample(TIP_TOPICS, 2) + [rng.choice(DOMAIN_CHOICES)[0]],
+            triggers=[rng.choice(['boredom', 'work', 'late night', 'argument', 'payday'])])
+        for n in range(tips)
+    ])
+
+    quizzes = Quiz.objects.bulk_create([
+        Quiz(domain=BENCH_DOMAIN, difficulty=difficulty, questions=_questions(rng))
+        for difficulty, _ in DIFFICULTY_CHOICES
+        for _ in range(pool_size)
+    ])
+    badges = [
+        Badge.define({'id': f'streak-{days_}', 'name': f'{days_}-day streak'})
+        for days_ in (7, 30, 100)
+    ] + [Badge.define({'id': 'quiz-master', 'name': 'Quiz Master'}, kind=Badge.ACHIEVEMENT)]
+
+    seeded = []
+    for index in range(users):
+        user = User.objects.create_user(
+            username=f'bench{index}', email=f'bench{index}@example.com', password=PASSWORD,
+            timezone=rng.choice(['UTC', 'Europe/Madrid', 'America/New_York']),
+        )
+        UserProfile.objects.create(user=user)
+        CheckIn.objects.bulk_create([
+            CheckIn(
+                user=user,
+                timestamp=now - timedelta(days=day, hours=rng.uniform(0, 23)),
+                mood=rng.randint(1, 10),
+                urge_level=rng.randint(1, 10),
+                trigger_context=rng.choice(TRIGGERS),
+                note='Felt the pull but went for a walk.' if rng.random() < 0.2 else '',
+                idempotency_key=uuid.uuid4().hex,
+            )
+            for day in range(days)
+            for _ in range(checkins_per_day)
+        ], batch_size=1000)
+        QuizAttempt.objects.bulk_create([
+            QuizAttempt(
+                user=user, quiz=quiz, answers=[0] * 5, score=rng.randint(0, 5),
+                submitted_at=now - timedelta(days=rng.randrange(days)),
+            )
+            for quiz in rng.sample(quizzes[-pool_size:], attempts_per_user)
+        ])
+        seeded.append(user)
+
+    for badge in badges:
+        badge.award_to(seeded)
+    recompute_streaks()
+    rebuild_rollups()
+    return seeded
@@ -0,0 +1,21 @@
+"""
+Settings for the servers started by ``benchmarks.capacity``: the test
+settings, with throttles and the AI limiter opened up so the server itself
+is what gets measured.
+"""
+from config.settings.test import *  # noqa: F401,F403
+
+DEBUG = False
+ALLOWED_HOSTS = ['127.0.0.1', 'localhost']
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {scope: None for scope in REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']},
+}
+AI_MAX_CONCURRENCY = 1000
+AI_MAX_CONNECTIONS = 1000
+AI_REQUESTS_PER_MINUTE = 10 ** 6
+AI_TOKENS_PER_MINUTE = 10 ** 9
+# SQLite serializes writers; keep usage rows out of the AI path so the
+# database does not become the bottleneck being measured.
+AI_USAGE_TRACKING = False
@@ -3,6 +3,15 @@ ASGI config for phoenix project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+This is the production entry point. AI-bound views (quiz generation, audio
+scripts, simulations, reflections) are native async views, so a worker keeps
+serving other requests while they wait on the model; sync views run in
+Django's thread pool. ``python -m benchmarks.capacity`` compares capacity per
+worker with ``config.wsgi``.
+
+WebSocket connections are authenticated from the session cookie and routed
+by ``core.routing``; see ``core.realtime`` for what is pushed.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 """
@@ -12,5 +21,17 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-# Simplified ASGI application for personal use (no WebSocket support)
-application = get_asgi_application()
+# Set up Django before importing consumers, which import models.
+django_application = get_asgi_application()
+
+from channels.auth import AuthMiddlewareStack  # noqa: E402
+from channels.routing import ProtocolTypeRouter, URLRouter  # noqa: E402
+from channels.security.websocket import AllowedHostsOriginValidator  # noqa: E402
+from core.routing import websocket_urlpatterns  # noqa: E402
+
+application = ProtocolTypeRouter({
+    'http': django_application,
+    'websocket': AllowedHostsOriginValidator(
+        AuthMiddlewareStack(URLRouter(websocket_urlpatterns))
+    ),
+})
@@ -25,6 +25,7 @@ THIRD_PARTY_APPS = [
     'rest_framework',
     'corsheaders',
     'drf_yasg',
+    'channels',
 ]
 
 LOCAL_APPS = [
@@ -34,6 +35,8 @@ LOCAL_APPS = [
     'apps.exercises',
     'apps.dashboard',
     'apps.tips',
+    'apps.simulations',
+    'apps.reflections',
     'core.ai',
     'core',
 ]
@@ -42,6 +45,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -70,6 +74,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'config.wsgi.application'
+ASGI_APPLICATION = 'config.asgi.application'  # Needed for SSE streaming endpoints
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -108,9 +113,48 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.KeysetPagination',
     'PAGE_SIZE': 20,
+    'DEFAULT_THROTTLE_CLASSES': [
+        'core.throttling.UserSlidingWindowThrottle',
+        'core.throttling.ScopedSlidingWindowThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': '60/min',
+        'user': '600/min',
+        'login': '10/min',  # per client address
+        'ai': '20/min',  # model-backed generation
+        'checkins': '120/min',
+    },
+    # Proxies in front of the app that append to X-Forwarded-For. Client
+    # addresses are read that many hops from the right; with 0 the header is
+    # ignored. Anything further left is client-supplied and never trusted.
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
 }
+THROTTLE_CACHE_ALIAS = 'default'  # Redis in production, so limits hold across workers
+
+# Real-time updates (core.realtime). Production sets CHANNEL_LAYER_URL to Redis;
+# the in-memory layer only reaches sockets held by the same process.
+CHANNEL_LAYER_URL = os.getenv('CHANNEL_LAYER_URL')
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {'hosts': [CHANNEL_LAYER_URL]},
+    } if CHANNEL_LAYER_URL else {
+        'BACKEND': 'channels.layers.InMemoryChannelLayer',
+    },
+}
+REALTIME_CACHE_ALIAS = 'default'  # Open-socket counts; shared across workers in production
+REALTIME_PRESENCE_TTL = 60 * 60  # seconds; clients ping more often than this
+
+# Request metrics (core.metrics): Server-Timing header and Prometheus /metrics
+METRICS_ENABLED = True
+METRICS_SERVER_TIMING = True
+METRICS_CACHE_ALIAS = 'default'  # shared by all workers, so /metrics reports the whole fleet
+METRICS_FLUSH_INTERVAL = 10  # seconds between a worker's snapshot writes
+METRICS_WORKER_TTL = 300  # seconds a stopped worker's snapshot is still reported
+METRICS_MAX_WORKERS = 256
+METRICS_TOKEN = os.getenv('METRICS_TOKEN')  # if set, /metrics requires 'Bearer <token>'; else private IPs only
 
 # Override the default session authentication for personal project
 REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'] = [
@@ -137,11 +181,110 @@ SWAGGER_SETTINGS = {
 
 # OpenAI settings (Only external service we're keeping)
 OPENAI_API_KEY = os.getenv('OPENAI_API_KEY')
+AI_DEFAULT_MODEL = os.getenv('AI_DEFAULT_MODEL', 'gpt-4o-mini')
+AI_BASE_URL = os.getenv('AI_BASE_URL')  # e.g. the local stub server (manage.py ai_stub_server)
+AI_REQUEST_TIMEOUT = 10  # seconds
+AI_MAX_RETRIES = 2
+AI_MAX_CONNECTIONS = 20  # Pooled keep-alive connections per process
+AI_KEEPALIVE_EXPIRY = 30  # seconds
+# Local admission control, per process (divide account limits by worker count)
+AI_MAX_CONCURRENCY = 8
+AI_REQUESTS_PER_MINUTE = 500
+AI_TOKENS_PER_MINUTE = 200000
+AI_DEFAULT_MAX_TOKENS = 800  # Reply budget assumed when a call sets no max_tokens
+AI_LIMIT_MAX_WAIT = 10  # seconds a request may queue before it is rejected
+AI_CACHE_ALIAS = 'ai'
+AI_CACHE_TTL = 60 * 60 * 24  # seconds
+AI_SINGLEFLIGHT_LOCK_TTL = 30  # seconds an in-flight lock outlives a crashed leader
+AI_SINGLEFLIGHT_WAIT = AI_REQUEST_TIMEOUT + 5  # seconds followers wait for the leader
+AI_SINGLEFLIGHT_POLL_INTERVAL = 0.05  # seconds between cross-process result checks
+AI_USAGE_TRACKING = True  # Record one AIUsage row per call (core.ai.models)
+AI_USER_DAILY_TOKEN_BUDGET = int(os.getenv('AI_USER_DAILY_TOKEN_BUDGET', '0')) or None
+# Token budgets for long template inputs, compacted before rendering (core.ai.compaction)
+AI_INPUT_BUDGETS = {
+    'history': 1200,
+    'triggers': 80,
+}
+
+# Cache (in-process locally; production.py switches to Redis)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'ai': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'ai-completions',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+}
+
+# Sessions are read from the cache and written through to the database, and
+# the session's user (with its profile) is cached per user (core.user_cache).
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
+USER_CACHE_ALIAS = 'default'
+USER_CACHE_TTL = 60 * 15  # seconds
+
+# Check-ins
+CHECKIN_BATCH_MAX_SIZE = 500  # Max check-ins accepted by one offline sync request
+CHECKIN_PARTITION_MONTHS_AHEAD = 3  # Monthly partitions kept ready beyond the current month (PostgreSQL)
+
+# Quiz pool
+QUIZ_QUESTION_COUNT = 5
+QUIZ_POOL_LOW_WATER = 5  # Queue a refill when a pool drops below this
+QUIZ_POOL_TARGET = 20  # Refills generate up to this many servable quizzes
+QUIZ_POOL_MAX_SERVES = 25  # Distinct users a pooled quiz is served to
+
+# Simulations
+SIMULATION_MAX_STEPS = 6
+
+# Tips feed (apps.tips.ranking)
+TIPS_CACHE_ALIAS = 'default'  # Tip index and per-user rankings; shared across workers in production
+TIPS_CACHE_TTL = 60 * 60 * 24  # seconds; rankings are rebuilt from history after this
+TIPS_HISTORY_DAYS = 90  # Check-ins and quizzes a rebuilt ranking learns from
+TIPS_RANKED_MAX = 500  # Length of a user's ranked list (the end of the feed)
+TIPS_PER_QUIZ = 3
+
+# Weekly reflections
+REFLECTION_BATCH_SIZE = 100  # Users summarised and stored per batch
+REFLECTION_AI_CONCURRENCY = 4  # Recaps generated at once by the batch job
+
+# Celery
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
+CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND')
+CELERY_BEAT_SCHEDULE = {
+    'top-up-quiz-pools': {
+        'task': 'apps.quizzes.tasks.top_up_quiz_pools',
+        'schedule': 15 * 60,
+    },
+    'ensure-checkin-partitions': {
+        'task': 'apps.checkins.tasks.ensure_checkin_partitions',
+        'schedule': 24 * 60 * 60,
+    },
+    'generate-weekly-reflections': {
+        'task': 'apps.reflections.tasks.generate_weekly_reflections',
+        'schedule': 60 * 60,  # Weeks end at each user's local midnight
+    },
+}
 
 # Custom user model
 AUTH_USER_MODEL = 'authentication.User'
 
 # Authentication backends
 AUTHENTICATION_BACKENDS = [
-    'django.contrib.auth.backends.ModelBackend',
-] 
\ No newline at end of file
+    'core.authentication.CachedModelBackend',
+]
+
+# Password hashing policy (core.passwords). Hashes made with another work
+# factor or an older algorithm are upgraded on the next successful login.
+PASSWORD_HASHERS = [
+    'core.passwords.TunedPBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+PASSWORD_HASH_ITERATIONS = int(os.getenv('PASSWORD_HASH_ITERATIONS', '600000'))
+PASSWORD_VERIFY_WORKERS = 2  # Concurrent password hashes per process
+PASSWORD_VERIFY_QUEUE = 16  # Logins allowed to wait for a worker before 429s
+LOGIN_UNKNOWN_TTL = 60 * 5  # seconds an unknown login identifier is rejected from cache 
\ No newline at end of file
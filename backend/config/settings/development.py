@@ -27,4 +27,6 @@ INSTALLED_APPS += ['debug_toolbar']
 MIDDLEWARE += ['debug_toolbar.middleware.DebugToolbarMiddleware']
 INTERNAL_IPS = ['127.0.0.1']
 
-# Removed Celery settings (no background tasks needed for personal use) 
\ No newline at end of file
+# Tasks go to a local broker and run in a worker (see README, Celery Tasks),
+# so refills queued by a request never run inside it.
+CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/0')
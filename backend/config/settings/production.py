@@ -42,6 +42,9 @@ if SENTRY_DSN:
         send_default_pii=True
     )
 
+# One load balancer appends the client address to X-Forwarded-For.
+REST_FRAMEWORK['NUM_PROXIES'] = int(os.getenv('NUM_PROXIES', '1'))
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "https://phoenix.com",  # Replace with your frontend domain
@@ -52,11 +55,26 @@ CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL')
 CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND')
 
 # Cache
+# The AI completion cache relies on Redis evicting least recently used keys
+# (maxmemory-policy allkeys-lru) once it reaches its memory limit.
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
         'LOCATION': os.getenv('REDIS_URL'),
-    }
+    },
+    'ai': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+        'KEY_PREFIX': 'ai',
+    },
+}
+
+# Channel layer for WebSocket pushes (core.realtime)
+CHANNEL_LAYERS = {
+    'default': {
+        'BACKEND': 'channels_redis.core.RedisChannelLayer',
+        'CONFIG': {'hosts': [os.getenv('CHANNEL_LAYER_URL') or os.getenv('REDIS_URL')]},
+    },
 }
 
 # Static files
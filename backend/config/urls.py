@@ -20,6 +20,7 @@ from django.conf import settings
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from core.metrics import metrics_view
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -41,6 +42,8 @@ api_patterns = [
     path('exercises/', include('apps.exercises.urls')),
     path('dashboard/', include('apps.dashboard.urls')),
     path('tips/', include('apps.tips.urls')),
+    path('simulations/', include('apps.simulations.urls')),
+    path('reflections/', include('apps.reflections.urls')),
 ]
 
 urlpatterns = [
@@ -48,6 +51,7 @@ urlpatterns = [
     path('api/v1/', include(api_patterns)),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('metrics', metrics_view, name='metrics'),
 ]
 
 if settings.DEBUG:
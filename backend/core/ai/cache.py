@@ -0,0 +1,72 @@
+"""
+Content-addressed cache for model completions.
+
+The key is a SHA-256 over a canonical JSON encoding of the model, the prompt
+template (name and version), the sampling parameters and the inputs, with
+strings whitespace-normalized and dict keys sorted, so requests that differ
+only in formatting share an entry. Entries live in the Django cache alias
+named by ``AI_CACHE_ALIAS``: expiry is the entry TTL, and eviction is the
+backend's LRU (locmem culls least recently used entries past
+``MAX_ENTRIES``; Redis should run with ``maxmemory-policy allkeys-lru``).
+"""
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import caches
+from core.metrics import record_cache
+
+KEY_PREFIX = 'ai:completion:'
+
+
+def _normalize(value):
+    if isinstance(value, str):
+        return ' '.join(value.split())
+    if isinstance(value, dict):
+        return {str(key): _normalize(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def cache_key(model, template, params, inputs):
+    """Return the cache key for a completion request."""
+    payload = json.dumps(
+        {
+            'model': model,
+            'template': [template.name, template.version],
+            'params': _normalize(params),
+            'inputs': _normalize(inputs),
+        },
+        sort_keys=True,
+        separators=(',', ':'),
+        default=str,
+    )
+    return KEY_PREFIX + hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def get_cache():
+    return caches[settings.AI_CACHE_ALIAS]
+
+
+def get_cached(key):
+    """Return the cached completion payload for ``key``, or None."""
+    payload = get_cache().get(key)
+    record_cache('ai', payload is not None)
+    return payload
+
+
+def set_cached(key, payload, ttl=None):
+    """Store a completion payload under ``key`` for ``ttl`` seconds."""
+    get_cache().set(key, payload, settings.AI_CACHE_TTL if ttl is None else ttl)
+
+
+async def aget_cached(key):
+    """Async ``get_cached``."""
+    payload = await get_cache().aget(key)
+    record_cache('ai', payload is not None)
+    return payload
+
+
+async def aset_cached(key, payload, ttl=None):
+    """Async ``set_cached``."""
+    await get_cache().aset(key, payload, settings.AI_CACHE_TTL if ttl is None else ttl)
@@ -0,0 +1,248 @@
+import time
+from contextlib import nullcontext
+from dataclasses import asdict, replace
+from functools import partial
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from core.metrics import record_ai
+from .cache import aget_cached, aset_cached, cache_key, get_cached, set_cached
+from .exceptions import AIBudgetExceeded
+from .limits import CHARS_PER_TOKEN, estimate_prompt_tokens, estimate_tokens, get_limiter
+from .models import AIUsage
+from .singleflight import Flight, singleflight
+from .transport import Completion, OpenAITransport
+
+__all__ = ('AIClient', 'Completion', 'get_client')
+
+
+def _from_cache(hit):
+    return Completion(**{**hit, 'cached': True, 'latency_ms': 0.0}) if hit else None
+
+
+def _cached_completion(key):
+    return _from_cache(get_cached(key))
+
+
+async def _acached_completion(key):
+    return _from_cache(await aget_cached(key))
+
+
+def _shared(completion):
+    """A leader's completion as handed to its followers: served without a call."""
+    return replace(completion, cached=True)
+
+
+class AIClient:
+    """
+    Entry point for model completions, with a sync and an async API.
+
+    Responses are cached by content, identical in-flight requests are
+    coalesced, and every upstream call is admitted through the process-wide
+    limiter (concurrency, requests/minute, tokens/minute) and sent over a
+    shared pooled transport.
+
+    Every call is recorded as an ``AIUsage`` row tagged with ``user`` and
+    ``feature`` (the template name unless given), and users over
+    ``AI_USER_DAILY_TOKEN_BUDGET`` are refused fresh generations.
+    """
+
+    def __init__(self, api_key=None, default_model=None, base_url=None):
+        self.api_key = api_key or settings.OPENAI_API_KEY
+        self.default_model = default_model or settings.AI_DEFAULT_MODEL
+        self.base_url = base_url or settings.AI_BASE_URL
+        self._transport = None
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            self._transport = OpenAITransport(self.api_key, self.base_url)
+        return self._transport
+
+    def complete(self, template, inputs, model=None, cache=True, ttl=None,
+                 user=None, feature=None, **params):
+        """
+        Render ``template`` with ``inputs`` and return a Completion.
+
+        Identical requests (same model, template version, parameters and
+        normalized inputs) are answered from the cache while the entry lives.
+        Concurrent identical requests are coalesced into one upstream call.
+        Pass ``cache=False`` for generations that must be fresh (these are
+        neither cached nor coalesced).
+        """
+        model = model or self.default_model
+        messages = template.render(inputs)
+        if not cache:
+            self._check_budget(user)
+            completion = self._limited_request(model, messages, params)
+            self._record(completion, template, user, feature)
+            return completion
+
+        key = cache_key(model, template, params, inputs)
+        lookup = partial(_cached_completion, key)
+
+        def generate():
+            self._check_budget(user)
+            completion = self._limited_request(model, messages, params)
+            set_cached(key, asdict(completion), ttl)
+            return completion
+
+        completion = lookup()
+        if completion is None:
+            # Identical requests already in flight share one upstream call.
+            completion = singleflight.do(key, generate, lookup, _shared)
+        self._record(completion, template, user, feature)
+        return completion
+
+    async def acomplete(self, template, inputs, model=None, cache=True, ttl=None,
+                        user=None, feature=None, **params):
+        """
+        Async variant of ``complete``. Cached responses are shared with the
+        sync API, and identical requests are coalesced with sync and async
+        callers in other workers; cache round trips and waiting yield to the
+        event loop.
+        """
+        model = model or self.default_model
+        messages = template.render(inputs)
+        if not cache:
+            completion = await self._alimited_request(model, messages, params, user)
+            await self._arecord(completion, template, user, feature)
+            return completion
+
+        key = cache_key(model, template, params, inputs)
+        lookup = partial(_acached_completion, key)
+
+        async def generate():
+            completion = await self._alimited_request(model, messages, params, user)
+            await aset_cached(key, asdict(completion), ttl)
+            return completion
+
+        completion = await lookup()
+        if completion is None:
+            completion = await singleflight.ado(key, generate, lookup, _shared)
+        await self._arecord(completion, template, user, feature)
+        return completion
+
+    async def astream(self, template, inputs, model=None, cache=False, ttl=None,
+                      user=None, feature=None, **params):
+        """
+        Render ``template`` and yield the completion text as it is generated.
+
+        With ``cache=True`` a cached completion is yielded in one piece and a
+        fully streamed one is stored for next time. Identical streams in
+        flight are coalesced: followers get the leader's text in one piece.
+        """
+        model = model or self.default_model
+        messages = template.render(inputs)
+        key = cache_key(model, template, params, inputs) if cache else None
+        lookup = partial(_acached_completion, key)
+        if key:
+            hit = await lookup()
+            if hit is not None:
+                yield hit.text
+                await self._arecord(hit, template, user, feature)
+                return
+
+        joined = singleflight.aflight(key, lookup, _shared) if key else nullcontext(Flight())
+        async with joined as flight:
+            if flight.result is not None:
+                yield flight.result.text
+            else:
+                await self._acheck_budget(user)
+                reserved = estimate_tokens(messages, params.get('max_tokens'))
+                parts = []
+                async with get_limiter().aslot(reserved) as ticket:
+                    started = time.perf_counter()
+                    async for delta in self._stream_request(model, messages, params):
+                        parts.append(delta)
+                        yield delta
+                    # Streams carry no usage block; count with the usual estimate.
+                    completion = Completion(
+                        text=''.join(parts), model=model,
+                        prompt_tokens=estimate_prompt_tokens(messages),
+                        completion_tokens=len(''.join(parts)) // CHARS_PER_TOKEN,
+                        latency_ms=(time.perf_counter() - started) * 1000,
+                    )
+                    ticket.used = completion.prompt_tokens + completion.completion_tokens
+                if key:
+                    await aset_cached(key, asdict(completion), ttl)
+                flight.result = completion
+        await self._arecord(flight.result, template, user, feature)
+
+    def _usage(self, completion, template, user, feature):
+        return AIUsage(
+            user_id=getattr(user, 'pk', user), feature=feature or template.name,
+            template=template.name, model=completion.model,
+            prompt_tokens=completion.prompt_tokens,
+            completion_tokens=completion.completion_tokens,
+            latency_ms=completion.latency_ms, cached=completion.cached,
+        )
+
+    def _record(self, completion, template, user, feature):
+        record_ai(template.name, completion.latency_ms / 1000, completion.cached)
+        if settings.AI_USAGE_TRACKING:
+            self._usage(completion, template, user, feature).save()
+
+    async def _arecord(self, completion, template, user, feature):
+        record_ai(template.name, completion.latency_ms / 1000, completion.cached)
+        if settings.AI_USAGE_TRACKING:
+            await self._usage(completion, template, user, feature).asave()
+
+    def _budget_query(self, user):
+        budget = settings.AI_USER_DAILY_TOKEN_BUDGET
+        if not budget or user is None:
+            return None, None
+        since = timezone.now() - timedelta(days=1)
+        return budget, AIUsage.objects.filter(user=getattr(user, 'pk', user)).since(since)
+
+    def _check_budget(self, user):
+        budget, usage = self._budget_query(user)
+        if budget and usage.billed_tokens() >= budget:
+            raise AIBudgetExceeded('Daily AI token budget used up')
+
+    async def _acheck_budget(self, user):
+        budget, usage = self._budget_query(user)
+        if budget and await usage.abilled_tokens() >= budget:
+            raise AIBudgetExceeded('Daily AI token budget used up')
+
+    def _limited_request(self, model, messages, params):
+        reserved = estimate_tokens(messages, params.get('max_tokens'))
+        with get_limiter().slot(reserved) as ticket:
+            started = time.perf_counter()
+            completion = self._request(model, messages, params)
+            completion.latency_ms = (time.perf_counter() - started) * 1000
+            ticket.used = completion.prompt_tokens + completion.completion_tokens or None
+        return completion
+
+    async def _alimited_request(self, model, messages, params, user):
+        await self._acheck_budget(user)
+        reserved = estimate_tokens(messages, params.get('max_tokens'))
+        async with get_limiter().aslot(reserved) as ticket:
+            started = time.perf_counter()
+            completion = await self._arequest(model, messages, params)
+            completion.latency_ms = (time.perf_counter() - started) * 1000
+            ticket.used = completion.prompt_tokens + completion.completion_tokens or None
+        return completion
+
+    def _request(self, model, messages, params):
+        """Send one chat completion request upstream."""
+        return self.transport.request(model, messages, params)
+
+    async def _arequest(self, model, messages, params):
+        """Send one chat completion request upstream without blocking the loop."""
+        return await self.transport.arequest(model, messages, params)
+
+    def _stream_request(self, model, messages, params):
+        """Stream one chat completion upstream, yielding text deltas."""
+        return self.transport.astream(model, messages, params)
+
+
+_client = None
+
+
+def get_client():
+    """Return the process-wide AIClient."""
+    global _client
+    if _client is None:
+        _client = AIClient()
+    return _client
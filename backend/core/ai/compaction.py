@@ -0,0 +1,69 @@
+"""
+Prompt compaction: trim long inputs to a token budget before rendering.
+
+``AI_INPUT_BUDGETS`` maps template input names to token budgets; any template
+rendering an input with a budget gets it compacted. Multi-line text (such as
+a simulation's story so far) keeps its first line for context, then as many
+of the most recent lines as fit, with a marker for what was dropped. Single
+lines are cut at a word boundary, and lists keep their leading items (lists
+are passed newest first).
+"""
+from .limits import CHARS_PER_TOKEN
+
+
+def count_tokens(text):
+    """Rough token count for ``text``, matching the limiter's estimate."""
+    return len(text) // CHARS_PER_TOKEN
+
+
+def truncate(text, budget):
+    """Cut ``text`` to at most ``budget`` tokens at a word boundary."""
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    return text[:max(limit - 2, 0)].rsplit(' ', 1)[0].rstrip() + ' …'
+
+
+def compact_lines(text, budget):
+    """Keep the first line and the most recent lines of ``text`` within ``budget`` tokens."""
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    lines = text.splitlines()
+    head = truncate(lines[0], budget // 4)
+    remaining = limit - len(head) - 40  # room for the omission marker
+    tail = []
+    for line in reversed(lines[1:]):
+        if len(line) + 1 > remaining:
+            break
+        tail.append(line)
+        remaining -= len(line) + 1
+    if not tail and len(lines) > 1:
+        tail.append(truncate(lines[-1], max(remaining // CHARS_PER_TOKEN, 1)))
+    omitted = len(lines) - 1 - len(tail)
+    marker = [f'[… {omitted} earlier lines omitted]'] if omitted else []
+    return '\n'.join([head, *marker, *reversed(tail)])
+
+
+def compact(value, budget):
+    """Compact one input value to ``budget`` tokens."""
+    if isinstance(value, str):
+        return compact_lines(value, budget) if '\n' in value else truncate(value, budget)
+    if isinstance(value, (list, tuple)):
+        kept, used = [], 0
+        for item in value:
+            item = compact(item, budget) if isinstance(item, str) else item
+            used += count_tokens(str(item)) + 1
+            if kept and used > budget:
+                break
+            kept.append(item)
+        return kept
+    return value
+
+
+def compact_inputs(inputs, budgets):
+    """Return ``inputs`` with every budgeted value compacted."""
+    return {
+        name: compact(value, budgets[name]) if name in budgets else value
+        for name, value in inputs.items()
+    }
@@ -0,0 +1,18 @@
+class AIError(Exception):
+    """Base class for errors raised by the AI layer."""
+
+
+class AIConfigurationError(AIError):
+    """The AI layer is not configured (e.g. missing OPENAI_API_KEY)."""
+
+
+class AIUpstreamError(AIError):
+    """The model provider failed or returned an unusable response."""
+
+
+class AIRateLimited(AIError):
+    """The local request/token budget cannot admit the request in time."""
+
+
+class AIBudgetExceeded(AIError):
+    """The user has spent their token budget for the current window."""
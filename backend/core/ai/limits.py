@@ -0,0 +1,150 @@
+"""
+Local admission control for model requests.
+
+One ``RequestLimiter`` per process caps concurrent requests and enforces
+requests-per-minute and tokens-per-minute budgets with token buckets, so
+bursts queue here instead of turning into 429s upstream. Budgets are per
+process: divide the account limits by the number of workers. Callers that
+would wait longer than ``max_wait`` are rejected with ``AIRateLimited``
+(backpressure) rather than piling up behind the limiter.
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from django.conf import settings
+from .exceptions import AIRateLimited
+
+CHARS_PER_TOKEN = 4
+
+
+def estimate_prompt_tokens(messages):
+    """Estimate the prompt side of a request: ~4 characters per token plus message overhead."""
+    return sum(len(message['content']) // CHARS_PER_TOKEN + 4 for message in messages)
+
+
+def estimate_tokens(messages, max_tokens=None):
+    """Estimate a request's token cost: the prompt plus the reply cap."""
+    return estimate_prompt_tokens(messages) + (max_tokens or settings.AI_DEFAULT_MAX_TOKENS)
+
+
+class _Bucket:
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def refill(self, now):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_for(self, amount):
+        """Seconds until ``amount`` is available (0 if it is now)."""
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+
+class RequestLimiter:
+    """
+    Concurrency, RPM and TPM limiter usable from threads and coroutines.
+    """
+
+    def __init__(self, max_concurrency, requests_per_minute, tokens_per_minute, max_wait):
+        self.max_concurrency = max_concurrency
+        self.max_wait = max_wait
+        self._requests = _Bucket(requests_per_minute)
+        self._tokens = _Bucket(tokens_per_minute)
+        self._in_flight = 0
+        self._lock = threading.Lock()
+        self.stats = {'admitted': 0, 'rejected': 0, 'waited_seconds': 0.0}
+
+    def _try_admit(self, tokens):
+        """Admit the request now, or return how long to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+            self._requests.refill(now)
+            self._tokens.refill(now)
+            wait = max(self._requests.wait_for(1), self._tokens.wait_for(tokens))
+            if self._in_flight >= self.max_concurrency:
+                wait = max(wait, 0.005)
+            if wait:
+                return wait
+            self._requests.level -= 1
+            self._tokens.level -= min(tokens, self._tokens.capacity)
+            self._in_flight += 1
+            self.stats['admitted'] += 1
+            return 0.0
+
+    def _reject(self, tokens):
+        with self._lock:
+            self.stats['rejected'] += 1
+        raise AIRateLimited(f'AI request budget exhausted ({tokens} tokens requested)')
+
+    def _release(self, reserved, used):
+        with self._lock:
+            self._in_flight -= 1
+            if used is not None:
+                # Settle the estimate against the actual usage.
+                self._tokens.level = min(self._tokens.capacity,
+                                         self._tokens.level + reserved - used)
+
+    @contextmanager
+    def slot(self, tokens):
+        """Hold a request slot; set ``.used`` on the yielded ticket to settle tokens."""
+        started = time.monotonic()
+        while True:
+            wait = self._try_admit(tokens)
+            if not wait:
+                break
+            if time.monotonic() - started + wait > self.max_wait:
+                self._reject(tokens)
+            time.sleep(min(wait, 0.05))
+        ticket = _Ticket()
+        self._note_wait(started)
+        try:
+            yield ticket
+        finally:
+            self._release(tokens, ticket.used)
+
+    @asynccontextmanager
+    async def aslot(self, tokens):
+        """Async variant of ``slot``; waiting yields to the event loop."""
+        started = time.monotonic()
+        while True:
+            wait = self._try_admit(tokens)
+            if not wait:
+                break
+            if time.monotonic() - started + wait > self.max_wait:
+                self._reject(tokens)
+            await asyncio.sleep(min(wait, 0.05))
+        ticket = _Ticket()
+        self._note_wait(started)
+        try:
+            yield ticket
+        finally:
+            self._release(tokens, ticket.used)
+
+    def _note_wait(self, started):
+        with self._lock:
+            self.stats['waited_seconds'] += time.monotonic() - started
+
+
+class _Ticket:
+    used = None
+
+
+_limiter = None
+
+
+def get_limiter():
+    """Return the process-wide limiter configured from settings."""
+    global _limiter
+    if _limiter is None:
+        _limiter = RequestLimiter(
+            max_concurrency=settings.AI_MAX_CONCURRENCY,
+            requests_per_minute=settings.AI_REQUESTS_PER_MINUTE,
+            tokens_per_minute=settings.AI_TOKENS_PER_MINUTE,
+            max_wait=settings.AI_LIMIT_MAX_WAIT,
+        )
+    return _limiter
@@ -0,0 +1,64 @@
+import asyncio
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from core.ai.client import AIClient
+from core.ai.exceptions import AIError
+from core.ai.limits import get_limiter
+from core.ai.prompts import TIP
+from core.ai.stub import start_in_thread
+
+
+class Command(BaseCommand):
+    help = 'Fire concurrent completions through the pooled, rate-limited AI client.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200)
+        parser.add_argument('--concurrency', type=int, default=50,
+                            help='Requests issued at once (the limiter caps what goes upstream).')
+        parser.add_argument('--base-url', help='OpenAI-compatible endpoint; defaults to an in-process stub.')
+        parser.add_argument('--latency', type=float, default=0.2, help='Stub latency in seconds.')
+
+    def handle(self, *args, **options):
+        server = None
+        base_url = options['base_url']
+        if not base_url:
+            server = start_in_thread(port=0, latency=options['latency'])
+            base_url = 'http://%s:%s/v1' % server.server_address
+        client = AIClient(api_key='stub', base_url=base_url)
+        try:
+            latencies, errors, elapsed = asyncio.run(
+                self._run(client, options['requests'], options['concurrency'])
+            )
+        finally:
+            if server:
+                server.shutdown()
+
+        stats = get_limiter().stats
+        latencies.sort()
+        self.stdout.write(f'{len(latencies)} ok, {errors} failed in {elapsed:.2f}s '
+                          f'({len(latencies) / elapsed:.1f} req/s)')
+        if latencies:
+            p95 = latencies[int(len(latencies) * 0.95) - 1]
+            self.stdout.write(f'latency ms: p50={statistics.median(latencies):.1f} p95={p95:.1f}')
+        self.stdout.write(f'limiter: admitted={stats["admitted"]} rejected={stats["rejected"]} '
+                          f'waited={stats["waited_seconds"]:.2f}s')
+
+    async def _run(self, client, total, concurrency):
+        gate = asyncio.Semaphore(concurrency)
+        latencies, errors = [], 0
+
+        async def one(n):
+            nonlocal errors
+            async with gate:
+                started = time.perf_counter()
+                try:
+                    await client.acomplete(TIP, {'trigger': f'load test {n}'}, cache=False)
+                except AIError:
+                    errors += 1
+                else:
+                    latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(n) for n in range(total)))
+        return latencies, errors, time.perf_counter() - started
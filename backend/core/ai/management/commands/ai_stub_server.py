@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from core.ai.stub import make_server
+
+
+class Command(BaseCommand):
+    help = 'Run an OpenAI-compatible stub server for local load testing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--host', default='127.0.0.1')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--latency', type=float, default=0.2,
+                            help='Seconds to wait before answering each request.')
+
+    def handle(self, *args, **options):
+        server = make_server(options['host'], options['port'], options['latency'])
+        host, port = server.server_address
+        self.stdout.write(self.style.SUCCESS(
+            f'Stub listening; set AI_BASE_URL=http://{host}:{port}/v1'
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
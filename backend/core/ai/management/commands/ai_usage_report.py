@@ -0,0 +1,30 @@
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from core.ai.models import AIUsage
+
+
+class Command(BaseCommand):
+    help = 'Summarize AI token usage per feature and per active user.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7)
+
+    def handle(self, *args, **options):
+        usage = AIUsage.objects.since(timezone.now() - timedelta(days=options['days']))
+        rows = list(usage.by_feature())
+        if not rows:
+            self.stdout.write('No AI usage recorded.')
+            return
+        self.stdout.write(f'{"feature":<16}{"template":<18}{"calls":>7}{"hit %":>7}'
+                          f'{"tokens":>10}{"per user":>10}{"avg ms":>9}')
+        for row in rows:
+            tokens = row['prompt_tokens'] + row['completion_tokens']
+            per_user = tokens / row['users'] if row['users'] else 0
+            self.stdout.write(
+                f'{row["feature"]:<16}{row["template"]:<18}{row["calls"]:>7}'
+                f'{100 * row["cache_hits"] / row["calls"]:>7.1f}{tokens:>10}'
+                f'{per_user:>10.0f}{row["avg_latency_ms"] or 0:>9.0f}'
+            )
+        active = usage.exclude(user=None).values('user').distinct().count()
+        self.stdout.write(f'{usage.billed_tokens()} tokens billed across {active} active users.')
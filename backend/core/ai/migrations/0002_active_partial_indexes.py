@@ -0,0 +1,31 @@
+# Generated by Django 5.0.1 on 2026-10-18 00:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='aiusage',
+            name='ai_usage_time_feature_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='aiusage',
+            name='ai_usage_user_time_idx',
+        ),
+        migrations.AddIndex(
+            model_name='aiusage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['created_at', 'feature'], name='ai_usage_time_feature_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='aiusage',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['user', 'created_at'], name='ai_usage_user_time_idx'),
+        ),
+    ]
@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.db import models
+from django.db.models import Avg, Count, F, Q, Sum
+from core.models import ActiveManager, BaseModel, BaseQuerySet, active_index
+
+BILLED = Q(cached=False)
+BILLED_TOKENS = Sum(F('prompt_tokens') + F('completion_tokens'), filter=BILLED)
+
+
+class AIUsageQuerySet(BaseQuerySet):
+    def since(self, start):
+        return self.filter(created_at__gte=start)
+
+    def billed_tokens(self):
+        """Prompt plus completion tokens actually sent upstream (cache hits are free)."""
+        return self.aggregate(tokens=BILLED_TOKENS)['tokens'] or 0
+
+    async def abilled_tokens(self):
+        return (await self.aaggregate(tokens=BILLED_TOKENS))['tokens'] or 0
+
+    def by_feature(self):
+        """One row per (feature, template) with call, cache and token totals."""
+        return (
+            self.values('feature', 'template')
+            .annotate(
+                calls=Count('id'),
+                cache_hits=Count('id', filter=Q(cached=True)),
+                prompt_tokens=Sum('prompt_tokens', filter=BILLED, default=0),
+                completion_tokens=Sum('completion_tokens', filter=BILLED, default=0),
+                avg_latency_ms=Avg('latency_ms', filter=BILLED),
+                users=Count('user', distinct=True),
+            )
+            .order_by('feature', 'template')
+        )
+
+
+class AIUsage(BaseModel):
+    """
+    One model call: who made it, for which feature and template, what it
+    cost in tokens, how long it took and whether the cache answered it.
+    Cached rows keep the token counts of the original call, so they measure
+    what the cache saved.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True,
+        on_delete=models.SET_NULL, related_name='ai_usage'
+    )
+    feature = models.CharField(max_length=50)
+    template = models.CharField(max_length=50)
+    model = models.CharField(max_length=100)
+    prompt_tokens = models.PositiveIntegerField(default=0)
+    completion_tokens = models.PositiveIntegerField(default=0)
+    latency_ms = models.FloatField(default=0)
+    cached = models.BooleanField(default=False)
+
+    objects = ActiveManager.from_queryset(AIUsageQuerySet)()
+    all_objects = AIUsageQuerySet.as_manager()
+
+    class Meta(BaseModel.Meta):
+        indexes = [
+            active_index('created_at', 'feature', name='ai_usage_time_feature_idx'),
+            active_index('user', 'created_at', name='ai_usage_user_time_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.feature}/{self.template}: {self.prompt_tokens}+{self.completion_tokens} tokens'
@@ -0,0 +1,83 @@
+from dataclasses import dataclass
+from django.conf import settings
+from .compaction import compact_inputs
+
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    A named, versioned chat prompt. Bump ``version`` whenever the wording
+    changes so cached completions of the old wording stop matching.
+
+    Inputs named in ``AI_INPUT_BUDGETS`` are compacted to their token budget
+    before substitution (see ``core.ai.compaction``).
+    """
+    name: str
+    version: int
+    system: str
+    user: str
+
+    def render(self, inputs):
+        """Return chat messages with ``inputs`` substituted into the template."""
+        inputs = compact_inputs(inputs, settings.AI_INPUT_BUDGETS)
+        return [
+            {'role': 'system', 'content': self.system.format(**inputs)},
+            {'role': 'user', 'content': self.user.format(**inputs)},
+        ]
+
+
+QUIZ = PromptTemplate(
+    name='quiz',
+    version=1,
+    system=(
+        'You write short multiple-choice quizzes for an ADHD-focused recovery app. '
+        'Each question ties back to a direct lesson and an actionable tip. '
+        'Reply with JSON: {{"questions": [{{"question": str, "options": [str, str, str, str], '
+        '"correct_answer": int, "explanation": str, "tip": str}}]}}.'
+    ),
+    user='Write {count} {difficulty} questions about {domain}.',
+)
+
+TIP = PromptTemplate(
+    name='tip',
+    version=1,
+    system=(
+        'You write brief, warm but structured coping tips for an ADHD-focused recovery app. '
+        'Reply with JSON: {{"title": str, "content": str, "tags": [str]}}.'
+    ),
+    user='Write a tip for someone whose urges are triggered by {trigger}.',
+)
+
+EXERCISE_SCRIPT = PromptTemplate(
+    name='exercise_script',
+    version=1,
+    system=(
+        'You write calm guided audio scripts of two to three minutes for text-to-speech. '
+        'Use short sentences and mark pauses with [pause].'
+    ),
+    user='Write a guided exercise on the theme: {theme}.',
+)
+
+SIMULATION_STEP = PromptTemplate(
+    name='simulation_step',
+    version=1,
+    system=(
+        'You run short interactive scenario simulations that help someone practise '
+        'handling urges. Write the next scene in the second person in under 120 words. '
+        'Unless the scenario is over, end with one line: "Choices: <a> | <b> | <c>".'
+    ),
+    user=(
+        'Scenario: {scenario}\nRecent triggers: {triggers}\n'
+        'Story so far:\n{history}\n{instruction}'
+    ),
+)
+
+WEEKLY_RECAP = PromptTemplate(
+    name='weekly_recap',
+    version=1,
+    system=(
+        'You write a short, encouraging but honest weekly recap for an ADHD-focused '
+        'recovery app, in under 150 words, ending with one concrete focus for next week.'
+    ),
+    user='Week starting {week_start}. Summary: {summary}',
+)
@@ -0,0 +1,248 @@
+"""
+Single-flight coalescing of identical in-flight AI requests.
+
+Concurrent callers with the same key share one upstream call. Within a
+process, followers wait on the leader thread's result. Across processes and
+containers, the leader holds a short-lived lock in the shared AI cache and
+followers poll the response cache until the leader has stored its result.
+If the leader lets go of the lock without a result, the next follower to
+take it leads; a follower that waits too long runs the call itself.
+
+The async API (``ado``, ``aflight``) coalesces the same way, waiting on a
+per-key ``asyncio.Future`` within an event loop and using the cache's async
+API so that claiming, polling and releasing never block the loop.
+"""
+import asyncio
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import asynccontextmanager
+from django.conf import settings
+from .cache import get_cache
+
+LOCK_PREFIX = 'ai:inflight:'
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Flight:
+    """
+    One caller's place in an async flight. ``result`` is the shared result,
+    or None when this caller leads and must produce (and publish) it.
+    """
+
+    def __init__(self, result=None):
+        self.result = result
+
+
+def _unchanged(result):
+    return result
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls by key. ``do(key, fn, lookup)`` runs ``fn``
+    (which must publish its result so that ``lookup`` can see it) at most
+    once per key across all workers sharing the cache. ``lookup`` returns
+    None until a result is published. ``share`` maps the leader's result
+    for followers in the same process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._futures = {}
+        self._stats = Counter()
+
+    def do(self, key, fn, lookup, share=_unchanged):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            if not call.done.wait(settings.AI_SINGLEFLIGHT_WAIT):
+                self._count('wait_timeouts')
+                self._count('upstream_calls')
+                return fn()
+            if call.error is not None:
+                raise call.error
+            self._count('coalesced_local')
+            return share(call.result)
+
+        token = None
+        try:
+            call.result, token = self._claim(key, lookup)
+            if call.result is None:
+                self._count('upstream_calls')
+                call.result = fn()
+            return call.result
+        except Exception as exc:
+            call.error = exc
+            raise
+        finally:
+            self._release(key, token)
+            call.done.set()
+            with self._lock:
+                del self._calls[key]
+
+    def _claim(self, key, lookup):
+        """
+        Take the shared lock for ``key`` or wait for the worker holding it.
+        Returns ``(result, token)``: the other worker's published result, or
+        the lock token to release once this caller has run the call (None if
+        the wait timed out and the caller runs it without the lock).
+        """
+        cache = get_cache()
+        lock_key = LOCK_PREFIX + key
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + settings.AI_SINGLEFLIGHT_WAIT
+        while True:
+            if cache.add(lock_key, token, settings.AI_SINGLEFLIGHT_LOCK_TTL):
+                return None, token
+            # Another worker is generating this response; wait for it to land.
+            while time.monotonic() < deadline:
+                time.sleep(settings.AI_SINGLEFLIGHT_POLL_INTERVAL)
+                hit = lookup()
+                if hit is not None:
+                    self._count('coalesced_remote')
+                    return hit, None
+                if cache.get(lock_key) is None:
+                    break
+            else:
+                self._count('wait_timeouts')
+                return None, None
+            hit = lookup()
+            if hit is not None:
+                self._count('coalesced_remote')
+                return hit, None
+            # The leader let go without a result; the next to take the lock leads.
+            self._count('leaders_lost')
+
+    def _release(self, key, token):
+        if token is not None:
+            cache = get_cache()
+            if cache.get(LOCK_PREFIX + key) == token:
+                cache.delete(LOCK_PREFIX + key)
+
+    async def ado(self, key, fn, lookup, share=_unchanged):
+        """Async ``do``: ``fn`` and ``lookup`` are coroutine functions."""
+        async with self.aflight(key, lookup, share) as flight:
+            if flight.result is None:
+                flight.result = await fn()
+        return flight.result
+
+    @asynccontextmanager
+    async def aflight(self, key, lookup, share=_unchanged):
+        """
+        Join the flight for ``key`` and yield a ``Flight``. When its
+        ``result`` is None the caller leads: it generates inside the block,
+        publishes for ``lookup`` and sets ``result`` for local followers.
+        Suits callers that cannot hand over a function, such as streams.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = self._futures.get((loop, key))
+            leader = future is None
+            if leader:
+                future = self._futures[(loop, key)] = loop.create_future()
+
+        if not leader:
+            flight = Flight(await self._await_leader(future, share))
+            if flight.result is None:
+                self._count('upstream_calls')
+            yield flight
+            return
+
+        flight = Flight()
+        token = None
+        try:
+            flight.result, token = await self._aclaim(key, lookup)
+            if flight.result is None:
+                self._count('upstream_calls')
+            yield flight
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # Followers re-raise it; nothing is left unretrieved.
+            raise
+        finally:
+            await self._arelease(key, token)
+            if not future.done():
+                # None when the leader was abandoned: followers generate themselves.
+                future.set_result(flight.result)
+            with self._lock:
+                del self._futures[(loop, key)]
+
+    async def _await_leader(self, future, share):
+        """The local leader's shared result, or None if it timed out or was abandoned."""
+        try:
+            result = await asyncio.wait_for(asyncio.shield(future), settings.AI_SINGLEFLIGHT_WAIT)
+        except asyncio.TimeoutError:
+            self._count('wait_timeouts')
+            return None
+        if result is None:
+            return None
+        self._count('coalesced_local')
+        return share(result)
+
+    async def _aclaim(self, key, lookup):
+        """Async ``_claim``."""
+        cache = get_cache()
+        lock_key = LOCK_PREFIX + key
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + settings.AI_SINGLEFLIGHT_WAIT
+        while True:
+            if await cache.aadd(lock_key, token, settings.AI_SINGLEFLIGHT_LOCK_TTL):
+                return None, token
+            while time.monotonic() < deadline:
+                await asyncio.sleep(settings.AI_SINGLEFLIGHT_POLL_INTERVAL)
+                hit = await lookup()
+                if hit is not None:
+                    self._count('coalesced_remote')
+                    return hit, None
+                if await cache.aget(lock_key) is None:
+                    break
+            else:
+                self._count('wait_timeouts')
+                return None, None
+            hit = await lookup()
+            if hit is not None:
+                self._count('coalesced_remote')
+                return hit, None
+            self._count('leaders_lost')
+
+    async def _arelease(self, key, token):
+        if token is not None:
+            cache = get_cache()
+            if await cache.aget(LOCK_PREFIX + key) == token:
+                await cache.adelete(LOCK_PREFIX + key)
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        """
+        Return counters: ``upstream_calls`` made, calls saved by local and
+        remote coalescing, ``saved_calls`` in total, followers that gave up
+        waiting (``wait_timeouts``) and leaders that let go of the lock
+        without a result (``leaders_lost``).
+        """
+        with self._lock:
+            stats = dict(self._stats)
+        stats['saved_calls'] = stats.get('coalesced_local', 0) + stats.get('coalesced_remote', 0)
+        return stats
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+singleflight = SingleFlight()
@@ -0,0 +1,95 @@
+"""
+OpenAI-compatible stub server for local load testing.
+
+Serves ``POST /v1/chat/completions`` (plain and ``stream=True``) with a
+configurable latency and canned text, so the client, pool and limiter can
+be exercised without spending real tokens. Point the app at it with
+``AI_BASE_URL=http://127.0.0.1:8765/v1``.
+"""
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+STUB_TEXT = 'Take a slow breath. The urge will pass, and you are still in control.'
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # keep-alive, like the real API
+    latency = 0.2
+    text = STUB_TEXT
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/v1/chat/completions':
+            return self._send_json(404, {'error': {'message': 'Not found'}})
+        length = int(self.headers.get('Content-Length') or 0)
+        body = json.loads(self.rfile.read(length) or b'{}')
+        prompt_chars = sum(len(m.get('content') or '') for m in body.get('messages', []))
+        time.sleep(self.latency)
+        if body.get('stream'):
+            return self._send_stream(body.get('model', 'stub'))
+        self._send_json(200, {
+            'id': f'chatcmpl-{uuid.uuid4().hex}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'stub'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': self.text},
+                'finish_reason': 'stop',
+            }],
+            'usage': {
+                'prompt_tokens': prompt_chars // 4,
+                'completion_tokens': len(self.text) // 4,
+                'total_tokens': prompt_chars // 4 + len(self.text) // 4,
+            },
+        })
+
+    def _send_json(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, model):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        chunk_id = f'chatcmpl-{uuid.uuid4().hex}'
+        for word in self.text.split(' '):
+            chunk = {
+                'id': chunk_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'delta': {'content': word + ' '}, 'finish_reason': None}],
+            }
+            self.wfile.write(f'data: {json.dumps(chunk)}\n\n'.encode())
+        self.wfile.write(b'data: [DONE]\n\n')
+        self.close_connection = True
+
+
+class StubServer(ThreadingHTTPServer):
+    request_queue_size = 256  # Load tests open many connections at once
+
+
+def make_server(host='127.0.0.1', port=8765, latency=0.2, text=STUB_TEXT):
+    """Build (but do not start) a stub server; ``port=0`` picks a free port."""
+    handler = type('ConfiguredStubHandler', (StubHandler,), {'latency': latency, 'text': text})
+    server = StubServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def start_in_thread(**kwargs):
+    """Start a stub server on a background thread and return it."""
+    server = make_server(**kwargs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
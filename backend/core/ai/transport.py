@@ -0,0 +1,116 @@
+"""
+Pooled HTTP transport to the OpenAI API.
+
+One sync and one async OpenAI SDK client are kept per process (the async one
+per event loop, since httpx async pools are loop-bound), each over an httpx
+connection pool with keep-alive, so requests reuse warm TLS connections
+instead of opening a session per call. ``AI_BASE_URL`` points the transport
+at another OpenAI-compatible server, such as the local stub.
+"""
+import asyncio
+import weakref
+from dataclasses import dataclass
+import httpx
+from django.conf import settings
+from .exceptions import AIConfigurationError, AIUpstreamError
+
+
+@dataclass
+class Completion:
+    """
+    Result of a completion request.
+    """
+    text: str
+    model: str
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    latency_ms: float = 0.0
+    cached: bool = False
+
+
+def _pool_limits():
+    return httpx.Limits(
+        max_connections=settings.AI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.AI_MAX_CONNECTIONS,
+        keepalive_expiry=settings.AI_KEEPALIVE_EXPIRY,
+    )
+
+
+def _to_completion(response):
+    if not response.choices or response.choices[0].message.content is None:
+        raise AIUpstreamError('Empty completion')
+    usage = response.usage
+    return Completion(
+        text=response.choices[0].message.content,
+        model=response.model,
+        prompt_tokens=usage.prompt_tokens if usage else 0,
+        completion_tokens=usage.completion_tokens if usage else 0,
+    )
+
+
+class OpenAITransport:
+    """
+    Sends chat completion requests over pooled keep-alive connections.
+    """
+
+    def __init__(self, api_key, base_url=None):
+        if not api_key:
+            raise AIConfigurationError('OPENAI_API_KEY is not set')
+        self.api_key = api_key
+        self.base_url = base_url
+        self._sync = None
+        self._async = weakref.WeakKeyDictionary()
+
+    def _options(self):
+        return {
+            'api_key': self.api_key,
+            'base_url': self.base_url,
+            'timeout': settings.AI_REQUEST_TIMEOUT,
+            'max_retries': settings.AI_MAX_RETRIES,
+        }
+
+    def sync_client(self):
+        if self._sync is None:
+            from openai import OpenAI
+            self._sync = OpenAI(**self._options(),
+                                http_client=httpx.Client(limits=_pool_limits()))
+        return self._sync
+
+    def async_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._async.get(loop)
+        if client is None:
+            from openai import AsyncOpenAI
+            client = self._async[loop] = AsyncOpenAI(
+                **self._options(), http_client=httpx.AsyncClient(limits=_pool_limits())
+            )
+        return client
+
+    def request(self, model, messages, params):
+        try:
+            response = self.sync_client().chat.completions.create(
+                model=model, messages=messages, **params
+            )
+        except Exception as exc:
+            raise AIUpstreamError(str(exc)) from exc
+        return _to_completion(response)
+
+    async def arequest(self, model, messages, params):
+        try:
+            response = await self.async_client().chat.completions.create(
+                model=model, messages=messages, **params
+            )
+        except Exception as exc:
+            raise AIUpstreamError(str(exc)) from exc
+        return _to_completion(response)
+
+    async def astream(self, model, messages, params):
+        try:
+            stream = await self.async_client().chat.completions.create(
+                model=model, messages=messages, stream=True, **params
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as exc:
+            raise AIUpstreamError(str(exc)) from exc
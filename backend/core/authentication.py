@@ -1,8 +1,31 @@
+from django.contrib.auth.backends import ModelBackend
 from rest_framework.authentication import SessionAuthentication
+from core.user_cache import cache_user, get_cached_user
 
 class CsrfExemptSessionAuthentication(SessionAuthentication):
     """
     Session authentication without CSRF protection for personal project use.
     """
     def enforce_csrf(self, request):
-        return  # Skip CSRF check 
\ No newline at end of file
+        return  # Skip CSRF check
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    Model backend that loads the session's user (with its profile) from the
+    per-user cache, falling back to one joined query on a miss.
+    """
+    def get_user(self, user_id):
+        user = get_cached_user(user_id)
+        if user is None:
+            user = self._load(user_id)
+            if user is None:
+                return None
+            cache_user(user)
+        return user if self.user_can_authenticate(user) else None
+
+    def _load(self, user_id):
+        from django.contrib.auth import get_user_model
+        User = get_user_model()
+        # select_related also caches a missing profile, so it is not re-queried.
+        return User._default_manager.select_related('profile').filter(pk=user_id).first()
@@ -0,0 +1,39 @@
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+from . import realtime
+
+UNAUTHORIZED = 4401
+
+
+class UserUpdatesConsumer(AsyncJsonWebsocketConsumer):
+    """
+    ``/ws/updates/``: the signed-in user's streak, badge and rollup changes
+    as ``{"type": event, "data": ...}`` messages (see ``core.realtime``).
+
+    Clients send ``{"type": "ping"}`` at least every
+    ``REALTIME_PRESENCE_TTL`` seconds; the reply ``{"type": "pong"}`` echoes
+    any ``ts`` sent, for measuring round-trip latency.
+    """
+
+    async def connect(self):
+        user = self.scope.get('user')
+        if user is None or not user.is_authenticated:
+            await self.close(code=UNAUTHORIZED)
+            return
+        self.user_id = user.pk
+        await realtime.aconnected(self.user_id)
+        await self.channel_layer.group_add(realtime.group_name(self.user_id), self.channel_name)
+        await self.accept()
+
+    async def disconnect(self, code):
+        if getattr(self, 'user_id', None) is None:
+            return
+        await self.channel_layer.group_discard(realtime.group_name(self.user_id), self.channel_name)
+        await realtime.adisconnected(self.user_id)
+
+    async def receive_json(self, content, **kwargs):
+        if isinstance(content, dict) and content.get('type') == 'ping':
+            await realtime.atouch(self.user_id)
+            await self.send_json({'type': 'pong', 'ts': content.get('ts')})
+
+    async def user_event(self, message):
+        await self.send_json({'type': message['event'], 'data': message['data']})
@@ -0,0 +1,92 @@
+"""
+Time-ordered UUIDs (version 7, RFC 9562) for primary keys.
+
+A v7 UUID starts with a 48-bit Unix timestamp in milliseconds, so new keys
+are appended at the right edge of the primary-key B-tree instead of being
+scattered across it, and the key itself encodes the row's creation time.
+"""
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+_VERSION = 0x7
+_VARIANT = 0b10
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+
+def _build(ms, rand_a, rand_b):
+    value = (ms & 0xFFFFFFFFFFFF) << 80
+    value |= _VERSION << 76
+    value |= (rand_a & 0xFFF) << 64
+    value |= _VARIANT << 62
+    value |= rand_b & 0x3FFFFFFFFFFFFFFF
+    return uuid.UUID(int=value)
+
+
+def uuid7():
+    """
+    Return a new version 7 UUID.
+
+    The 12-bit ``rand_a`` field is used as a counter within one millisecond
+    (seeded randomly each millisecond), so ids generated by one process are
+    strictly increasing even when many are created in the same millisecond.
+    """
+    global _last_ms, _counter
+    with _lock:
+        ms = time.time_ns() // 1_000_000
+        if ms > _last_ms:
+            _last_ms = ms
+            _counter = int.from_bytes(os.urandom(2), 'big') & 0x7FF
+        else:
+            _counter += 1
+            if _counter > 0xFFF:
+                # Counter exhausted: borrow the next millisecond.
+                _last_ms += 1
+                _counter = 0
+        ms, counter = _last_ms, _counter
+    return _build(ms, counter, int.from_bytes(os.urandom(8), 'big'))
+
+
+def uuid7_time(value):
+    """
+    Return the creation time encoded in a v7 UUID as an aware UTC datetime,
+    or ``None`` for other UUID versions (e.g. legacy uuid4 keys).
+    """
+    if not isinstance(value, uuid.UUID):
+        value = uuid.UUID(str(value))
+    if value.version != _VERSION:
+        return None
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=dt_timezone.utc)
+
+
+def _to_ms(moment):
+    return int(moment.timestamp() * 1000)
+
+
+def uuid7_floor(moment):
+    """Return the smallest v7 UUID that can be generated at ``moment``."""
+    return _build(_to_ms(moment), 0, 0)
+
+
+def uuid7_ceiling(moment):
+    """Return the largest v7 UUID that can be generated at ``moment``."""
+    return _build(_to_ms(moment), 0xFFF, 0x3FFFFFFFFFFFFFFF)
+
+
+def uuid7_range(start=None, end=None):
+    """
+    Return ``pk`` lookups selecting v7 ids created in ``[start, end)``, for
+    ``Model.objects.filter(**uuid7_range(start, end))``. This turns a
+    ``created_at`` range into a primary-key index range scan. Rows still
+    keyed by uuid4 carry no time and must be filtered on ``created_at``.
+    """
+    lookups = {}
+    if start is not None:
+        lookups['pk__gte'] = uuid7_floor(start)
+    if end is not None:
+        lookups['pk__lt'] = uuid7_floor(end)
+    return lookups
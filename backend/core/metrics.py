@@ -0,0 +1,214 @@
+"""
+In-process metrics with Prometheus text exposition.
+
+Each worker process keeps counters and histograms in a ``Registry`` and
+periodically writes a snapshot of it to the shared cache (Redis in
+production) under its own key. ``/metrics`` merges every live worker's
+snapshot, so one scrape of any task behind the load balancer sees the
+whole fleet. Snapshots expire ``METRICS_WORKER_TTL`` after a worker stops
+flushing; Prometheus treats the drop as a counter reset.
+
+``RequestStats`` accumulates the current request's SQL, cache and AI
+figures for ``core.middleware.MetricsMiddleware``; it lives in a context
+variable so it follows async views into ``sync_to_async`` threads.
+"""
+import contextvars
+import ipaddress
+import os
+import socket
+import threading
+import time
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse, HttpResponseForbidden
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+WORKERS_KEY = 'metrics:workers'
+WORKER_PREFIX = 'metrics:worker:'
+
+HELP = {
+    'phoenix_http_requests_total': ('counter', 'Requests by view, method and status.'),
+    'phoenix_http_request_duration_seconds': ('histogram', 'Total request latency.'),
+    'phoenix_db_queries': ('histogram', 'SQL queries per request.'),
+    'phoenix_db_duration_seconds': ('histogram', 'SQL time per request.'),
+    'phoenix_cache_requests_total': ('counter', 'Cache lookups by cache and result.'),
+    'phoenix_ai_request_duration_seconds': ('histogram', 'Model call latency.'),
+    'phoenix_throttle_checks_total': ('counter', 'Throttle checks by scope and result.'),
+}
+
+
+class Registry:
+    """Thread-safe counters and histograms for one process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.last_flush = 0.0
+
+    def inc(self, name, labels, amount=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value, buckets=SECONDS_BUCKETS):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            series = self.histograms.get(key)
+            if series is None:
+                series = self.histograms[key] = {'buckets': buckets, 'counts': [0] * len(buckets),
+                                                 'sum': 0.0, 'count': 0}
+            for index, bound in enumerate(buckets):
+                if value <= bound:
+                    series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'histograms': {key: {**series, 'counts': list(series['counts'])}
+                               for key, series in self.histograms.items()},
+            }
+
+    def reset(self):
+        with self._lock:
+            self.counters.clear()
+            self.histograms.clear()
+
+
+registry = Registry()
+
+
+class RequestStats:
+    __slots__ = ('queries', 'db_seconds', 'cache_hits', 'cache_misses', 'ai_calls', 'ai_seconds')
+
+    def __init__(self):
+        self.queries = self.cache_hits = self.cache_misses = self.ai_calls = 0
+        self.db_seconds = self.ai_seconds = 0.0
+
+
+current_request = contextvars.ContextVar('metrics_request', default=None)
+
+
+def record_cache(cache, hit):
+    """Count one lookup in one of the app's caches (``ai``, ``user``...)."""
+    registry.inc('phoenix_cache_requests_total', {'cache': cache, 'result': 'hit' if hit else 'miss'})
+    stats = current_request.get()
+    if stats is not None:
+        if hit:
+            stats.cache_hits += 1
+        else:
+            stats.cache_misses += 1
+
+
+def record_ai(template, seconds, cached):
+    registry.observe('phoenix_ai_request_duration_seconds',
+                     {'template': template, 'cached': str(cached).lower()}, seconds)
+    stats = current_request.get()
+    if stats is not None:
+        stats.ai_calls += 1
+        stats.ai_seconds += seconds
+
+
+def _cache():
+    return caches[settings.METRICS_CACHE_ALIAS]
+
+
+def worker_id():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def flush_due():
+    return time.monotonic() - registry.last_flush >= settings.METRICS_FLUSH_INTERVAL
+
+
+def flush(force=False):
+    """Publish this worker's snapshot, at most every ``METRICS_FLUSH_INTERVAL`` seconds."""
+    if not force and not flush_due():
+        return
+    registry.last_flush = time.monotonic()
+    cache, me = _cache(), worker_id()
+    cache.set(WORKER_PREFIX + me, registry.snapshot(), settings.METRICS_WORKER_TTL)
+    workers = cache.get(WORKERS_KEY) or []
+    if me not in workers:
+        # Unlocked read-modify-write: a lost update is repaired on the next flush.
+        cache.set(WORKERS_KEY, [*workers, me][-settings.METRICS_MAX_WORKERS:], None)
+
+
+def collect():
+    """Merge the snapshots of every live worker."""
+    flush(force=True)
+    cache = _cache()
+    workers = cache.get(WORKERS_KEY) or []
+    snapshots = cache.get_many([WORKER_PREFIX + worker for worker in workers])
+    live = [worker for worker in workers if WORKER_PREFIX + worker in snapshots]
+    if len(live) != len(workers):
+        cache.set(WORKERS_KEY, live, None)
+    counters, histograms = {}, {}
+    for snapshot in snapshots.values():
+        for key, value in snapshot['counters'].items():
+            counters[key] = counters.get(key, 0) + value
+        for key, series in snapshot['histograms'].items():
+            merged = histograms.setdefault(key, {'buckets': series['buckets'],
+                                                 'counts': [0] * len(series['buckets']),
+                                                 'sum': 0.0, 'count': 0})
+            merged['counts'] = [a + b for a, b in zip(merged['counts'], series['counts'])]
+            merged['sum'] += series['sum']
+            merged['count'] += series['count']
+    return {'counters': counters, 'histograms': histograms, 'workers': len(snapshots)}
+
+
+def _labels(pairs, **extra):
+    items = [*pairs, *extra.items()]
+    if not items:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"') for _, value in items)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(items, escaped)) + '}'
+
+
+def render(collected):
+    """Format collected metrics in the Prometheus text format (version 0.0.4)."""
+    lines, described = [], set()
+
+    def describe(name):
+        if name not in described and name in HELP:
+            kind, text = HELP[name]
+            lines.extend([f'# HELP {name} {text}', f'# TYPE {name} {kind}'])
+            described.add(name)
+
+    for (name, labels), value in sorted(collected['counters'].items()):
+        describe(name)
+        lines.append(f'{name}{_labels(labels)} {value}')
+    for (name, labels), series in sorted(collected['histograms'].items()):
+        describe(name)
+        for bound, count in zip(series['buckets'], series['counts']):
+            lines.append(f'{name}_bucket{_labels(labels, le=bound)} {count}')
+        lines.append(f'{name}_bucket{_labels(labels, le="+Inf")} {series["count"]}')
+        lines.append(f'{name}_sum{_labels(labels)} {series["sum"]:.6f}')
+        lines.append(f'{name}_count{_labels(labels)} {series["count"]}')
+    lines.append(f'phoenix_metrics_workers {collected["workers"]}')
+    return '\n'.join(lines) + '\n'
+
+
+def _allowed(request):
+    token = settings.METRICS_TOKEN
+    if token:
+        return request.META.get('HTTP_AUTHORIZATION') == f'Bearer {token}'
+    if 'HTTP_X_FORWARDED_FOR' in request.META:
+        # Came through the load balancer, whose own address is private.
+        return False
+    try:
+        address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+    except ValueError:
+        return False
+    return address.is_private or address.is_loopback
+
+
+def metrics_view(request):
+    """GET /metrics: fleet-wide metrics for Prometheus (private network or bearer token)."""
+    if not _allowed(request):
+        return HttpResponseForbidden()
+    return HttpResponse(render(collect()), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,105 @@
+"""
+Per-request performance metrics.
+
+``MetricsMiddleware`` measures every request's total latency, SQL query
+count and time, app cache hits and misses and time spent in model calls,
+reports them to the client in a ``Server-Timing`` header and feeds the
+histograms in ``core.metrics``. Streaming responses are timed up to the
+first byte.
+"""
+import time
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from core import metrics
+from core.metrics import COUNT_BUCKETS, RequestStats, current_request, registry
+
+
+def _track_query(execute, sql, params, many, context):
+    stats = current_request.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def _install(connection, **kwargs):
+    if _track_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_track_query)
+
+
+def install_query_tracking():
+    """Wrap this thread's connections now and every connection opened later."""
+    connection_created.connect(_install, dispatch_uid='core.metrics.track_queries')
+    for connection in connections.all(initialized_only=True):
+        _install(connection)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_query_tracking()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        stats = RequestStats()
+        token, started = current_request.set(stats), time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self.observe(request, response, stats, time.perf_counter() - started)
+        metrics.flush()
+        return response
+
+    async def __acall__(self, request):
+        stats = RequestStats()
+        token, started = current_request.set(stats), time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request.reset(token)
+        self.observe(request, response, stats, time.perf_counter() - started)
+        if metrics.flush_due():
+            await sync_to_async(metrics.flush)()
+        return response
+
+    def observe(self, request, response, stats, total):
+        match = request.resolver_match
+        view = match.view_name if match else 'unmatched'
+        if view == 'metrics':
+            return response
+        registry.inc('phoenix_http_requests_total',
+                     {'view': view, 'method': request.method, 'status': response.status_code})
+        registry.observe('phoenix_http_request_duration_seconds', {'view': view}, total)
+        registry.observe('phoenix_db_queries', {'view': view}, stats.queries, COUNT_BUCKETS)
+        registry.observe('phoenix_db_duration_seconds', {'view': view}, stats.db_seconds)
+        if settings.METRICS_SERVER_TIMING:
+            response['Server-Timing'] = server_timing(stats, total)
+        return response
+
+
+def server_timing(stats, total):
+    parts = [
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"',
+        f'cache;desc="{stats.cache_hits} hits, {stats.cache_misses} misses"',
+    ]
+    if stats.ai_calls:
+        parts.append(f'ai;dur={stats.ai_seconds * 1000:.1f};desc="{stats.ai_calls} calls"')
+    parts.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(parts)
@@ -1,17 +1,64 @@
 from django.db import models
 from django.utils import timezone
-import uuid
+from core.ids import uuid7, uuid7_time
+
+ACTIVE = models.Q(is_active=True)
+
+
+class BaseQuerySet(models.QuerySet):
+    """
+    QuerySet with set-based soft delete: each call is a single UPDATE.
+    """
+
+    def soft_delete(self):
+        """Mark every row in the queryset inactive; returns the row count."""
+        return self._set_active(False)
+
+    def restore(self):
+        """Mark every row in the queryset active again; returns the row count."""
+        return self._set_active(True)
+
+    def _set_active(self, active):
+        return self.update(is_active=active, updated_at=timezone.now())
+
+    def inactive(self):
+        return self.filter(is_active=False)
+
+
+class ActiveManager(models.Manager):
+    """
+    Default manager that hides soft-deleted rows. Reverse relations
+    (``user.checkins``) and prefetches go through it too.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(ACTIVE)
+
+
+def active_index(*fields, name):
+    """An index over active rows only, matching ``ActiveManager`` queries."""
+    return models.Index(fields=list(fields), name=name, condition=ACTIVE)
+
 
 class BaseModel(models.Model):
     """
     Base model class that all other models should inherit from.
     Provides common fields and functionality.
+
+    Primary keys are time-ordered (UUIDv7), see ``core.ids``.
+
+    ``objects`` only sees active rows; ``all_objects`` sees soft-deleted
+    ones too, and is what restores and uniqueness lookups should use.
+    Related objects reached through a foreign key are always loaded.
     """
-    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
+    objects = ActiveManager.from_queryset(BaseQuerySet)()
+    all_objects = BaseQuerySet.as_manager()
+
     class Meta:
         abstract = True
         ordering = ['-created_at']
@@ -20,15 +67,27 @@ class BaseModel(models.Model):
         """
         Instead of actually deleting the object, just update is_active to False.
         """
-        self.is_active = False
-        self.save()
+        self._set_active(False)
 
     def restore(self):
         """
         Restore a soft-deleted object.
         """
-        self.is_active = True
-        self.save()
+        self._set_active(True)
+
+    def _set_active(self, active):
+        self.is_active = active
+        self.updated_at = timezone.now()
+        type(self).all_objects.filter(pk=self.pk).update(
+            is_active=active, updated_at=self.updated_at
+        )
+
+    @property
+    def id_created_at(self):
+        """
+        Creation time encoded in the primary key, or None for legacy uuid4 keys.
+        """
+        return uuid7_time(self.id)
 
     @property
     def is_deleted(self):
@@ -0,0 +1,157 @@
+import base64
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over a composite ordering, by default
+    ``(created_at, id)`` from ``BaseModel``.
+
+    Each page is a single indexed range query: ``WHERE (created_at, id) <
+    (last seen)`` plus ``LIMIT page_size + 1``. There is no COUNT query and no
+    OFFSET, so deep pages cost the same as the first one and rows inserted
+    while a client scrolls never shift or repeat items. Clients pass back the
+    opaque ``cursor`` from ``next``, or ``after_id`` with the id of the last
+    item they have.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = api_settings.PAGE_SIZE
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    after_id_query_param = 'after_id'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        fields = [name.lstrip('-') for name in self.ordering]
+
+        position = self.decode_position(request, queryset, fields)
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after_position(fields, position))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_position = (
+            [getattr(rows[-1], field) for field in fields] if self.has_next else None
+        )
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            requested = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(requested, self.max_page_size))
+
+    def after_position(self, fields, position):
+        """
+        Build the row-value comparison ``(f1, f2, ...) > / < position`` as
+        OR-ed prefix equalities, which every backend can satisfy from the
+        composite index.
+        """
+        condition = Q()
+        for i, name in enumerate(self.ordering):
+            field = fields[i]
+            lookup = f'{field}__lt' if name.startswith('-') else f'{field}__gt'
+            prefix = {fields[j]: position[j] for j in range(i)}
+            condition |= Q(**prefix, **{lookup: position[i]})
+        return condition
+
+    def decode_position(self, request, queryset, fields):
+        after_id = request.query_params.get(self.after_id_query_param)
+        if after_id:
+            try:
+                values = queryset.filter(pk=after_id).values_list(*fields).first()
+            except ValidationError:
+                values = None
+            if values is None:
+                raise NotFound(self.invalid_cursor_message)
+            return list(values)
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8')
+            parts = raw.split('|')
+            if len(parts) != len(fields):
+                raise ValueError(raw)
+            return [
+                queryset.model._meta.get_field(field).to_python(part)
+                for field, part in zip(fields, parts)
+            ]
+        except (TypeError, ValueError, UnicodeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position):
+        raw = '|'.join(str(value) for value in position)
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.after_id_query_param)
+        return replace_query_param(url, self.cursor_query_param,
+                                   self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class IdKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination on the primary key alone. With time-ordered (UUIDv7)
+    keys, id order is creation order, so each page is a range scan of the
+    primary-key index with no secondary index. Only use it on tables whose
+    rows all carry v7 ids; legacy uuid4 rows would sort randomly.
+    """
+    ordering = ('-id',)
+
+
+class RankedListPagination(KeysetPagination):
+    """
+    Pagination over a precomputed, ordered list of ids, such as a cached
+    per-user ranking. A page is a slice of the list after ``after_id`` (or
+    the opaque ``cursor``), so serving it needs no ranking query; the view
+    loads the page's rows by id.
+    """
+
+    def paginate_ids(self, ids, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        after = request.query_params.get(self.after_id_query_param)
+        encoded = request.query_params.get(self.cursor_query_param)
+        try:
+            if not after and encoded:
+                after = base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8')
+            start = ids.index(after) + 1 if after else 0
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        page = ids[start:start + self.page_size]
+        self.has_next = start + self.page_size < len(ids)
+        self.next_position = [page[-1]] if self.has_next else None
+        return page
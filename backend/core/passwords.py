@@ -0,0 +1,107 @@
+"""
+CPU-protective password handling for the login path.
+
+``TunedPBKDF2PasswordHasher`` takes its work factor from
+``PASSWORD_HASH_ITERATIONS``, so the cost can be tuned per deployment; a
+stored hash with another work factor (or algorithm) is rehashed on the next
+successful login. Verification runs on a small dedicated thread pool
+(``hashlib`` releases the GIL while hashing), so at most
+``PASSWORD_VERIFY_WORKERS`` hashes burn CPU at once and request workers or
+the event loop never do. When ``PASSWORD_VERIFY_QUEUE`` more are already
+waiting, new attempts are refused at once with ``PasswordVerifierBusy``.
+
+Logins for unknown users are checked against ``dummy_hash()``, so a miss
+costs the same hash as a wrong password and response times do not reveal
+which usernames exist.
+"""
+import asyncio
+import secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    PBKDF2PasswordHasher,
+    get_hasher,
+    identify_hasher,
+    make_password,
+)
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    """PBKDF2-SHA256 with the iteration count from settings."""
+
+    @property
+    def iterations(self):
+        return settings.PASSWORD_HASH_ITERATIONS
+
+
+_dummy = (None, None)
+
+
+def dummy_hash():
+    """A throwaway hash made under the current hashing policy."""
+    global _dummy
+    policy = (settings.PASSWORD_HASHERS[0], settings.PASSWORD_HASH_ITERATIONS)
+    if _dummy[0] != policy:
+        _dummy = (policy, make_password(secrets.token_urlsafe()))
+    return _dummy[1]
+
+
+class PasswordVerifierBusy(Exception):
+    """Too many password checks are already running or queued."""
+
+
+def verify(raw_password, encoded):
+    """
+    Check ``raw_password`` against ``encoded``. Returns ``(valid, new_hash)``
+    where ``new_hash`` is set when the hash no longer matches the policy.
+    """
+    if not raw_password or not encoded:
+        return False, None
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False, None  # Unusable or unknown hash
+    if not hasher.verify(raw_password, encoded):
+        return False, None
+    preferred = get_hasher('default')
+    if hasher.algorithm != preferred.algorithm or preferred.must_update(encoded):
+        return True, make_password(raw_password)
+    return True, None
+
+
+class PasswordVerifier:
+    """Bounded pool that runs ``verify`` off the request thread."""
+
+    def __init__(self, workers, queue):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password')
+        self._slots = threading.BoundedSemaphore(workers + queue)
+
+    def submit(self, raw_password, encoded):
+        if not self._slots.acquire(blocking=False):
+            raise PasswordVerifierBusy('Password verification is saturated')
+        return self._executor.submit(self._run, raw_password, encoded)
+
+    def _run(self, raw_password, encoded):
+        try:
+            return verify(raw_password, encoded)
+        finally:
+            self._slots.release()
+
+    def check(self, raw_password, encoded):
+        return self.submit(raw_password, encoded).result()
+
+    async def acheck(self, raw_password, encoded):
+        return await asyncio.wrap_future(self.submit(raw_password, encoded))
+
+
+_verifier = None
+
+
+def get_verifier():
+    """Return the process-wide verifier configured from settings."""
+    global _verifier
+    if _verifier is None:
+        _verifier = PasswordVerifier(settings.PASSWORD_VERIFY_WORKERS,
+                                     settings.PASSWORD_VERIFY_QUEUE)
+    return _verifier
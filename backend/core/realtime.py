@@ -0,0 +1,91 @@
+"""
+Per-user real-time updates pushed over WebSocket.
+
+Every authenticated socket on ``/ws/updates/`` joins the channel-layer group
+``user.<id>`` (``core.consumers.UserUpdatesConsumer``). Domain code calls
+``publish`` after it writes: the event goes out once the surrounding
+transaction commits, so clients never see changes that are rolled back.
+
+Open sockets are counted per user in the cache. Users without one, which is
+most requests, cost a single cache read: nothing is built or sent. Event
+data may be a callable so that any query it needs only runs for online
+users. A failing channel layer is logged and never fails the write.
+"""
+import json
+import logging
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import caches
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+GROUP_PREFIX = 'user.'
+PRESENCE_PREFIX = 'realtime:online:'
+
+
+def _cache():
+    return caches[settings.REALTIME_CACHE_ALIAS]
+
+
+def group_name(user_id):
+    return f'{GROUP_PREFIX}{user_id}'
+
+
+def _presence_key(user_id):
+    return f'{PRESENCE_PREFIX}{user_id}'
+
+
+async def aconnected(user_id):
+    """Count one more open socket for the user."""
+    key = _presence_key(user_id)
+    await _cache().aadd(key, 0, settings.REALTIME_PRESENCE_TTL)
+    await _cache().aincr(key)
+
+
+async def adisconnected(user_id):
+    try:
+        await _cache().adecr(_presence_key(user_id))
+    except ValueError:
+        pass  # Expired while the socket was open
+
+
+async def atouch(user_id):
+    """Keep a long-lived socket's presence from expiring."""
+    await _cache().atouch(_presence_key(user_id), settings.REALTIME_PRESENCE_TTL)
+
+
+def online(user_ids):
+    """The subset of ``user_ids`` with at least one open socket."""
+    keys = {_presence_key(user_id): user_id for user_id in user_ids}
+    counts = _cache().get_many(list(keys))
+    return [keys[key] for key, count in counts.items() if count and count > 0]
+
+
+def publish(user_ids, event, data):
+    """
+    Send ``event`` to the open sockets of each of ``user_ids`` after commit.
+    ``data`` is JSON-serializable, or a callable taking a user id and
+    returning it.
+    """
+    if get_channel_layer() is None:
+        return
+    user_ids = list(user_ids)
+    transaction.on_commit(lambda: _send(user_ids, event, data))
+
+
+def _send(user_ids, event, data):
+    layer = get_channel_layer()
+    for user_id in online(user_ids):
+        payload = data(user_id) if callable(data) else data
+        message = {
+            'type': 'user.event',
+            'event': event,
+            'data': json.loads(json.dumps(payload, cls=DjangoJSONEncoder)),
+        }
+        try:
+            async_to_sync(layer.group_send)(group_name(user_id), message)
+        except Exception:
+            logger.warning('Could not publish %s to user %s', event, user_id, exc_info=True)
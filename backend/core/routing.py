@@ -0,0 +1,6 @@
+from django.urls import path
+from .consumers import UserUpdatesConsumer
+
+websocket_urlpatterns = [
+    path('ws/updates/', UserUpdatesConsumer.as_asgi()),
+]
@@ -0,0 +1,92 @@
+"""
+Precompiled fast path for read-only serializers on hot endpoints.
+
+``compile_serializer(SerializerClass)`` binds the serializer's fields once
+and returns a plain function from instance to dict. The function produces
+the same output as ``SerializerClass(instance).data`` but skips the
+per-request field construction and the generic ``to_representation`` loop:
+plain model fields are read and converted directly, and anything without a
+known fast conversion falls back to the bound field's own
+``to_representation``, so the output cannot drift from the DRF path.
+"""
+import operator
+from rest_framework import fields, relations, serializers
+from rest_framework.settings import api_settings
+
+_IDENTITY = (fields.IntegerField, fields.BooleanField, fields.JSONField)
+_STR = (fields.CharField, fields.EmailField, fields.URLField)
+
+
+def _isodate(value):
+    return value.isoformat()
+
+
+def _converter(field):
+    """Return a direct conversion for ``field``, None for identity, or its own method."""
+    kind = type(field)
+    if kind in _IDENTITY and not getattr(field, 'binary', False):
+        return None
+    if kind in _STR or (kind is fields.UUIDField and field.uuid_format == 'hex_verbose'):
+        return str
+    if (kind is fields.DateField
+            and getattr(field, 'format', api_settings.DATE_FORMAT) == fields.ISO_8601):
+        return _isodate
+    return field.to_representation
+
+
+def _reader(serializer, field):
+    """Plain attribute access for model fields, DRF's lookup for anything else."""
+    model = getattr(getattr(serializer, 'Meta', None), 'model', None)
+    names = {model_field.name for model_field in model._meta.concrete_fields} if model else ()
+    if len(field.source_attrs) == 1 and field.source in names:
+        return operator.attrgetter(field.source)
+    return field.get_attribute
+
+
+def _compile_field(serializer, field):
+    """Return ``(name, read, convert)`` for one bound field."""
+    if isinstance(field, serializers.SerializerMethodField):
+        return field.field_name, (lambda instance: instance), getattr(serializer, field.method_name)
+    if isinstance(field, serializers.ListSerializer):
+        child = compile_serializer(type(field.child))
+        return field.field_name, field.get_attribute, (
+            lambda value: [child(item) for item in (value.all() if hasattr(value, 'all') else value)]
+        )
+    if isinstance(field, serializers.BaseSerializer):
+        return field.field_name, field.get_attribute, compile_serializer(type(field))
+    if (isinstance(field, relations.PrimaryKeyRelatedField) and field.pk_field is None
+            and len(field.source_attrs) == 1):
+        model_field = serializer.Meta.model._meta.get_field(field.source)
+        return field.field_name, operator.attrgetter(model_field.attname), None
+    return field.field_name, _reader(serializer, field), _converter(field)
+
+
+def compile_serializer(serializer_class):
+    """
+    Compile ``serializer_class`` into ``function(instance) -> dict``.
+
+    Compiled functions are cached per class; they take no context, so only
+    use them for serializers whose output does not depend on the request.
+    """
+    compiled = _compiled.get(serializer_class)
+    if compiled is not None:
+        return compiled
+
+    serializer = serializer_class()
+    plan = [_compile_field(serializer, field) for field in serializer._readable_fields]
+
+    def serialize(instance):
+        data = {}
+        for name, read, convert in plan:
+            value = read(instance)
+            if value is None or convert is None:
+                data[name] = value
+            else:
+                data[name] = convert(value)
+        return data
+
+    _compiled[serializer_class] = serialize
+    return serialize
+
+
+_compiled = {}
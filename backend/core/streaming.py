@@ -0,0 +1,44 @@
+import json
+from functools import wraps
+from django.http import JsonResponse, StreamingHttpResponse
+
+
+def sse_event(event, data):
+    """Encode one server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def sse_response(events):
+    """
+    Wrap an (async) iterator of encoded events in a streaming response. Under
+    ASGI each event is flushed as soon as it is produced.
+    """
+    response = StreamingHttpResponse(events, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Keep proxies from buffering the stream
+    return response
+
+
+def read_json(request):
+    """The request body as JSON (an empty body is ``{}``), or None if malformed."""
+    try:
+        return json.loads(request.body or b'{}')
+    except ValueError:
+        return None
+
+
+def async_login_required(view):
+    """
+    Authenticate a plain async Django view from the session, answering 401
+    with the same body DRF uses.
+    """
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await request.auser()
+        if not user.is_authenticated:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."}, status=401
+            )
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
@@ -0,0 +1,210 @@
+"""
+Sliding-window rate limiting with O(1) state per key.
+
+Each (scope, client) pair keeps two integer counters in the cache, one for
+the current fixed window and one for the previous, and estimates the
+sliding-window count as ``previous * (1 - elapsed) + current``. That is two
+small keys per client instead of DRF's list of timestamps. A check first
+takes a slot with an ``incr`` of the current window, which is atomic on
+Redis and locked on locmem, and decides on the count that returns; a
+throttled request gives its slot back with a ``decr``. Concurrent requests
+therefore cannot both take the last slot. Rates are DRF rate strings in
+``REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']``, keyed by scope.
+
+DRF views opt in with ``throttle_scope`` (a scope, or a ``{method: scope}``
+dict) and plain Django views with the ``throttle`` decorator. Throttled
+requests get ``429`` with ``Retry-After`` and are counted in
+``throttle_metrics()`` and in ``/metrics``.
+"""
+import math
+import time
+from functools import wraps
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.http import JsonResponse
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+from core.metrics import registry
+
+KEY_PREFIX = 'throttle:'
+METRIC_PREFIX = 'throttle:hits:'
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+_local_stats = {}
+
+
+def _cache():
+    return caches[settings.THROTTLE_CACHE_ALIAS]
+
+
+def parse_rate(rate):
+    """``'10/min'`` -> ``(10, 60)``; None for an unset rate."""
+    if rate is None:
+        return None
+    count, period = rate.split('/')
+    return int(count), DURATIONS[period[0]]
+
+
+def _incr(cache, key, ttl):
+    """Increment ``key``, creating it with ``ttl``; return the new count."""
+    try:
+        return cache.incr(key)
+    except ValueError:
+        if cache.add(key, 1, ttl):
+            return 1
+        return cache.incr(key)
+
+
+async def _aincr(cache, key, ttl):
+    # Django's aincr is a get followed by a set; only the sync incr is atomic.
+    return await sync_to_async(_incr)(cache, key, ttl)
+
+
+class SlidingWindow:
+    """The limiter for one scope."""
+
+    def __init__(self, scope):
+        self.scope = scope
+        self.rate = parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(scope))
+
+    def _keys(self, ident, now):
+        duration = self.rate[1]
+        window = int(now // duration)
+        base = f'{KEY_PREFIX}{self.scope}:{ident}:'
+        return base + str(window), base + str(window - 1), (now % duration) / duration
+
+    def _wait(self, current, previous, elapsed):
+        """Seconds until one more request fits, or 0 if it fits now."""
+        limit, duration = self.rate
+        if previous * (1 - elapsed) + current < limit:
+            return 0.0
+        if current >= limit or not previous:
+            return (1 - elapsed) * duration
+        # The previous window's weight must fall until the estimate is below limit.
+        return max((1 - (limit - current) / previous - elapsed) * duration, 0.001)
+
+    def _record(self, wait):
+        stats = _local_stats.setdefault(self.scope, {'allowed': 0, 'throttled': 0})
+        stats['throttled' if wait else 'allowed'] += 1
+        registry.inc('phoenix_throttle_checks_total',
+                     {'scope': self.scope, 'result': 'throttled' if wait else 'allowed'})
+
+    def check(self, ident, now=None):
+        """Count one request for ``ident``; return 0, or the seconds to wait if throttled."""
+        if self.rate is None:
+            return 0.0
+        cache = _cache()
+        now = time.time() if now is None else now
+        current_key, previous_key, elapsed = self._keys(ident, now)
+        # Take the slot before deciding so that concurrent checks see each other.
+        current = _incr(cache, current_key, self.rate[1] * 2)
+        wait = self._wait(current - 1, cache.get(previous_key, 0), elapsed)
+        if wait:
+            cache.decr(current_key)
+            _incr(cache, METRIC_PREFIX + self.scope, None)
+        self._record(wait)
+        return wait
+
+    async def acheck(self, ident, now=None):
+        """Async variant of ``check``."""
+        if self.rate is None:
+            return 0.0
+        cache = _cache()
+        now = time.time() if now is None else now
+        current_key, previous_key, elapsed = self._keys(ident, now)
+        current = await _aincr(cache, current_key, self.rate[1] * 2)
+        wait = self._wait(current - 1, await cache.aget(previous_key, 0), elapsed)
+        if wait:
+            await sync_to_async(cache.decr)(current_key)
+            await _aincr(cache, METRIC_PREFIX + self.scope, None)
+        self._record(wait)
+        return wait
+
+
+class _SlidingWindowThrottle(BaseThrottle):
+    def get_scope(self, request, view):
+        raise NotImplementedError
+
+    def get_ident_key(self, request):
+        if request.user and request.user.is_authenticated:
+            return f'user:{request.user.pk}'
+        return f'ip:{self.get_ident(request)}'
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        self.delay = SlidingWindow(scope).check(self.get_ident_key(request)) if scope else 0.0
+        return not self.delay
+
+    def wait(self):
+        return math.ceil(self.delay)
+
+
+class UserSlidingWindowThrottle(_SlidingWindowThrottle):
+    """Global per-client budget: the ``user`` rate when signed in, ``anon`` otherwise."""
+
+    def get_scope(self, request, view):
+        return 'user' if request.user and request.user.is_authenticated else 'anon'
+
+
+class ScopedSlidingWindowThrottle(_SlidingWindowThrottle):
+    """Per-view budget named by the view's ``throttle_scope``."""
+
+    def get_scope(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if isinstance(scope, dict):
+            return scope.get(request.method)
+        return scope
+
+
+def throttle(scope, key='user'):
+    """
+    Throttle a plain (sync or async) Django view under ``scope``. With
+    ``key='user'`` the view must run after authentication (for example
+    under ``async_login_required``); ``key='ip'`` limits by client address.
+    """
+    def ident(request):
+        if key == 'ip':
+            return f'ip:{BaseThrottle().get_ident(request)}'
+        return f'user:{request.user.pk}'
+
+    def throttled(wait):
+        seconds = math.ceil(wait)
+        response = JsonResponse(
+            {"detail": f"Request was throttled. Expected available in {seconds} seconds."},
+            status=429,
+        )
+        response['Retry-After'] = str(seconds)
+        return response
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                wait = await SlidingWindow(scope).acheck(ident(request))
+                if wait:
+                    return throttled(wait)
+                return await view(request, *args, **kwargs)
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            wait = SlidingWindow(scope).check(ident(request))
+            if wait:
+                return throttled(wait)
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def throttle_metrics():
+    """
+    Throttle counters: ``local`` holds this process's allowed/throttled
+    checks per scope, ``throttled`` the throttled total across all workers.
+    """
+    scopes = list(api_settings.DEFAULT_THROTTLE_RATES)
+    totals = _cache().get_many([METRIC_PREFIX + scope for scope in scopes])
+    return {
+        'local': {scope: dict(stats) for scope, stats in _local_stats.items()},
+        'throttled': {scope: totals.get(METRIC_PREFIX + scope, 0) for scope in scopes},
+    }
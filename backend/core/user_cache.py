@@ -0,0 +1,68 @@
+"""
+Per-user cache of the authenticated ``User`` and its ``profile``.
+
+``core.authentication.CachedModelBackend`` resolves ``request.user`` from
+here, so together with the cached session engine an authenticated request
+costs no queries before the view runs. Entries are dropped whenever the
+user or profile is written: ``save()``, soft delete and restore on either
+model (instances and querysets), and explicitly after the queryset updates
+that touch profiles (streaks, quiz counters). The TTL
+only bounds how long a missed invalidation can live.
+
+Login usernames that matched no user are remembered too, so repeated
+attempts against them skip the user query; saving a user forgets its
+username.
+"""
+from django.conf import settings
+from django.core.cache import caches
+from core.metrics import record_cache
+
+KEY_PREFIX = 'auth:user:'
+UNKNOWN_PREFIX = 'auth:unknown:'
+
+
+def _cache():
+    return caches[settings.USER_CACHE_ALIAS]
+
+
+def user_key(user_id):
+    return f'{KEY_PREFIX}{user_id}'
+
+
+def get_cached_user(user_id):
+    """Return the cached user (with its profile loaded) or None."""
+    user = _cache().get(user_key(user_id))
+    record_cache('user', user is not None)
+    return user
+
+
+def cache_user(user):
+    _cache().set(user_key(user.pk), user, settings.USER_CACHE_TTL)
+
+
+def invalidate_user(user_id):
+    """Drop one user's cached entry."""
+    _cache().delete(user_key(user_id))
+
+
+def invalidate_users(user_ids):
+    """Drop several users' cached entries in one round trip."""
+    _cache().delete_many([user_key(user_id) for user_id in user_ids])
+
+
+def _unknown_key(identifier):
+    return UNKNOWN_PREFIX + identifier
+
+
+async def ais_unknown(identifier):
+    """True if ``identifier`` recently matched no user."""
+    return bool(await _cache().aget(_unknown_key(identifier)))
+
+
+async def aremember_unknown(identifier):
+    await _cache().aset(_unknown_key(identifier), True, settings.LOGIN_UNKNOWN_TTL)
+
+
+def forget_unknown(*identifiers):
+    """Allow logins for identifiers that now exist."""
+    _cache().delete_many([_unknown_key(identifier) for identifier in identifiers if identifier])
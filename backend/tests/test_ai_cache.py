@@ -0,0 +1,55 @@
+"""
+Tests for the AI completion cache.
+"""
+from dataclasses import replace
+from unittest import mock
+from django.test import TestCase
+from core.ai.cache import cache_key, get_cache
+from core.ai.client import AIClient, Completion
+from core.ai.prompts import QUIZ
+
+
+class AICacheTestCase(TestCase):
+    """Identical generations are served from the cache."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.client = AIClient(api_key='test-key', default_model='test-model')
+        patcher = mock.patch.object(
+            AIClient, '_request',
+            side_effect=lambda model, messages, params: Completion(
+                text='{"questions": []}', model=model, prompt_tokens=40, completion_tokens=60
+            ),
+        )
+        self.request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def quiz(self, **inputs):
+        return {'domain': 'Real Madrid', 'difficulty': 'easy', 'count': 3, **inputs}
+
+    def test_repeat_request_is_served_from_cache(self):
+        first = self.client.complete(QUIZ, self.quiz(), temperature=0.7)
+        second = self.client.complete(QUIZ, self.quiz(), temperature=0.7)
+        self.assertFalse(first.cached)
+        self.assertTrue(second.cached)
+        self.assertEqual(second.text, first.text)
+        self.assertEqual(self.request.call_count, 1)
+
+    def test_key_ignores_formatting_differences(self):
+        self.client.complete(QUIZ, self.quiz())
+        self.client.complete(QUIZ, self.quiz(domain='  Real   Madrid '))
+        self.assertEqual(self.request.call_count, 1)
+
+    def test_key_covers_model_params_and_template_version(self):
+        base = cache_key('m', QUIZ, {'temperature': 0.7}, self.quiz())
+        self.assertNotEqual(base, cache_key('other', QUIZ, {'temperature': 0.7}, self.quiz()))
+        self.assertNotEqual(base, cache_key('m', QUIZ, {'temperature': 0.2}, self.quiz()))
+        self.assertNotEqual(base, cache_key('m', replace(QUIZ, version=2), {'temperature': 0.7},
+                                            self.quiz()))
+        self.assertNotEqual(base, cache_key('m', QUIZ, {'temperature': 0.7},
+                                            self.quiz(domain='Sherlock Holmes')))
+
+    def test_cache_can_be_bypassed(self):
+        self.client.complete(QUIZ, self.quiz(), cache=False)
+        self.client.complete(QUIZ, self.quiz(), cache=False)
+        self.assertEqual(self.request.call_count, 2)
@@ -0,0 +1,118 @@
+"""
+Tests for AI request limiting and the pooled transport.
+"""
+import asyncio
+import threading
+import time
+from django.test import SimpleTestCase, override_settings
+from core.ai.client import AIClient
+from core.ai.exceptions import AIRateLimited
+from core.ai.limits import RequestLimiter, estimate_tokens
+from core.ai.prompts import TIP
+from core.ai.stub import start_in_thread
+
+
+class RequestLimiterTestCase(SimpleTestCase):
+    """The limiter caps concurrency and enforces per-minute budgets."""
+
+    def test_caps_concurrency(self):
+        limiter = RequestLimiter(max_concurrency=2, requests_per_minute=1000,
+                                 tokens_per_minute=10 ** 6, max_wait=5)
+        peak, current, lock = [0], [0], threading.Lock()
+
+        def work():
+            with limiter.slot(10):
+                with lock:
+                    current[0] += 1
+                    peak[0] = max(peak[0], current[0])
+                time.sleep(0.05)
+                with lock:
+                    current[0] -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(limiter.stats['admitted'], 6)
+
+    def test_rejects_when_request_budget_is_spent(self):
+        limiter = RequestLimiter(max_concurrency=10, requests_per_minute=2,
+                                 tokens_per_minute=10 ** 6, max_wait=0.1)
+        for _ in range(2):
+            with limiter.slot(10):
+                pass
+        with self.assertRaises(AIRateLimited):
+            with limiter.slot(10):
+                pass
+        self.assertEqual(limiter.stats['rejected'], 1)
+
+    def test_unused_tokens_are_returned(self):
+        limiter = RequestLimiter(max_concurrency=10, requests_per_minute=100,
+                                 tokens_per_minute=1000, max_wait=0.1)
+        with limiter.slot(900) as ticket:
+            ticket.used = 100
+        # 900 were reserved but only 100 used, so another large request fits.
+        with limiter.slot(800):
+            pass
+
+    def test_async_slot_rejects_without_blocking(self):
+        limiter = RequestLimiter(max_concurrency=10, requests_per_minute=100,
+                                 tokens_per_minute=100, max_wait=0.1)
+
+        async def run():
+            async with limiter.aslot(100):
+                pass
+            async with limiter.aslot(100):
+                pass
+
+        with self.assertRaises(AIRateLimited):
+            asyncio.run(run())
+
+    def test_estimate_includes_reply_budget(self):
+        messages = [{'role': 'user', 'content': 'x' * 400}]
+        self.assertEqual(estimate_tokens(messages, max_tokens=50), 104 + 50)
+
+
+@override_settings(AI_USAGE_TRACKING=False)
+class PooledTransportTestCase(SimpleTestCase):
+    """The client talks to any OpenAI-compatible server over pooled connections."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = start_in_thread(port=0, latency=0)
+        cls.base_url = 'http://%s:%s/v1' % cls.server.server_address
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        self.client = AIClient(api_key='stub', default_model='stub-model', base_url=self.base_url)
+
+    def test_sync_completion_reports_usage(self):
+        completion = self.client.complete(TIP, {'trigger': 'boredom'}, cache=False)
+        self.assertIn('breath', completion.text)
+        self.assertGreater(completion.completion_tokens, 0)
+
+    def test_async_completions_share_one_client(self):
+        async def run():
+            results = await asyncio.gather(*(
+                self.client.acomplete(TIP, {'trigger': f'stress {n}'}, cache=False)
+                for n in range(5)
+            ))
+            return results, len(self.client.transport._async)
+
+        results, clients = asyncio.run(run())
+        self.assertEqual(len(results), 5)
+        self.assertEqual(clients, 1)
+
+    def test_stream_yields_deltas(self):
+        async def run():
+            return [delta async for delta in self.client.astream(TIP, {'trigger': 'noise'})]
+
+        self.assertIn('breath', ''.join(asyncio.run(run())))
@@ -0,0 +1,191 @@
+"""
+Tests for single-flight coalescing of AI requests.
+"""
+import asyncio
+import threading
+import time
+from unittest import mock
+from django.test import SimpleTestCase, override_settings
+from core.ai.cache import cache_key, get_cache, set_cached
+from core.ai.client import AIClient, Completion
+from core.ai.prompts import TIP
+from core.ai.singleflight import LOCK_PREFIX, singleflight
+
+
+def slow_request(model, messages, params):
+    time.sleep(0.2)
+    return Completion(text='Take a walk.', model=model)
+
+
+@override_settings(AI_SINGLEFLIGHT_POLL_INTERVAL=0.01, AI_USAGE_TRACKING=False)
+class SingleFlightTestCase(SimpleTestCase):
+    """Concurrent identical requests share one upstream call."""
+
+    def setUp(self):
+        get_cache().clear()
+        singleflight.reset()
+        self.client = AIClient(api_key='test-key', default_model='test-model')
+        patcher = mock.patch.object(AIClient, '_request', side_effect=slow_request)
+        self.request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_concurrently(self, count, inputs):
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.client.complete(TIP, inputs)))
+            for _ in range(count)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_threads_share_one_call(self):
+        results = self.run_concurrently(8, {'trigger': 'boredom'})
+        self.assertEqual(self.request.call_count, 1)
+        self.assertEqual({result.text for result in results}, {'Take a walk.'})
+        self.assertEqual(singleflight.stats()['saved_calls'], 7)
+
+    def test_different_requests_are_not_coalesced(self):
+        self.run_concurrently(1, {'trigger': 'boredom'})
+        self.run_concurrently(1, {'trigger': 'stress'})
+        self.assertEqual(self.request.call_count, 2)
+
+    def test_waits_for_leader_in_another_process(self):
+        """A lock held elsewhere makes this worker wait for the shared result."""
+        inputs = {'trigger': 'late night'}
+        key = cache_key('test-model', TIP, {}, inputs)
+        get_cache().add(LOCK_PREFIX + key, 'other-worker', 30)
+
+        def other_worker_finishes():
+            time.sleep(0.1)
+            set_cached(key, {'text': 'From elsewhere.', 'model': 'test-model'})
+        threading.Thread(target=other_worker_finishes).start()
+
+        result = self.client.complete(TIP, inputs)
+        self.assertEqual(result.text, 'From elsewhere.')
+        self.request.assert_not_called()
+        self.assertEqual(singleflight.stats()['coalesced_remote'], 1)
+
+    @override_settings(AI_SINGLEFLIGHT_WAIT=0.05)
+    def test_follower_timeout_counts_its_call(self):
+        results = self.run_concurrently(2, {'trigger': 'cold'})
+        self.assertEqual(self.request.call_count, 2)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(singleflight.stats()['upstream_calls'], 2)
+        self.assertEqual(singleflight.stats()['wait_timeouts'], 1)
+
+    def test_lost_remote_leader_is_replaced(self):
+        """A leader elsewhere that drops its lock hands over to this worker."""
+        inputs = {'trigger': 'crash'}
+        key = cache_key('test-model', TIP, {}, inputs)
+        get_cache().add(LOCK_PREFIX + key, 'other-worker', 30)
+
+        def other_worker_dies():
+            time.sleep(0.1)
+            get_cache().delete(LOCK_PREFIX + key)
+        threading.Thread(target=other_worker_dies).start()
+
+        self.assertEqual(self.client.complete(TIP, inputs).text, 'Take a walk.')
+        stats = singleflight.stats()
+        self.assertEqual(stats['leaders_lost'], 1)
+        self.assertEqual(stats['upstream_calls'], 1)
+        self.assertNotIn('wait_timeouts', stats)
+
+    def test_leader_errors_reach_followers(self):
+        def failing_request(model, messages, params):
+            time.sleep(0.1)
+            raise RuntimeError('upstream down')
+        self.request.side_effect = failing_request
+        errors = []
+
+        def call():
+            try:
+                self.client.complete(TIP, {'trigger': 'anger'})
+            except RuntimeError as exc:
+                errors.append(exc)
+        threads = [threading.Thread(target=call) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 4)
+        self.assertEqual(self.request.call_count, 1)
+
+
+async def slow_arequest(model, messages, params):
+    await asyncio.sleep(0.2)
+    return Completion(text='Take a walk.', model=model)
+
+
+async def slow_stream(model, messages, params):
+    for word in ('Take ', 'a ', 'walk.'):
+        await asyncio.sleep(0.05)
+        yield word
+
+
+@override_settings(AI_SINGLEFLIGHT_POLL_INTERVAL=0.01, AI_USAGE_TRACKING=False)
+class AsyncSingleFlightTestCase(SimpleTestCase):
+    """Concurrent identical async requests and streams share one upstream call."""
+
+    def setUp(self):
+        get_cache().clear()
+        singleflight.reset()
+        self.client = AIClient(api_key='test-key', default_model='test-model')
+        patcher = mock.patch.object(AIClient, '_arequest', side_effect=slow_arequest)
+        self.request = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def stream(self, inputs):
+        return ''.join([delta async for delta in self.client.astream(TIP, inputs, cache=True)])
+
+    async def test_coroutines_share_one_call(self):
+        results = await asyncio.gather(*(self.client.acomplete(TIP, {'trigger': 'boredom'})
+                                         for _ in range(8)))
+        self.assertEqual(self.request.call_count, 1)
+        self.assertEqual({result.text for result in results}, {'Take a walk.'})
+        self.assertEqual(singleflight.stats()['upstream_calls'], 1)
+        self.assertEqual(singleflight.stats()['saved_calls'], 7)
+
+    async def test_streams_share_one_call(self):
+        with mock.patch.object(AIClient, '_stream_request', side_effect=slow_stream) as stream:
+            texts = await asyncio.gather(*(self.stream({'trigger': 'stress'}) for _ in range(4)))
+        self.assertEqual(stream.call_count, 1)
+        self.assertEqual(set(texts), {'Take a walk.'})
+        self.assertEqual(singleflight.stats()['coalesced_local'], 3)
+
+    async def test_waits_for_leader_in_another_process(self):
+        inputs = {'trigger': 'late night'}
+        key = cache_key('test-model', TIP, {}, inputs)
+        get_cache().add(LOCK_PREFIX + key, 'other-worker', 30)
+
+        async def other_worker_finishes():
+            await asyncio.sleep(0.1)
+            set_cached(key, {'text': 'From elsewhere.', 'model': 'test-model'})
+
+        result, _ = await asyncio.gather(self.client.acomplete(TIP, inputs), other_worker_finishes())
+        self.assertEqual(result.text, 'From elsewhere.')
+        self.request.assert_not_called()
+        self.assertEqual(singleflight.stats()['coalesced_remote'], 1)
+
+    async def test_leader_errors_reach_followers(self):
+        async def failing_arequest(model, messages, params):
+            await asyncio.sleep(0.1)
+            raise RuntimeError('upstream down')
+        self.request.side_effect = failing_arequest
+        results = await asyncio.gather(*(self.client.acomplete(TIP, {'trigger': 'anger'})
+                                         for _ in range(4)), return_exceptions=True)
+        self.assertTrue(all(isinstance(result, RuntimeError) for result in results))
+        self.assertEqual(self.request.call_count, 1)
+
+    async def test_abandoned_stream_hands_over(self):
+        """A follower of a stream that was dropped part way generates itself."""
+        with mock.patch.object(AIClient, '_stream_request', side_effect=slow_stream) as stream:
+            leader = self.client.astream(TIP, {'trigger': 'tired'}, cache=True)
+            await leader.__anext__()
+            follower = asyncio.ensure_future(self.stream({'trigger': 'tired'}))
+            await asyncio.sleep(0.01)
+            await leader.aclose()
+            self.assertEqual(await follower, 'Take a walk.')
+        self.assertEqual(stream.call_count, 2)
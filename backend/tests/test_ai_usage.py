@@ -0,0 +1,101 @@
+"""
+Tests for AI usage accounting, per-user budgets and prompt compaction.
+"""
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from core.ai.cache import get_cache
+from core.ai.client import AIClient, Completion
+from core.ai.compaction import compact, compact_lines, truncate
+from core.ai.exceptions import AIBudgetExceeded
+from core.ai.models import AIUsage
+from core.ai.prompts import SIMULATION_STEP, TIP
+
+User = get_user_model()
+
+
+class AIUsageTestCase(TestCase):
+    """Every call is recorded and can be aggregated per feature and user."""
+
+    def setUp(self):
+        get_cache().clear()
+        self.user = User.objects.create_user(
+            username='usage', email='usage@example.com', password='pass-1234-word'
+        )
+        self.client = AIClient(api_key='test-key', default_model='test-model')
+        patcher = mock.patch.object(
+            AIClient, '_request',
+            side_effect=lambda model, messages, params: Completion(
+                text='Go outside.', model=model, prompt_tokens=30, completion_tokens=10
+            ),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_records_misses_and_hits(self):
+        self.client.complete(TIP, {'trigger': 'boredom'}, user=self.user, feature='tips')
+        self.client.complete(TIP, {'trigger': 'boredom'}, user=self.user, feature='tips')
+        miss, hit = AIUsage.objects.order_by('created_at')
+        self.assertEqual((miss.feature, miss.template, miss.cached), ('tips', 'tip', False))
+        self.assertEqual((miss.prompt_tokens, miss.completion_tokens), (30, 10))
+        self.assertTrue(hit.cached)
+        self.assertEqual(hit.user, self.user)
+
+    def test_aggregates_by_feature(self):
+        self.client.complete(TIP, {'trigger': 'boredom'}, user=self.user)
+        self.client.complete(TIP, {'trigger': 'boredom'}, user=self.user)
+        self.client.complete(TIP, {'trigger': 'stress'}, cache=False)
+        row, = AIUsage.objects.by_feature()
+        self.assertEqual(row['feature'], 'tip')
+        self.assertEqual((row['calls'], row['cache_hits'], row['users']), (3, 1, 1))
+        # Cache hits cost nothing.
+        self.assertEqual(row['prompt_tokens'] + row['completion_tokens'], 80)
+        self.assertEqual(AIUsage.objects.filter(user=self.user).billed_tokens(), 40)
+
+    @override_settings(AI_USER_DAILY_TOKEN_BUDGET=50)
+    def test_refuses_users_over_budget(self):
+        self.client.complete(TIP, {'trigger': 'boredom'}, user=self.user)
+        self.client.complete(TIP, {'trigger': 'stress'}, user=self.user)
+        with self.assertRaises(AIBudgetExceeded):
+            self.client.complete(TIP, {'trigger': 'noise'}, user=self.user)
+        # Cached answers are still served.
+        self.assertTrue(self.client.complete(TIP, {'trigger': 'boredom'}, user=self.user).cached)
+
+    @override_settings(AI_USAGE_TRACKING=False)
+    def test_tracking_can_be_disabled(self):
+        self.client.complete(TIP, {'trigger': 'boredom'})
+        self.assertFalse(AIUsage.objects.exists())
+
+
+class CompactionTestCase(SimpleTestCase):
+    """Long inputs are trimmed to their token budget."""
+
+    def test_short_values_are_untouched(self):
+        self.assertEqual(compact('a short line', 10), 'a short line')
+        self.assertEqual(compact_lines('one\ntwo', 10), 'one\ntwo')
+
+    def test_truncates_at_word_boundary(self):
+        text = truncate('word ' * 100, 10)
+        self.assertLessEqual(len(text), 40)
+        self.assertTrue(text.endswith('word …'))
+
+    def test_keeps_first_and_most_recent_lines(self):
+        history = '\n'.join(f'Scene {n}: ' + 'x' * 60 for n in range(50))
+        compacted = compact_lines(history, 200)
+        lines = compacted.splitlines()
+        self.assertLessEqual(len(compacted), 200 * 4)
+        self.assertTrue(lines[0].startswith('Scene 0'))
+        self.assertIn('earlier lines omitted', lines[1])
+        self.assertTrue(lines[-1].startswith('Scene 49'))
+
+    def test_lists_keep_leading_items(self):
+        self.assertEqual(compact(['newest', 'older', 'oldest'], 4), ['newest', 'older'])
+
+    @override_settings(AI_INPUT_BUDGETS={'history': 50})
+    def test_render_applies_configured_budgets(self):
+        history = '\n'.join('y' * 100 for _ in range(20))
+        messages = SIMULATION_STEP.render({
+            'scenario': 'Late night', 'triggers': 'boredom',
+            'history': history, 'instruction': 'Continue.',
+        })
+        self.assertLess(len(messages[1]['content']), 50 * 4 + 100)
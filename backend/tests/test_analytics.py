@@ -0,0 +1,127 @@
+"""
+Tests for the vectorised craving-trend analytics.
+"""
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from unittest import mock
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.checkins.models import CheckIn
+from apps.dashboard import analytics
+
+User = get_user_model()
+
+TODAY = date(2025, 5, 20)
+
+
+class AnalyticsFunctionsTestCase(SimpleTestCase):
+    """The array helpers match their straightforward definitions."""
+
+    def test_rolling_sum(self):
+        values = np.arange(1.0, 11.0)
+        expected = [sum(values[max(0, i - 2):i + 1]) for i in range(len(values))]
+        np.testing.assert_allclose(analytics.rolling_sum(values, 3), expected)
+
+    def test_decayed_sum_across_blocks(self):
+        values = np.random.default_rng(1).uniform(0, 10, 50)
+        expected = [sum(0.5 ** (t - k) * values[k] for k in range(t + 1)) for t in range(50)]
+        with mock.patch.object(analytics, 'MAX_DECAY_RANGE', 2 ** 8):  # 8-element blocks
+            np.testing.assert_allclose(analytics.decayed_sum(values, 0.5), expected)
+
+    def test_lttb_keeps_ends_and_spikes(self):
+        x = np.arange(1000.0)
+        y = np.zeros(1000)
+        y[537] = 10
+        picks = analytics.lttb(x, y, 50)
+        self.assertEqual(len(picks), 50)
+        self.assertEqual((picks[0], picks[-1]), (0, 999))
+        self.assertIn(537, picks)
+        self.assertTrue((np.diff(picks) > 0).all())
+        self.assertEqual(len(analytics.lttb(x[:20], y[:20], 50)), 20)
+
+    def test_trigger_breakdown_normalises_labels(self):
+        triggers = np.array(['Work ', 'work', '', 'phone', 'WORK'], dtype=object)
+        urge = np.array([6.0, 8.0, 1.0, 2.0, 7.0])
+        self.assertEqual(analytics.trigger_breakdown(triggers, urge), [
+            {'trigger': 'work', 'count': 3, 'share': 0.75, 'avg_urge': 7.0},
+            {'trigger': 'phone', 'count': 1, 'share': 0.25, 'avg_urge': 2.0},
+        ])
+
+    def test_correlation_undefined_for_constant_series(self):
+        self.assertIsNone(analytics.correlation(np.ones(5), np.arange(5.0)))
+        self.assertEqual(analytics.correlation(np.arange(5.0), -np.arange(5.0)), -1.0)
+
+
+class CravingTrendViewTestCase(TestCase):
+    """GET /dashboard/craving-trend charts raw check-ins for a range."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = reverse('dashboard:craving-trend')
+        now = mock.patch('apps.dashboard.views.timezone.now',
+                         return_value=datetime(2025, 5, 20, 18, tzinfo=dt_timezone.utc))
+        now.start()
+        self.addCleanup(now.stop)
+
+    def add(self, day, mood, urge, trigger='', hour=12):
+        CheckIn.objects.create(
+            user=self.user, timestamp=datetime.combine(day, datetime.min.time(), dt_timezone.utc)
+            + timedelta(hours=hour), mood=mood, urge_level=urge, trigger_context=trigger,
+        )
+
+    def test_series_and_statistics(self):
+        self.add(TODAY - timedelta(days=2), 3, 8, 'Work')
+        self.add(TODAY - timedelta(days=2), 5, 6, 'work')
+        self.add(TODAY, 9, 2, 'phone')
+
+        with self.assertNumQueries(1):
+            data = self.client.get(self.url + '?range=7d').json()
+        self.assertEqual(data['range'], '7d')
+        self.assertEqual(data['total_days'], 3)
+        self.assertEqual([point['date'] for point in data['points']],
+                         ['2025-05-18', '2025-05-19', '2025-05-20'])
+        first, gap, last = data['points']
+        self.assertEqual((first['checkins'], first['urge'], first['urge_rolling']), (2, 7.0, 7.0))
+        self.assertEqual((gap['checkins'], gap['urge'], gap['urge_rolling']), (0, None, 7.0))
+        self.assertEqual(last['urge_rolling'], round(16 / 3, 2))
+        self.assertLess(last['urge_ewma'], last['urge_rolling'])  # Recent days weigh more
+        self.assertEqual(data['triggers'][0], {'trigger': 'work', 'count': 2, 'share': 0.667,
+                                               'avg_urge': 7.0})
+        self.assertEqual(data['correlation']['mood_urge'], -1.0)
+
+    def test_days_follow_user_timezone(self):
+        self.user.timezone = 'Asia/Tokyo'
+        self.user.save()
+        self.add(TODAY - timedelta(days=1), 5, 5, hour=20)  # 05:00 on the 20th in Tokyo
+        points = self.client.get(self.url + '?range=7d').json()['points']
+        # It is already the 21st in Tokyo, a day without check-ins.
+        self.assertEqual([(point['date'], point['checkins']) for point in points],
+                         [('2025-05-20', 1), ('2025-05-21', 0)])
+
+    def test_long_ranges_are_downsampled(self):
+        first = TODAY - timedelta(days=999)
+        CheckIn.objects.bulk_create([
+            CheckIn(user=self.user, timestamp=datetime.combine(
+                first + timedelta(days=offset), datetime.min.time(), dt_timezone.utc
+            ) + timedelta(hours=12), mood=5, urge_level=1 + offset % 10)
+            for offset in range(1000)
+        ])
+        data = self.client.get(self.url + '?range=all').json()
+        self.assertEqual(data['total_days'], 1000)
+        self.assertEqual(len(data['points']), analytics.MAX_POINTS)
+        self.assertEqual(data['points'][0]['date'], first.isoformat())
+        self.assertEqual(data['points'][-1]['date'], TODAY.isoformat())
+
+    def test_empty_history(self):
+        data = self.client.get(self.url + '?range=all').json()
+        self.assertEqual(data['points'], [])
+        self.assertIsNone(data['correlation']['mood_urge'])
+
+    def test_rejects_unknown_range(self):
+        self.assertEqual(self.client.get(self.url + '?range=2w').status_code, 400)
@@ -0,0 +1,73 @@
+"""
+Tests for normalized badge and achievement awards.
+"""
+from unittest import mock
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.authentication.models import Badge, UserBadge, UserProfile
+
+User = get_user_model()
+
+
+class BadgeAwardTestCase(TestCase):
+    """Awards live in their own table and are granted in bulk."""
+
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(username=f'user{i}', email=f'user{i}@example.com',
+                                     password='pass-1234-word')
+            for i in range(30)
+        ]
+        for user in self.users:
+            UserProfile.objects.create(user=user)
+        self.badge = Badge.objects.create(code='first-week', name='First Week',
+                                          description='Seven days in a row')
+
+    def test_bulk_award_is_one_insert(self):
+        """Awarding a badge to a user queryset is a select plus one insert."""
+        with self.assertNumQueries(2):
+            self.badge.award_to(User.objects.all())
+        self.assertEqual(UserBadge.objects.filter(badge=self.badge).count(), 30)
+
+    def test_awarding_twice_keeps_one_row(self):
+        self.badge.award_to(self.users[:5])
+        self.badge.award_to(self.users)
+        self.assertEqual(UserBadge.objects.filter(badge=self.badge).count(), 30)
+
+    @mock.patch('apps.authentication.models.publish')
+    def test_only_new_holders_are_notified(self, publish):
+        self.assertEqual(self.badge.award_to(self.users[:5]), 5)
+        self.assertEqual(self.badge.award_to(self.users), 25)
+        self.assertEqual(publish.call_args.args[0], [user.pk for user in self.users[5:]])
+        self.assertEqual(self.badge.award_to(User.objects.all()), 0)
+        self.assertEqual(publish.call_count, 2)
+
+    def test_profile_helpers_write_award_rows(self):
+        profile = self.users[0].profile
+        profile.add_badge({'id': 'first-week', 'name': 'First Week', 'description': ''})
+        profile.add_achievement({'id': 'quiz-master', 'name': 'Quiz Master', 'description': 'x'})
+        kinds = set(UserBadge.objects.filter(user=self.users[0]).values_list('badge__kind', flat=True))
+        self.assertEqual(kinds, {Badge.BADGE, Badge.ACHIEVEMENT})
+
+    def test_profile_view_reads_awards_through_prefetch(self):
+        """Profile reads cost the same however many awards a user holds."""
+        user = self.users[0]
+        client = APIClient()
+        url = reverse('authentication:profile')
+
+        self.badge.award_to([user])
+        client.force_authenticate(User.objects.get(pk=user.pk))
+        with self.assertNumQueries(2):  # profile, awards with badges
+            response = client.get(url)
+        for i in range(10):
+            Badge.objects.create(code=f'badge-{i}', name=f'Badge {i}').award_to([user])
+        client.force_authenticate(User.objects.get(pk=user.pk))
+        with self.assertNumQueries(2):
+            response = client.get(url)
+
+        badges = response.data['profile']['badges']
+        self.assertEqual(len(badges), 11)
+        self.assertEqual(set(badges[0]), {'id', 'name', 'description', 'awarded_at'})
+        self.assertEqual(response.data['profile']['achievements'], [])
@@ -0,0 +1,31 @@
+"""
+Smoke test for the endpoint benchmark suite, and the query budgets it records.
+"""
+import json
+from django.test import TestCase
+from benchmarks.endpoints import BASELINE, CALIBRATION, compare, run
+from benchmarks.seed import seed
+
+
+class EndpointBenchmarkTestCase(TestCase):
+    """Every benchmarked endpoint answers and stays within its query budget."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = seed(users=2, days=21, pool_size=20, attempts_per_user=5)[0]
+
+    def test_endpoints_stay_within_query_baseline(self):
+        results = run(self.user, rounds=2)
+        baseline = json.loads(BASELINE.read_text())
+        self.assertEqual(set(results), set(baseline) - {CALIBRATION})
+        for name, summary in results.items():
+            with self.subTest(endpoint=name):
+                self.assertLessEqual(summary['queries'], baseline[name]['queries'])
+
+    def test_compare_flags_regressions(self):
+        baseline = {'GET x': {'p50_ms': 10.0, 'p95_ms': 12.0, 'queries': 2}}
+        self.assertEqual(compare({'GET x': {'p50_ms': 12.0, 'p95_ms': 14.0, 'queries': 2}},
+                                 baseline, 1.5), [])
+        failures = compare({'GET x': {'p50_ms': 20.0, 'p95_ms': 250.0, 'queries': 3}},
+                           baseline, 1.5)
+        self.assertEqual(len(failures), 3)
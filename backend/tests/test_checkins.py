@@ -0,0 +1,133 @@
+"""
+Tests for check-in ingestion.
+"""
+from unittest import mock
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.authentication.models import UserProfile
+from apps.checkins.models import CheckIn, CheckInQuerySet
+from apps.dashboard.models import DailyRollup
+
+User = get_user_model()
+
+
+def checkin_payload(key=None, **overrides):
+    payload = {
+        'timestamp': '2025-05-20T08:30:00Z',
+        'mood': 6,
+        'urge_level': 3,
+        'trigger_context': 'stress',
+        'note': '',
+    }
+    if key:
+        payload['idempotency_key'] = key
+    payload.update(overrides)
+    return payload
+
+
+class CheckInIngestionTestCase(TestCase):
+    """Bulk and single check-in ingestion with idempotency keys."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_batch_creates_all_checkins(self):
+        """A batch is written in one request."""
+        response = self.client.post(
+            reverse('checkins:checkin-batch'),
+            {'checkins': [checkin_payload(f'key-{i}') for i in range(5)]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 5)
+        self.assertEqual(CheckIn.objects.filter(user=self.user).count(), 5)
+
+    def test_batch_retry_is_deduplicated(self):
+        """Re-sending a batch reports duplicates and inserts nothing."""
+        batch = {'checkins': [checkin_payload('a'), checkin_payload('b'), checkin_payload('a')]}
+        first = self.client.post(reverse('checkins:checkin-batch'), batch, format='json')
+        self.assertEqual(first.data['created'], 2)
+        self.assertEqual(first.data['duplicates'], 1)
+
+        second = self.client.post(reverse('checkins:checkin-batch'), batch, format='json')
+        self.assertEqual(second.data['created'], 0)
+        self.assertEqual(second.data['duplicates'], 3)
+        self.assertEqual(
+            [r['id'] for r in first.data['results']],
+            [r['id'] for r in second.data['results']],
+        )
+        self.assertEqual(CheckIn.objects.count(), 2)
+
+    def test_batch_query_count_is_constant(self):
+        """Ingestion cost does not grow with the batch size."""
+        counts = []
+        for size, prefix in ((1, 'warm-up'), (5, 'small'), (50, 'large')):
+            batch = {'checkins': [checkin_payload(f'{prefix}-{i}') for i in range(size)]}
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post(reverse('checkins:checkin-batch'), batch, format='json')
+            counts.append(len(queries))
+        self.assertEqual(counts[1], counts[2])
+
+    def test_idempotency_keys_are_per_user(self):
+        """Another user's key does not suppress this user's check-in."""
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='pass-1234-word'
+        )
+        CheckIn.objects.ingest(other, [{
+            'timestamp': timezone.now(), 'mood': 5, 'urge_level': 2, 'idempotency_key': 'shared',
+        }])
+        response = self.client.post(
+            reverse('checkins:checkin-batch'),
+            {'checkins': [checkin_payload('shared')]},
+            format='json',
+        )
+        self.assertEqual(response.data['created'], 1)
+
+    def test_batch_rejects_out_of_range_values(self):
+        """Slider values outside 1-10 fail validation for the whole batch."""
+        response = self.client.post(
+            reverse('checkins:checkin-batch'),
+            {'checkins': [checkin_payload('ok'), checkin_payload('bad', mood=11)]},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(CheckIn.objects.count(), 0)
+
+    def test_single_checkin_uses_idempotency_header(self):
+        """The Idempotency-Key header dedupes single check-in retries."""
+        url = reverse('checkins:checkin-list')
+        first = self.client.post(url, checkin_payload(), format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        second = self.client.post(url, checkin_payload(), format='json', HTTP_IDEMPOTENCY_KEY='retry-1')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(first.data['id'], second.data['id'])
+        self.assertEqual(CheckIn.objects.count(), 1)
+
+    def test_concurrent_retry_is_reported_as_duplicate(self):
+        """A row inserted between the key lookup and the insert is not counted twice."""
+        url = reverse('checkins:checkin-list')
+        winner = CheckIn(user=self.user, timestamp=checkin_payload()['timestamp'], mood=5,
+                         urge_level=2, idempotency_key='race')
+        bulk_create = CheckInQuerySet.bulk_create
+
+        def racing_bulk_create(queryset, objs, **kwargs):
+            bulk_create(CheckIn.all_objects.all(), [winner])
+            return bulk_create(queryset, objs, **kwargs)
+
+        with mock.patch.object(CheckInQuerySet, 'bulk_create', racing_bulk_create):
+            response = self.client.post(url, checkin_payload(), format='json',
+                                        HTTP_IDEMPOTENCY_KEY='race')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['id'], str(winner.id))
+        self.assertEqual(CheckIn.objects.count(), 1)
+        self.assertFalse(DailyRollup.objects.filter(user=self.user).exists())
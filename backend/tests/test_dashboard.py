@@ -0,0 +1,96 @@
+"""
+Tests for dashboard rollups.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.authentication.models import UserProfile
+from apps.checkins.models import CheckIn
+from apps.dashboard.models import DailyRollup, WeeklyRollup
+from apps.dashboard.rollups import add_quiz, rebuild_rollups
+
+User = get_user_model()
+
+
+class DashboardRollupTestCase(TestCase):
+    """Rollups are maintained on write and read by GET /dashboard."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def ingest(self, *rows):
+        CheckIn.objects.ingest(self.user, [
+            {'timestamp': ts, 'mood': mood, 'urge_level': urge} for ts, mood, urge in rows
+        ])
+
+    def test_checkins_update_daily_and_weekly_rows(self):
+        """Each ingestion adds to the day's and the week's counters."""
+        monday = datetime(2025, 5, 5, 12, tzinfo=dt_timezone.utc)
+        self.ingest((monday, 4, 8), (monday, 6, 2))
+        self.ingest((monday + timedelta(days=1), 8, 1))
+
+        day = DailyRollup.objects.get(user=self.user, period_start=monday.date())
+        self.assertEqual((day.checkin_count, day.avg_mood, day.urge_peak), (2, 5.0, 8))
+        week = WeeklyRollup.objects.get(user=self.user)
+        self.assertEqual((week.period_start, week.checkin_count, week.mood_total), (monday.date(), 3, 18))
+
+    def test_rebuild_matches_incremental(self):
+        """Rebuilding from raw check-ins reproduces the incremental rows."""
+        now = timezone.now()
+        self.ingest(*[(now - timedelta(days=d), 1 + d % 10, 1 + (d * 3) % 10) for d in range(40)])
+        before = list(DailyRollup.objects.filter(user=self.user)
+                      .values_list('period_start', 'checkin_count', 'mood_total', 'urge_peak'))
+        weeks_before = WeeklyRollup.objects.filter(user=self.user).count()
+
+        rebuild_rollups(user_ids=[self.user.pk])
+        after = list(DailyRollup.objects.filter(user=self.user)
+                     .values_list('period_start', 'checkin_count', 'mood_total', 'urge_peak'))
+        self.assertEqual(before, after)
+        self.assertEqual(weeks_before, WeeklyRollup.objects.filter(user=self.user).count())
+
+    def test_dashboard_reads_rollups(self):
+        """The endpoint summarises the range without touching check-ins."""
+        now = timezone.now()
+        self.ingest((now, 7, 3), (now - timedelta(days=1), 5, 5))
+        add_quiz(self.user, now, questions=5, correct=4)
+
+        with self.assertNumQueries(4):  # trend rows, totals, profile, badges
+            response = self.client.get(reverse('dashboard:dashboard'), {'range': '7d'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['granularity'], 'day')
+        self.assertEqual(response.data['streak'], 2)
+        self.assertEqual(response.data['checkins'], 2)
+        self.assertEqual(response.data['quizzes']['correct'], 4)
+        self.assertEqual(len(response.data['craving_trend']), 2)
+
+    def test_completed_exercises_are_counted(self):
+        """Check-ins marked ``exercise_completed`` feed the exercise totals."""
+        now = timezone.now()
+        CheckIn.objects.ingest(self.user, [
+            {'timestamp': now, 'mood': 5, 'urge_level': 5, 'exercise_completed': done}
+            for done in (True, True, False)
+        ])
+        response = self.client.get(reverse('dashboard:dashboard'), {'range': '7d'})
+        self.assertEqual(response.data['exercises'], 2)
+        self.assertEqual(WeeklyRollup.objects.get(user=self.user).exercise_count, 2)
+
+        rebuild_rollups(user_ids=[self.user.pk])
+        self.assertEqual(DailyRollup.objects.get(user=self.user).exercise_count, 2)
+        self.assertEqual(WeeklyRollup.objects.get(user=self.user).exercise_count, 2)
+
+    def test_long_ranges_use_weekly_rows(self):
+        """Ranges beyond 90 days are charted per week."""
+        response = self.client.get(reverse('dashboard:dashboard'), {'range': '1y'})
+        self.assertEqual(response.data['granularity'], 'week')
+
+    def test_unknown_range_is_rejected(self):
+        response = self.client.get(reverse('dashboard:dashboard'), {'range': '2w'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,54 @@
+"""
+Tests for generated audio exercises.
+"""
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from apps.exercises.views import script_duration
+from core.ai.client import AIClient, Completion
+from core.ai.exceptions import AIUpstreamError
+from core.ai.models import AIUsage
+
+User = get_user_model()
+
+SCRIPT = 'Sit comfortably. [pause] Breathe in slowly. [pause] And let it go.'
+
+
+async def fake_arequest(self, model, messages, params):
+    return Completion(text=SCRIPT, model=model)
+
+
+class AudioExerciseTestCase(TestCase):
+    """POST /exercises/audio generates a TTS script asynchronously."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        self.client.force_login(self.user)
+        self.url = reverse('exercises:exercise-audio')
+
+    def test_script_duration_counts_pauses(self):
+        self.assertEqual(script_duration('one two [pause] three four'), 5)
+
+    @mock.patch.object(AIClient, '_arequest', fake_arequest)
+    def test_generates_script(self):
+        response = self.client.post(self.url + '?theme=grounding', content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['title'], 'Grounding')
+        self.assertEqual(data['payload']['script'], SCRIPT)
+        self.assertEqual(data['duration_sec'], script_duration(SCRIPT))
+        self.assertEqual(AIUsage.objects.get().feature, 'exercises')
+
+    @mock.patch.object(AIClient, '_arequest', side_effect=AIUpstreamError('down'))
+    def test_upstream_failure(self, _):
+        response = self.client.post(self.url, content_type='application/json')
+        self.assertEqual(response.status_code, 503)
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.post(self.url).status_code, 401)
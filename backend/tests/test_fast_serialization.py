@@ -0,0 +1,58 @@
+"""
+Tests for the precompiled profile serialization path.
+"""
+import datetime
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.authentication.models import Badge, UserProfile
+from apps.authentication.serializers import AWARDS_PREFETCH, UserSerializer, serialize_user
+from core.user_cache import invalidate_user
+
+User = get_user_model()
+
+
+class FastSerializationTestCase(TestCase):
+    """The fast path matches the DRF serializers and loads the user in one query."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word',
+            first_name='Ash', date_of_birth=datetime.date(1990, 5, 17),
+            notification_preferences={'daily': True},
+        )
+        UserProfile.objects.create(user=self.user, streak_count=4, last_checkin=timezone.now(),
+                                   goals=['sleep by 23:00'], preferences={'theme': 'dark'})
+        Badge.define({'id': 'first-week', 'name': 'First Week'}).award_to([self.user])
+        Badge.define({'id': 'ten-quizzes', 'name': 'Ten Quizzes'},
+                     kind=Badge.ACHIEVEMENT).award_to([self.user])
+
+    def load(self):
+        user = User.objects.select_related('profile').prefetch_related(AWARDS_PREFETCH)
+        return user.get(pk=self.user.pk)
+
+    def test_output_matches_drf_serializer(self):
+        user = self.load()
+        self.assertEqual(serialize_user(user), UserSerializer(user).data)
+
+    def test_output_matches_without_profile(self):
+        UserProfile.objects.filter(user=self.user).delete()
+        user = self.load()
+        self.assertIsNone(serialize_user(user)['profile'])
+        self.assertEqual(serialize_user(user), UserSerializer(user).data)
+
+    def test_profile_read_is_one_user_query(self):
+        client = APIClient()
+        client.post(reverse('authentication:login'),
+                    {'username': 'phoenix', 'password': 'pass-1234-word'})
+        invalidate_user(self.user.pk)
+        # The user and profile in one joined query, then the awards.
+        with self.assertNumQueries(2):
+            response = client.get(reverse('authentication:profile'))
+        self.assertEqual(response.data, UserSerializer(self.load()).data)
+        self.assertEqual(len(response.data['profile']['badges']), 1)
+        self.assertEqual(len(response.data['profile']['achievements']), 1)
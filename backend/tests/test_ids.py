@@ -0,0 +1,57 @@
+"""
+Tests for time-ordered UUID primary keys.
+"""
+import uuid
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from apps.authentication.models import UserProfile
+from apps.checkins.models import CheckIn
+from core.ids import uuid7, uuid7_range, uuid7_time
+
+User = get_user_model()
+
+
+class UUID7TestCase(TestCase):
+    """uuid7() keys are ordered and carry their creation time."""
+
+    def test_version_and_variant(self):
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_ids_are_strictly_increasing(self):
+        ids = [uuid7() for _ in range(10000)]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual(len(set(ids)), len(ids))
+
+    def test_time_round_trip(self):
+        before = datetime.now(dt_timezone.utc) - timedelta(milliseconds=1)
+        created = uuid7_time(uuid7())
+        self.assertLessEqual(before, created)
+        self.assertLess(created, before + timedelta(seconds=5))
+
+    def test_legacy_uuid4_has_no_time(self):
+        self.assertIsNone(uuid7_time(uuid.uuid4()))
+
+    def test_base_model_uses_uuid7(self):
+        user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        profile = UserProfile.objects.create(user=user)
+        self.assertEqual(profile.id.version, 7)
+        self.assertAlmostEqual(profile.id_created_at.timestamp(),
+                               profile.created_at.timestamp(), delta=1)
+
+    def test_range_lookup_selects_by_primary_key(self):
+        """uuid7_range() turns a creation-time window into a pk range."""
+        user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=user)
+        start = datetime.now(dt_timezone.utc) - timedelta(seconds=1)
+        checkin = CheckIn.objects.create(user=user, timestamp=start, mood=5, urge_level=1)
+        end = datetime.now(dt_timezone.utc) + timedelta(seconds=1)
+
+        self.assertEqual(list(CheckIn.objects.filter(**uuid7_range(start, end))), [checkin])
+        self.assertFalse(CheckIn.objects.filter(**uuid7_range(end=start)).exists())
@@ -0,0 +1,102 @@
+"""
+Tests for the CPU-protective login path.
+"""
+import threading
+from unittest import mock
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.authentication.models import UserProfile
+from core.passwords import PasswordVerifier, PasswordVerifierBusy, dummy_hash
+
+User = get_user_model()
+
+TUNED = ['core.passwords.TunedPBKDF2PasswordHasher',
+         'django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+class LoginTestCase(TestCase):
+    """Logins verify off-thread, upgrade stale hashes and treat unknown users alike."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=self.user)
+        self.client = APIClient()
+
+    def login(self, username, password='pass-1234-word'):
+        return self.client.post(reverse('authentication:login'),
+                                {'username': username, 'password': password}, format='json')
+
+    def test_login_by_username(self):
+        response = self.login('phoenix')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['user']['email'], 'phoenix@example.com')
+        self.assertEqual(self.login('phoenix@example.com').status_code, 401)
+
+    def test_wrong_password(self):
+        response = self.login('phoenix', 'not-the-password')
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {"error": "Invalid credentials"})
+
+    def test_unknown_user_is_rejected_from_cache(self):
+        self.assertEqual(self.login('ghost').status_code, 401)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.login('ghost').status_code, 401)
+
+    def test_unknown_user_costs_a_hash(self):
+        """Misses check a dummy hash, so they take as long as a wrong password."""
+        verifier = mock.Mock()
+        verifier.acheck = mock.AsyncMock(return_value=(False, None))
+        with mock.patch('apps.authentication.views.get_verifier', return_value=verifier):
+            for _ in range(2):  # Looked up, then rejected from cache
+                self.assertEqual(self.login('ghost', 'guess').status_code, 401)
+        self.assertEqual(verifier.acheck.await_args_list,
+                         [mock.call('guess', dummy_hash())] * 2)
+        self.assertTrue(dummy_hash().startswith('md5$'))
+
+    def test_new_user_is_not_rejected(self):
+        self.login('newcomer')
+        User.objects.create_user(username='newcomer', email='new@example.com',
+                                 password='pass-1234-word')
+        self.assertEqual(self.login('newcomer').status_code, 200)
+
+    def test_stale_hash_is_upgraded_on_login(self):
+        self.assertTrue(self.user.password.startswith('md5$'))
+        with override_settings(PASSWORD_HASHERS=TUNED, PASSWORD_HASH_ITERATIONS=1000):
+            self.assertEqual(self.login('phoenix').status_code, 200)
+            self.user.refresh_from_db()
+            self.assertTrue(self.user.password.startswith('pbkdf2_sha256$1000$'))
+            with self.settings(PASSWORD_HASH_ITERATIONS=2000):
+                self.assertEqual(self.login('phoenix').status_code, 200)
+                self.user.refresh_from_db()
+                self.assertTrue(self.user.password.startswith('pbkdf2_sha256$2000$'))
+                self.assertTrue(self.user.check_password('pass-1234-word'))
+
+    def test_saturated_verifier_answers_429(self):
+        verifier = mock.Mock()
+        verifier.acheck.side_effect = PasswordVerifierBusy()
+        with mock.patch('apps.authentication.views.get_verifier', return_value=verifier):
+            response = self.login('phoenix')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '1')
+
+
+class PasswordVerifierTestCase(SimpleTestCase):
+    """The verifier pool bounds how many hashes run or wait."""
+
+    def test_rejects_beyond_workers_and_queue(self):
+        release = threading.Event()
+        verifier = PasswordVerifier(workers=1, queue=1)
+        with mock.patch('core.passwords.verify', side_effect=lambda *args: release.wait()):
+            running = [verifier.submit('pw', 'hash'), verifier.submit('pw', 'hash')]
+            with self.assertRaises(PasswordVerifierBusy):
+                verifier.submit('pw', 'hash')
+            release.set()
+            for future in running:
+                future.result()
+        verifier.submit('pw', 'md5$salt$nope').result()
@@ -0,0 +1,102 @@
+"""
+Tests for request metrics, Server-Timing and the Prometheus endpoint.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from apps.authentication.models import UserProfile
+from core import metrics
+from core.metrics import WORKER_PREFIX, WORKERS_KEY, Registry, collect, registry, render
+
+User = get_user_model()
+
+
+class RegistryTestCase(SimpleTestCase):
+    """Histograms are cumulative and render in the Prometheus text format."""
+
+    def test_render(self):
+        local = Registry()
+        local.inc('phoenix_http_requests_total', {'view': 'a', 'method': 'GET', 'status': 200})
+        local.observe('phoenix_db_queries', {'view': 'a'}, 3, buckets=(1, 5))
+        local.observe('phoenix_db_queries', {'view': 'a'}, 7, buckets=(1, 5))
+        text = render({**local.snapshot(), 'workers': 1})
+        self.assertIn('# TYPE phoenix_db_queries histogram', text)
+        self.assertIn('phoenix_http_requests_total{method="GET",status="200",view="a"} 1', text)
+        self.assertIn('phoenix_db_queries_bucket{view="a",le="1"} 0', text)
+        self.assertIn('phoenix_db_queries_bucket{view="a",le="5"} 1', text)
+        self.assertIn('phoenix_db_queries_bucket{view="a",le="+Inf"} 2', text)
+        self.assertIn('phoenix_db_queries_sum{view="a"} 10.000000', text)
+
+    def test_label_values_are_escaped(self):
+        local = Registry()
+        local.inc('phoenix_cache_requests_total', {'cache': 'a"b'})
+        self.assertIn('{cache="a\\"b"}', render({**local.snapshot(), 'workers': 1}))
+
+
+class MetricsTestCase(TestCase):
+    """Requests are measured, reported in Server-Timing and merged across workers."""
+
+    def setUp(self):
+        cache.clear()
+        registry.reset()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.post(reverse('authentication:login'),
+                         {'username': 'phoenix', 'password': 'pass-1234-word'})
+
+    def test_server_timing_header(self):
+        self.client.get(reverse('authentication:profile'))
+        response = self.client.get(reverse('authentication:profile'))
+        timing = response['Server-Timing']
+        self.assertIn('db;dur=', timing)
+        self.assertIn('"1 queries"', timing)
+        self.assertIn('"1 hits, 0 misses"', timing)
+        self.assertIn('total;dur=', timing)
+
+    def test_requests_are_observed_per_view(self):
+        self.client.get(reverse('authentication:profile'))
+        labels = (('method', 'GET'), ('status', 200), ('view', 'authentication:profile'))
+        self.assertEqual(registry.snapshot()['counters'][('phoenix_http_requests_total', labels)], 1)
+
+    def test_endpoint_merges_worker_snapshots(self):
+        self.client.get(reverse('authentication:profile'))
+        other = Registry()
+        other.inc('phoenix_http_requests_total',
+                  {'view': 'authentication:profile', 'method': 'GET', 'status': 200}, 4)
+        cache.set(WORKER_PREFIX + 'other:1', other.snapshot())
+        cache.set(WORKERS_KEY, ['other:1'])
+        response = self.client.get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        text = response.content.decode()
+        self.assertIn('phoenix_http_requests_total{method="GET",status="200",'
+                      'view="authentication:profile"} 5', text)
+        self.assertIn('phoenix_metrics_workers 2', text)
+
+    def test_dead_workers_are_dropped(self):
+        cache.set(WORKERS_KEY, ['gone:1'])
+        self.assertEqual(collect()['workers'], 1)
+        self.assertEqual(cache.get(WORKERS_KEY), [metrics.worker_id()])
+
+    def test_endpoint_is_internal(self):
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='93.184.216.34').status_code, 403)
+        self.assertEqual(self.client.get('/metrics', REMOTE_ADDR='10.0.3.4').status_code, 200)
+        response = self.client.get('/metrics', REMOTE_ADDR='10.0.3.4',
+                                   HTTP_X_FORWARDED_FOR='93.184.216.34')
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+    def test_async_view_queries_are_counted(self):
+        self.client.logout()
+        response = self.client.post(reverse('authentication:login'),
+                                    {'username': 'phoenix', 'password': 'pass-1234-word'})
+        self.assertNotIn('"0 queries"', response['Server-Timing'])
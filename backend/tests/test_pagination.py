@@ -0,0 +1,72 @@
+"""
+Tests for keyset pagination.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.authentication.models import UserProfile
+from apps.checkins.models import CheckIn
+
+User = get_user_model()
+START = datetime(2025, 1, 1, 9, tzinfo=dt_timezone.utc)
+
+
+class KeysetPaginationTestCase(TestCase):
+    """Check-in history is paged by (timestamp, id) without counts or offsets."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        # Pairs of check-ins share a timestamp so the id tie-breaker matters.
+        CheckIn.objects.bulk_create([
+            CheckIn(user=self.user, timestamp=START + timedelta(hours=i // 2), mood=5, urge_level=2)
+            for i in range(25)
+        ])
+        self.url = reverse('checkins:checkin-list')
+
+    def scroll(self, **params):
+        ids, response = [], self.client.get(self.url, {'page_size': 10, **params})
+        while True:
+            ids += [item['id'] for item in response.data['results']]
+            if not response.data['next']:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_scroll_visits_every_row_once_in_order(self):
+        ids = self.scroll()
+        expected = [str(pk) for pk in CheckIn.objects.order_by('-timestamp', '-id')
+                    .values_list('id', flat=True)]
+        self.assertEqual(ids, expected)
+
+    def test_page_has_no_count_query(self):
+        """A deep page is a single range query."""
+        first = self.client.get(self.url, {'page_size': 10})
+        with self.assertNumQueries(1):
+            response = self.client.get(first.data['next'])
+        self.assertNotIn('count', response.data)
+
+    def test_new_rows_do_not_shift_pages(self):
+        """Rows inserted at the head while scrolling are not repeated."""
+        first = self.client.get(self.url, {'page_size': 10})
+        CheckIn.objects.create(user=self.user, timestamp=START + timedelta(days=30),
+                               mood=5, urge_level=2)
+        second = self.client.get(first.data['next'])
+        seen = {item['id'] for item in first.data['results']}
+        self.assertFalse(seen & {item['id'] for item in second.data['results']})
+
+    def test_after_id_continues_from_item(self):
+        first = self.client.get(self.url, {'page_size': 10})
+        last_id = first.data['results'][-1]['id']
+        response = self.client.get(self.url, {'page_size': 10, 'after_id': last_id})
+        self.assertEqual(response.data['results'],
+                         self.client.get(first.data['next']).data['results'])
+
+    def test_invalid_cursor_is_not_found(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
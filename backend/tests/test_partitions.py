@@ -0,0 +1,108 @@
+"""
+Tests for monthly check-in partitions.
+"""
+from datetime import date, datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import skipUnless
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from apps.checkins import partitions
+from apps.checkins.models import CheckIn
+from apps.checkins.tasks import ensure_checkin_partitions
+
+User = get_user_model()
+
+
+class PartitionNamingTestCase(SimpleTestCase):
+    """Month arithmetic and partition DDL."""
+
+    def test_add_months_rolls_over_years(self):
+        self.assertEqual(partitions.add_months(date(2025, 11, 1), 3), date(2026, 2, 1))
+        self.assertEqual(partitions.add_months(date(2025, 1, 1), -1), date(2024, 12, 1))
+
+    def test_names_round_trip(self):
+        name = partitions.partition_name(date(2025, 5, 1))
+        self.assertEqual(name, 'checkins_checkin_y2025m05')
+        self.assertEqual(partitions.partition_month(name), date(2025, 5, 1))
+        self.assertIsNone(partitions.partition_month(partitions.DEFAULT_PARTITION))
+
+    def test_partition_bounds(self):
+        sql = partitions.create_partition_sql(date(2025, 12, 1))
+        self.assertIn("FROM ('2025-12-01 00:00:00+00') TO ('2026-01-01 00:00:00+00')", sql)
+
+
+@skipUnless(connection.vendor != 'postgresql', 'plain-table behaviour')
+class PlainTableTestCase(TestCase):
+    """Without PostgreSQL the table stays plain and maintenance is a no-op."""
+
+    def test_no_op(self):
+        self.assertFalse(partitions.is_partitioned())
+        self.assertEqual(ensure_checkin_partitions(), [])
+        out = StringIO()
+        call_command('checkin_partitions', stdout=out)
+        self.assertIn('not partitioned', out.getvalue())
+
+
+@skipUnless(connection.vendor == 'postgresql', 'requires PostgreSQL')
+class PartitionedTableTestCase(TestCase):
+    """On PostgreSQL check-ins land in monthly partitions that queries prune."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+
+    def test_upcoming_months_exist(self):
+        partitions.ensure_partitions(months_ahead=2)
+        names = partitions.list_partitions()
+        self.assertEqual(names[-1], partitions.DEFAULT_PARTITION)
+        current = partitions.month_start(date.today())
+        self.assertIn(partitions.partition_name(partitions.add_months(current, 2)), names)
+
+    def test_range_query_prunes(self):
+        partitions.ensure_partitions()
+        month = partitions.month_start(date.today())
+        start, end = (datetime.combine(day, datetime.min.time(), tzinfo=dt_timezone.utc)
+                      for day in (month, partitions.add_months(month, 1)))
+        plan = CheckIn.objects.filter(user=self.user, timestamp__gte=start,
+                                      timestamp__lt=end).explain()
+        self.assertIn(partitions.partition_name(month), plan)
+        self.assertNotIn(partitions.partition_name(partitions.add_months(month, 1)), plan)
+        self.assertNotIn(partitions.DEFAULT_PARTITION, plan)
+
+    def test_old_rows_move_out_of_default(self):
+        old = datetime(2001, 3, 4, tzinfo=dt_timezone.utc)
+        CheckIn.objects.create(user=self.user, timestamp=old, mood=5, urge_level=5)
+        partitions.create_partition(date(2001, 3, 1))
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT COUNT(*) FROM "checkins_checkin_y2001m03"')
+            self.assertEqual(cursor.fetchone()[0], 1)
+        self.assertEqual(partitions.detach_partitions(date(2001, 4, 1), drop=True),
+                         ['checkins_checkin_y2001m03'])
+
+    def test_user_index_and_foreign_key_are_kept(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT indexname FROM pg_indexes WHERE tablename = %s AND indexdef LIKE %s",
+                [partitions.TABLE, '%(user_id)'],
+            )
+            self.assertEqual(len(cursor.fetchall()), 1)
+            constraints = connection.introspection.get_constraints(cursor, partitions.TABLE)
+        self.assertTrue(any(info['foreign_key'] == ('authentication_user', 'id')
+                            for info in constraints.values()))
+
+    def test_key_is_unique_across_timestamps(self):
+        """The lookup under the advisory lock catches a key resent with another time."""
+        row = {'timestamp': datetime(2025, 5, 20, tzinfo=dt_timezone.utc), 'mood': 5,
+               'urge_level': 2, 'idempotency_key': 'resent'}
+        [(first_id, _, _)] = CheckIn.objects.ingest(self.user, [row])
+        with CaptureQueriesContext(connection) as queries:
+            [(second_id, _, created)] = CheckIn.objects.ingest(
+                self.user, [{**row, 'timestamp': datetime(2025, 5, 21, tzinfo=dt_timezone.utc)}])
+        self.assertEqual((second_id, created), (first_id, False))
+        self.assertTrue(any('pg_advisory_xact_lock' in query['sql']
+                            for query in queries.captured_queries))
+        self.assertEqual(CheckIn.objects.count(), 1)
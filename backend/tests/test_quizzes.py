@@ -0,0 +1,163 @@
+"""
+Tests for the quiz pool and quiz endpoints.
+"""
+import asyncio
+import json
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.authentication.models import UserProfile
+from apps.dashboard.models import DailyRollup
+from apps.quizzes.models import Quiz, QuizAttempt
+from apps.quizzes.pool import apop_quiz, inline_flight, pop_quiz, stock
+from core.ai.client import AIClient, Completion
+
+User = get_user_model()
+
+QUESTIONS = [
+    {'id': f'q{i}', 'question': f'Q{i}?', 'options': ['a', 'b', 'c', 'd'], 'correct_answer': i % 4,
+     'explanation': 'because', 'tip': 'breathe'}
+    for i in range(3)
+]
+
+
+def fake_request(model, messages, params):
+    return Completion(text=json.dumps({'questions': QUESTIONS}), model=model)
+
+
+@override_settings(QUIZ_POOL_LOW_WATER=2, QUIZ_POOL_TARGET=4, QUIZ_POOL_MAX_SERVES=2)
+class QuizPoolTestCase(TestCase):
+    """Quizzes are served from a pre-generated pool."""
+
+    def setUp(self):
+        cache.clear()
+        inline_flight.reset()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=self.user)
+        patcher = mock.patch.object(AIClient, '_request', side_effect=fake_request)
+        self.ai = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def fill_pool(self, count):
+        return [Quiz.objects.create(domain='real_madrid', questions=QUESTIONS) for _ in range(count)]
+
+    def test_pop_serves_pooled_quiz_without_ai_call(self):
+        quizzes = self.fill_pool(5)
+        attempt = pop_quiz(self.user, 'real_madrid', 'easy')
+        self.assertEqual(attempt.quiz, quizzes[0])
+        self.ai.assert_not_called()
+
+    def test_pop_never_repeats_for_same_user(self):
+        self.fill_pool(5)
+        served = {pop_quiz(self.user, 'real_madrid', 'easy').quiz_id for _ in range(3)}
+        self.assertEqual(len(served), 3)
+
+    @override_settings(QUIZ_POOL_LOW_WATER=0)
+    def test_quiz_retires_after_max_serves(self):
+        [quiz] = self.fill_pool(1)
+        other = User.objects.create_user(username='o', email='o@example.com', password='pass-1234-word')
+        pop_quiz(self.user, 'real_madrid', 'easy')
+        pop_quiz(other, 'real_madrid', 'easy')
+        quiz.refresh_from_db()
+        self.assertEqual(quiz.serve_count, 2)
+        self.assertEqual(stock('real_madrid', 'easy'), 0)
+
+    @override_settings(QUIZ_POOL_LOW_WATER=0)
+    async def test_concurrent_empty_pool_pops_share_one_generation(self):
+        async def slow_arequest(model, messages, params):
+            await asyncio.sleep(0.1)
+            return fake_request(model, messages, params)
+
+        other = await User.objects.acreate(username='o', email='o@example.com')
+        with mock.patch.object(AIClient, '_arequest', side_effect=slow_arequest) as arequest:
+            first, second = await asyncio.gather(apop_quiz(self.user, 'real_madrid', 'easy'),
+                                                 apop_quiz(other, 'real_madrid', 'easy'))
+        arequest.assert_called_once()
+        self.assertEqual(first.quiz_id, second.quiz_id)
+        self.assertEqual(inline_flight.stats()['coalesced_local'], 1)
+
+    @override_settings(QUIZ_POOL_LOW_WATER=3)
+    def test_low_stock_triggers_refill(self):
+        """Dropping below the low-water mark refills the pool (eager Celery)."""
+        self.fill_pool(2)
+        pop_quiz(self.user, 'real_madrid', 'easy')
+        self.assertEqual(stock('real_madrid', 'easy'), 4)
+
+    def test_empty_pool_generates_inline(self):
+        attempt = pop_quiz(self.user, 'sherlock_holmes', 'hard')
+        self.assertEqual(attempt.quiz.domain, 'sherlock_holmes')
+        self.assertEqual(len(attempt.quiz.questions), 3)
+
+
+class QuizEndpointTestCase(TestCase):
+    """POST /quizzes and POST /quizzes/{id}/submit."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=self.user)
+        Quiz.objects.bulk_create([Quiz(domain='rdr2', questions=QUESTIONS) for _ in range(30)])
+        self.client = APIClient()
+        self.client.force_login(self.user)
+
+    def test_create_and_submit(self):
+        response = self.client.post(reverse('quizzes:quiz-list'), {'domain': 'rdr2'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        questions = response.json()['questions']
+        self.assertEqual(len(questions), 3)
+        self.assertEqual(set(questions[0]), {'id', 'question', 'options'})
+
+        url = reverse('quizzes:quiz-submit', args=[response.json()['id']])
+        result = self.client.post(url, {'answers': [0, 0, 2]}, format='json')
+        self.assertEqual(result.data['score'], 2)
+        self.assertEqual(result.data['results'][2]['correct_answer'], 2)
+        self.assertEqual(result.data['results'][0]['tip'], 'breathe')
+        self.assertEqual(UserProfile.objects.get(user=self.user).completed_quizzes, 1)
+        self.assertEqual(DailyRollup.objects.get(user=self.user).quiz_correct, 2)
+
+        again = self.client.post(url, {'answers': [0, 0, 2]}, format='json')
+        self.assertEqual(again.status_code, 400)
+
+    def test_concurrent_submit_counts_once(self):
+        response = self.client.post(reverse('quizzes:quiz-list'), {'domain': 'rdr2'}, format='json')
+        url = reverse('quizzes:quiz-submit', args=[response.json()['id']])
+        stale = QuizAttempt.objects.select_related('quiz').get(pk=response.json()['id'])
+        self.client.post(url, {'answers': [0, 0, 2]}, format='json')
+
+        # A second request that read the attempt before the first one saved it.
+        with mock.patch('apps.quizzes.views.get_object_or_404', return_value=stale):
+            again = self.client.post(url, {'answers': [1, 1, 1]}, format='json')
+        self.assertEqual(again.status_code, 400)
+        self.assertEqual(UserProfile.objects.get(user=self.user).completed_quizzes, 1)
+        self.assertEqual(DailyRollup.objects.get(user=self.user).quiz_count, 1)
+        self.assertEqual(QuizAttempt.objects.get(pk=stale.pk).score, 2)
+
+    def test_history_lists_attempts(self):
+        for _ in range(3):
+            self.client.post(reverse('quizzes:quiz-list'), {'domain': 'rdr2'}, format='json')
+        response = self.client.get(reverse('quizzes:quiz-list'))
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(QuizAttempt.objects.filter(user=self.user).count(), 3)
+
+    @override_settings(QUIZ_POOL_LOW_WATER=0)
+    def test_empty_pool_generates_asynchronously(self):
+        async def fake_arequest(model, messages, params):
+            return fake_request(model, messages, params)
+
+        with mock.patch.object(AIClient, '_arequest', side_effect=fake_arequest) as arequest:
+            response = self.client.post(reverse('quizzes:quiz-list'),
+                                        {'domain': 'sherlock_holmes'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['domain'], 'sherlock_holmes')
+        arequest.assert_called_once()
+
+    def test_unknown_domain_is_rejected(self):
+        response = self.client.post(reverse('quizzes:quiz-list'), {'domain': 'chess'}, format='json')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,110 @@
+"""
+Tests for the per-user WebSocket update channel.
+"""
+from asgiref.sync import sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from apps.authentication.models import Badge, UserProfile
+from config.asgi import application
+from core import realtime
+from core.consumers import UserUpdatesConsumer
+
+User = get_user_model()
+
+
+class RealtimeTestCase(TestCase):
+    """Check-ins and awards are pushed to the user's open sockets."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=self.user)
+
+    async def connect(self, user=None):
+        communicator = WebsocketCommunicator(UserUpdatesConsumer.as_asgi(), '/ws/updates/')
+        communicator.scope['user'] = user or self.user
+        connected, _ = await communicator.connect()
+        return communicator, connected
+
+    async def receive_all(self, communicator, count):
+        return {message['type']: message['data']
+                for message in [await communicator.receive_json_from() for _ in range(count)]}
+
+    async def test_anonymous_is_rejected(self):
+        communicator, connected = await self.connect(AnonymousUser())
+        self.assertFalse(connected)
+
+    async def test_ping(self):
+        communicator, connected = await self.connect()
+        self.assertTrue(connected)
+        await communicator.send_json_to({'type': 'ping', 'ts': 42})
+        self.assertEqual(await communicator.receive_json_from(), {'type': 'pong', 'ts': 42})
+        await communicator.disconnect()
+
+    async def test_presence_is_counted(self):
+        self.assertEqual(realtime.online([self.user.pk]), [])
+        communicator, _ = await self.connect()
+        self.assertEqual(realtime.online([self.user.pk]), [self.user.pk])
+        await communicator.disconnect()
+        self.assertEqual(realtime.online([self.user.pk]), [])
+
+    def post_checkin(self):
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('checkins:checkin-list'), {
+                'timestamp': '2025-05-20T08:30:00Z', 'mood': 6, 'urge_level': 3,
+            }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+
+    async def test_checkin_pushes_streak_and_rollups(self):
+        communicator, _ = await self.connect()
+        await sync_to_async(self.post_checkin)()
+        events = await self.receive_all(communicator, 2)
+        self.assertEqual(events['streak']['streak_count'], 1)
+        self.assertEqual(events['rollup']['daily'], [{
+            'period_start': '2025-05-20', 'urge_peak': 3,
+            'checkin_count': 1, 'mood_total': 6, 'urge_total': 3, 'exercise_count': 0,
+        }])
+        self.assertEqual(events['rollup']['weekly'][0]['period_start'], '2025-05-19')
+        await communicator.disconnect()
+
+    def award(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Badge.define({'id': 'first-week', 'name': 'First week'}).award_to([self.user])
+
+    async def test_award_pushes_badge(self):
+        communicator, _ = await self.connect()
+        await sync_to_async(self.award)()
+        event = await communicator.receive_json_from()
+        self.assertEqual(event['type'], 'badge')
+        self.assertEqual(event['data']['code'], 'first-week')
+        await communicator.disconnect()
+
+
+class SessionAuthTestCase(TransactionTestCase):
+    """
+    The ASGI stack authenticates sockets from the session cookie. Channels'
+    auth middleware closes the connection a TestCase transaction lives on.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+
+    async def test_session_cookie_authenticates(self):
+        await sync_to_async(self.client.force_login)(self.user)
+        session = self.client.cookies['sessionid'].value
+        communicator = WebsocketCommunicator(application, '/ws/updates/', headers=[
+            (b'cookie', f'sessionid={session}'.encode()), (b'origin', b'http://localhost'),
+        ])
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        await communicator.disconnect()
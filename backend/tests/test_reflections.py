@@ -0,0 +1,130 @@
+"""
+Tests for precomputed weekly reflections.
+"""
+import asyncio
+from datetime import date, datetime, timezone as dt_timezone
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from apps.dashboard.models import DailyRollup
+from apps.reflections.models import WeeklyReflection
+from apps.reflections.tasks import generate_weekly_reflections
+from apps.reflections.weekly import generate_due, last_week
+from core.ai.cache import get_cache
+from core.ai.client import AIClient, Completion
+from core.ai.exceptions import AIUpstreamError
+
+User = get_user_model()
+
+RECAP = 'A steady week. Next week: check in before lunch.'
+# A Sunday noon in UTC: already Monday in Kiritimati (UTC+14).
+SUNDAY = datetime(2025, 5, 25, 12, tzinfo=dt_timezone.utc)
+
+
+async def fake_arequest(self, model, messages, params):
+    return Completion(text=RECAP, model=model)
+
+
+class WeeklyReflectionTestCase(TestCase):
+    """Reflections are generated in batches and served from the stored row."""
+
+    def setUp(self):
+        cache.clear()
+        get_cache().clear()
+        self.url = reverse('reflections:weekly-reflection')
+
+    def make_user(self, name, tz='UTC', checkins=(), week=date(2025, 5, 12)):
+        user = User.objects.create_user(
+            username=name, email=f'{name}@example.com', password='pass-1234-word', timezone=tz
+        )
+        DailyRollup.objects.bulk_create([
+            DailyRollup(user=user, period_start=week.replace(day=week.day + offset),
+                        checkin_count=count, mood_total=count * 6, urge_total=count * 3)
+            for offset, count in enumerate(checkins)
+        ])
+        return user
+
+    def test_last_week_follows_user_timezone(self):
+        self.assertEqual(last_week('UTC', SUNDAY), date(2025, 5, 12))
+        self.assertEqual(last_week('Pacific/Kiritimati', SUNDAY), date(2025, 5, 19))
+
+    @mock.patch.object(AIClient, '_arequest', fake_arequest)
+    def test_batches_store_due_weeks_once(self):
+        users = [self.make_user(f'user{count}', checkins=[count, 1]) for count in (1, 2, 3)]
+        self.make_user('quiet')
+        self.make_user('early', tz='Pacific/Kiritimati', checkins=[1], week=date(2025, 5, 12))
+
+        self.assertEqual(generate_due(now=SUNDAY, batch_size=2), 3)
+        reflection = WeeklyReflection.objects.get(user=users[1])
+        self.assertEqual(reflection.week_start, date(2025, 5, 12))
+        self.assertEqual(reflection.recap, RECAP)
+        self.assertEqual(reflection.summary['checkins'], 3)
+        self.assertEqual(reflection.summary['avg_mood'], 6.0)
+        self.assertEqual([day['checkins'] for day in reflection.summary['days']], [2, 1, 0, 0, 0, 0, 0])
+        self.assertEqual(generate_weekly_reflections.apply(kwargs={}).get(), 0)
+
+    @override_settings(REFLECTION_AI_CONCURRENCY=2)
+    def test_ai_concurrency_is_bounded(self):
+        in_flight = []
+        peak = []
+
+        async def slow_arequest(client, model, messages, params):
+            in_flight.append(1)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.pop()
+            return Completion(text=RECAP, model=model)
+
+        for count in range(1, 7):
+            self.make_user(f'user{count}', checkins=[count])
+        with mock.patch.object(AIClient, '_arequest', slow_arequest):
+            self.assertEqual(generate_due(now=SUNDAY), 6)
+        self.assertEqual(max(peak), 2)
+
+    @mock.patch.object(AIClient, '_arequest', side_effect=AIUpstreamError('down'))
+    def test_failed_recaps_are_retried_later(self, _):
+        self.make_user('phoenix', checkins=[1])
+        self.assertEqual(generate_due(now=SUNDAY), 0)
+        self.assertFalse(WeeklyReflection.objects.exists())
+
+    @mock.patch.object(AIClient, '_arequest', side_effect=AIUpstreamError('down'))
+    def test_endpoint_reads_stored_reflection(self, _):
+        user = self.make_user('phoenix')
+        WeeklyReflection.objects.create(
+            user=user, week_start=last_week('UTC'), summary={'checkins': 4}, recap=RECAP
+        )
+        self.client.force_login(user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            'week_start': last_week('UTC').isoformat(), 'summary': {'checkins': 4}, 'recap': RECAP,
+        })
+
+    @mock.patch.object(AIClient, '_arequest', fake_arequest)
+    def test_endpoint_falls_back_to_live_generation(self):
+        user = self.make_user('phoenix', checkins=[2], week=last_week('UTC'))
+        self.client.force_login(user)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['summary']['checkins'], 2)
+        self.assertEqual(WeeklyReflection.objects.get(user=user).recap, RECAP)
+
+    @mock.patch.object(AIClient, '_arequest', side_effect=AIUpstreamError('down'))
+    def test_endpoint_upstream_failure(self, _):
+        self.client.force_login(self.make_user('phoenix'))
+        self.assertEqual(self.client.get(self.url).status_code, 503)
+
+    @mock.patch.object(AIClient, '_arequest', fake_arequest)
+    def test_endpoint_is_ai_throttled(self):
+        self.client.force_login(self.make_user('phoenix'))
+        config = dict(settings.REST_FRAMEWORK)
+        config['DEFAULT_THROTTLE_RATES'] = {**config['DEFAULT_THROTTLE_RATES'], 'ai': '1/min'}
+        with override_settings(REST_FRAMEWORK=config):
+            self.assertEqual(self.client.get(self.url).status_code, 200)
+            self.assertEqual(self.client.get(self.url).status_code, 429)
+
+    def test_requires_login(self):
+        self.assertEqual(self.client.get(self.url).status_code, 401)
@@ -0,0 +1,59 @@
+"""
+Tests for soft-delete managers and set-based soft delete/restore.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.authentication.models import UserProfile
+from apps.checkins.models import CheckIn
+
+User = get_user_model()
+
+
+class SoftDeleteTestCase(TestCase):
+    """Inactive rows are hidden by default and toggled with one UPDATE."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=self.user)
+        self.checkins = [
+            CheckIn.objects.create(user=self.user, timestamp=timezone.now(), mood=5, urge_level=5)
+            for _ in range(3)
+        ]
+
+    def test_queryset_soft_delete_is_one_update(self):
+        with CaptureQueriesContext(connection) as queries:
+            deleted = CheckIn.objects.filter(user=self.user).soft_delete()
+        self.assertEqual(deleted, 3)
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0]['sql'].startswith('UPDATE'))
+        self.assertFalse(CheckIn.objects.exists())
+        self.assertEqual(CheckIn.all_objects.inactive().count(), 3)
+
+    def test_restore(self):
+        CheckIn.objects.soft_delete()
+        self.assertEqual(CheckIn.all_objects.filter(user=self.user).restore(), 3)
+        self.assertEqual(CheckIn.objects.count(), 3)
+
+    def test_related_managers_hide_inactive_rows(self):
+        self.checkins[0].soft_delete()
+        self.assertEqual(self.user.checkins.count(), 2)
+        self.assertFalse(CheckIn.all_objects.get(pk=self.checkins[0].pk).is_active)
+
+    def test_instance_restore(self):
+        checkin = self.checkins[0]
+        checkin.soft_delete()
+        self.assertTrue(checkin.is_deleted)
+        checkin.restore()
+        self.assertFalse(checkin.is_deleted)
+        self.assertTrue(CheckIn.objects.filter(pk=checkin.pk).exists())
+
+    def test_replayed_key_of_deleted_checkin_is_a_duplicate(self):
+        row = {'timestamp': timezone.now(), 'mood': 4, 'urge_level': 2, 'idempotency_key': 'k1'}
+        [(checkin_id, _, created)] = CheckIn.objects.ingest(self.user, [row])
+        CheckIn.objects.filter(pk=checkin_id).soft_delete()
+        self.assertEqual(CheckIn.objects.ingest(self.user, [row]), [(checkin_id, 'k1', False)])
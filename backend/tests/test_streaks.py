@@ -0,0 +1,92 @@
+"""
+Tests for the timezone-aware streak engine.
+"""
+from datetime import date, datetime, timezone as dt_timezone
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from apps.authentication.models import UserProfile
+from apps.checkins.models import CheckIn
+from apps.checkins.streaks import current_streak, record_checkins, recompute_streaks
+
+User = get_user_model()
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+def checkin(ts):
+    return {'timestamp': ts, 'mood': 5, 'urge_level': 2}
+
+
+class StreakTestCase(TestCase):
+    """Streak counting on local calendar days."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word',
+            timezone='America/Los_Angeles',
+        )
+        self.profile = UserProfile.objects.create(user=self.user)
+
+    def profile_state(self):
+        self.profile.refresh_from_db()
+        return self.profile.streak_count, self.profile.last_checkin_date
+
+    def test_consecutive_local_days_extend_streak(self):
+        """Check-ins on consecutive local days count up."""
+        for day in (1, 2, 3):
+            CheckIn.objects.ingest(self.user, [checkin(utc(2025, 5, day, 18))])
+        self.assertEqual(self.profile_state(), (3, date(2025, 5, 3)))
+
+    def test_buckets_use_user_timezone(self):
+        """
+        02:00 and 22:00 UTC on the same UTC day are consecutive days in
+        Los Angeles, and 06:00 UTC the next day is still the second one.
+        """
+        CheckIn.objects.ingest(self.user, [checkin(utc(2025, 5, 2, 2))])   # May 1 local
+        CheckIn.objects.ingest(self.user, [checkin(utc(2025, 5, 2, 22))])  # May 2 local
+        CheckIn.objects.ingest(self.user, [checkin(utc(2025, 5, 3, 6))])   # May 2 local
+        self.assertEqual(self.profile_state(), (2, date(2025, 5, 2)))
+
+    def test_gap_resets_streak(self):
+        """Missing a local day starts a new streak."""
+        CheckIn.objects.ingest(self.user, [checkin(utc(2025, 5, 1, 18))])
+        CheckIn.objects.ingest(self.user, [checkin(utc(2025, 5, 3, 18))])
+        self.assertEqual(self.profile_state(), (1, date(2025, 5, 3)))
+
+    def test_late_checkin_bridging_gap_is_repaired(self):
+        """An offline check-in that fills a past gap rebuilds the streak."""
+        CheckIn.objects.ingest(self.user, [checkin(utc(2025, 5, 1, 18))])
+        CheckIn.objects.ingest(self.user, [checkin(utc(2025, 5, 3, 18))])
+        CheckIn.objects.ingest(self.user, [checkin(utc(2025, 5, 2, 18))])
+        self.assertEqual(self.profile_state(), (3, date(2025, 5, 3)))
+
+    def test_increment_is_a_single_update(self):
+        """The incremental path does not read the profile row."""
+        CheckIn.objects.ingest(self.user, [checkin(utc(2025, 5, 1, 18))])
+        with self.assertNumQueries(1):
+            record_checkins(self.user, [utc(2025, 5, 2, 18)])
+        self.assertEqual(self.profile_state(), (2, date(2025, 5, 2)))
+
+    def test_update_streak_delegates_to_engine(self):
+        """The legacy profile method goes through the same engine."""
+        self.profile.update_streak(utc(2025, 5, 1, 18))
+        self.profile.update_streak(utc(2025, 5, 2, 18))
+        self.assertEqual(self.profile.streak_count, 2)
+
+    def test_current_streak_expires_after_missed_day(self):
+        """A streak whose last day is before yesterday displays as zero."""
+        CheckIn.objects.ingest(self.user, [checkin(utc(2025, 5, 1, 18))])
+        self.profile.refresh_from_db()
+        tz = self.user.timezone
+        self.assertEqual(current_streak(self.profile, tz, today=date(2025, 5, 2)), 1)
+        self.assertEqual(current_streak(self.profile, tz, today=date(2025, 5, 3)), 0)
+
+    def test_recompute_rebuilds_from_history(self):
+        """The repair job derives streaks from stored check-ins."""
+        CheckIn.objects.bulk_create([
+            CheckIn(user=self.user, **checkin(utc(2025, 5, day, 18))) for day in (1, 3, 4, 5)
+        ])
+        self.assertEqual(recompute_streaks(user_ids=[self.user.pk]), 1)
+        self.assertEqual(self.profile_state(), (3, date(2025, 5, 5)))
@@ -0,0 +1,101 @@
+"""
+Tests for the SSE streaming endpoints.
+"""
+import json
+from unittest import mock
+from django.test import TestCase
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from apps.reflections.weekly import last_week
+from apps.simulations.models import Simulation
+from apps.simulations.views import parse_scene
+from core.ai.client import AIClient
+
+User = get_user_model()
+
+SCENE = ['You get home ', 'and the house is quiet.\n', 'Choices: Call a friend | Go for a walk']
+
+
+async def fake_stream(self, model, messages, params):
+    for part in SCENE:
+        yield part
+
+
+def read_events(body):
+    events = []
+    for block in body.strip().split('\n\n'):
+        event, data = block.split('\n')
+        events.append((event[len('event: '):], json.loads(data[len('data: '):])))
+    return events
+
+
+@mock.patch.object(AIClient, '_stream_request', fake_stream)
+class SimulationStreamTestCase(TestCase):
+    """Simulation scenes are streamed token by token."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+
+    async def stream(self, url, payload):
+        response = await self.async_client.post(url, payload, content_type='application/json')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        return read_events(body.decode())
+
+    async def test_start_streams_tokens_then_done(self):
+        await self.async_client.aforce_login(self.user)
+        events = await self.stream(reverse('simulations:simulation-start'), {})
+
+        self.assertEqual([name for name, _ in events],
+                         ['simulation', 'token', 'token', 'token', 'done'])
+        self.assertEqual(events[-1][1]['choices'], ['Call a friend', 'Go for a walk'])
+        simulation = await Simulation.objects.aget(user=self.user)
+        self.assertEqual(simulation.steps[0]['narrative'],
+                         'You get home and the house is quiet.')
+
+    async def test_choose_continues_scenario(self):
+        await self.async_client.aforce_login(self.user)
+        events = await self.stream(reverse('simulations:simulation-start'), {})
+        url = reverse('simulations:simulation-choose', args=[events[0][1]['id']])
+        await self.stream(url, {'choice': 1})
+
+        simulation = await Simulation.objects.aget(user=self.user)
+        self.assertEqual(len(simulation.steps), 2)
+        self.assertEqual(simulation.steps[0]['chosen'], 1)
+
+    async def test_invalid_choice_is_rejected(self):
+        await self.async_client.aforce_login(self.user)
+        events = await self.stream(reverse('simulations:simulation-start'), {})
+        url = reverse('simulations:simulation-choose', args=[events[0][1]['id']])
+        response = await self.async_client.post(url, {'choice': 5}, content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+
+    async def test_requires_authentication(self):
+        response = await self.async_client.post(reverse('simulations:simulation-start'))
+        self.assertEqual(response.status_code, 401)
+
+    def test_parse_scene_without_choices_ends_scenario(self):
+        self.assertEqual(parse_scene('The end.'), ('The end.', []))
+
+
+@mock.patch.object(AIClient, '_stream_request', fake_stream)
+class WeeklyRecapStreamTestCase(TestCase):
+    """The weekly recap streams its summary first, then the text."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+
+    async def test_summary_precedes_tokens(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('reflections:weekly-recap-stream'))
+        body = b''.join([chunk async for chunk in response.streaming_content])
+        events = read_events(body.decode())
+        self.assertEqual(events[0][0], 'summary')
+        self.assertEqual(events[0][1]['checkins'], 0)
+        # The same week that GET /reflections/weekly serves.
+        self.assertEqual(events[0][1]['week_start'], last_week(self.user.timezone).isoformat())
+        self.assertEqual(events[-1][0], 'done')
@@ -0,0 +1,145 @@
+"""
+Tests for the sliding-window throttles.
+"""
+import asyncio
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from core.throttling import KEY_PREFIX, SlidingWindow, throttle_metrics
+
+User = get_user_model()
+
+
+def rates(**overrides):
+    config = dict(settings.REST_FRAMEWORK)
+    config['DEFAULT_THROTTLE_RATES'] = {**config['DEFAULT_THROTTLE_RATES'], **overrides}
+    return override_settings(REST_FRAMEWORK=config)
+
+
+class SlidingWindowTestCase(TestCase):
+    """Counts are estimated from two counters per client."""
+
+    def setUp(self):
+        cache.clear()
+
+    @rates(test='3/min')
+    def test_limits_within_a_window(self):
+        window = SlidingWindow('test')
+        now = 600.0
+        self.assertEqual([window.check('a', now) for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(window.check('a', now), 60.0)
+        self.assertEqual(window.check('b', now), 0)
+
+    @rates(test='3/min')
+    def test_previous_window_weighs_in(self):
+        window = SlidingWindow('test')
+        for _ in range(3):
+            window.check('a', 600.0)
+        self.assertGreater(window.check('a', 660.0), 0)
+        # A third of the way into the next window, 2/3 of the old count still weighs.
+        self.assertEqual(window.check('a', 680.0), 0)
+        self.assertGreater(window.check('a', 680.0), 0)
+        self.assertEqual(window.check('a', 700.0), 0)
+
+    @rates(test='100/min')
+    def test_state_is_two_counters(self):
+        window = SlidingWindow('test')
+        for second in range(600, 720):
+            window.check('a', float(second))
+        keys = [key for key in cache._cache if KEY_PREFIX + 'test:' in key]
+        self.assertLessEqual(len(keys), 2)
+
+    @rates(test='3/min')
+    def test_concurrent_checks_cannot_share_the_last_slot(self):
+        window = SlidingWindow('test')
+        for _ in range(2):
+            window.check('a', 600.0)
+        decide = SlidingWindow._wait
+        racing = []
+
+        def interleaved(self, *counts):
+            # A second request arrives between the first one's count and its decision.
+            if not racing:
+                racing.append(None)
+                racing.append(window.check('a', 600.0))
+            return decide(self, *counts)
+
+        with mock.patch.object(SlidingWindow, '_wait', interleaved):
+            first = window.check('a', 600.0)
+        self.assertEqual(sorted([first, racing[1]]), [0, 60.0])
+        # The throttled request gave its slot back.
+        self.assertEqual(cache.get(KEY_PREFIX + 'test:a:10'), 3)
+
+    @rates(test='3/min')
+    async def test_async_concurrent_checks_cannot_share_the_last_slot(self):
+        window = SlidingWindow('test')
+        for _ in range(2):
+            await window.acheck('a', 600.0)
+        results = await asyncio.gather(window.acheck('a', 600.0), window.acheck('a', 600.0))
+        self.assertEqual(sorted(results), [0, 60.0])
+
+    def test_unconfigured_scope_is_unlimited(self):
+        self.assertEqual(SlidingWindow('nope').check('a'), 0)
+
+
+class ThrottledEndpointTestCase(TestCase):
+    """Throttled endpoints answer 429 with Retry-After and are counted."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        self.client = APIClient()
+
+    @rates(checkins='2/min')
+    def test_drf_view_scope(self):
+        self.client.force_authenticate(self.user)
+        url = reverse('checkins:checkin-batch')
+        for _ in range(2):
+            self.assertNotEqual(self.client.post(url, {'checkins': []}, format='json').status_code, 429)
+        response = self.client.post(url, {'checkins': []}, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        # Reads are not in the check-in scope.
+        self.assertEqual(self.client.get(reverse('checkins:checkin-list')).status_code, 200)
+
+    @rates(login='2/min')
+    def test_async_login_view(self):
+        url = reverse('authentication:login')
+        body = {'username': 'phoenix', 'password': 'wrong-password'}
+        for _ in range(2):
+            self.assertEqual(self.client.post(url, body, format='json').status_code, 401)
+        response = self.client.post(url, body, format='json')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(throttle_metrics()['throttled']['login'], 1)
+
+    def test_spoofed_forwarded_for_does_not_reset_login_window(self):
+        url = reverse('authentication:login')
+        body = {'username': 'phoenix', 'password': 'wrong-password'}
+        config = {**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1}
+        config['DEFAULT_THROTTLE_RATES'] = {**config['DEFAULT_THROTTLE_RATES'], 'login': '2/min'}
+        with override_settings(REST_FRAMEWORK=config):
+            statuses = [
+                # The load balancer appends the real address after whatever the client sent.
+                self.client.post(url, body, format='json',
+                                 HTTP_X_FORWARDED_FOR=f'10.0.0.{attempt}, 198.51.100.9').status_code
+                for attempt in range(3)
+            ]
+        self.assertEqual(statuses, [401, 401, 429])
+
+    @rates(login='2/min')
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        url = reverse('authentication:login')
+        body = {'username': 'phoenix', 'password': 'wrong-password'}
+        statuses = [
+            self.client.post(url, body, format='json',
+                             HTTP_X_FORWARDED_FOR=f'10.0.0.{attempt}').status_code
+            for attempt in range(3)
+        ]
+        self.assertEqual(statuses, [401, 401, 429])
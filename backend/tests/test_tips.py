@@ -0,0 +1,140 @@
+"""
+Tests for the tips index, per-user rankings and the tips feed.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from apps.authentication.models import UserProfile
+from apps.checkins.models import CheckIn
+from apps.quizzes.models import Quiz, QuizAttempt
+from apps.tips import ranking
+from apps.tips.models import Tip, normalise_terms
+
+User = get_user_model()
+
+
+class TipRankingTestCase(TestCase):
+    """Rankings are built from history and updated in place on activity."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=self.user)
+        self.work = Tip.objects.create(title='Work', content='...', triggers=['Work stress'])
+        self.phone = Tip.objects.create(title='Phone', content='...', triggers=['phone'])
+        self.sleep = Tip.objects.create(title='Sleep', content='...', tags=['sleep'])
+
+    def checkin(self, trigger, urge=8):
+        with self.captureOnCommitCallbacks(execute=True):
+            CheckIn.objects.ingest(self.user, [{
+                'timestamp': timezone.now(), 'mood': 5, 'urge_level': urge, 'trigger_context': trigger,
+            }])
+
+    def ranked(self):
+        return [Tip.objects.get(pk=tip_id).title for tip_id in ranking.ranked_ids(self.user.pk)]
+
+    def test_normalise_terms(self):
+        self.assertEqual(normalise_terms(['Work  Stress', 'work stress!', ' ', 'Sci_Fi']),
+                         ['work stress', 'sci_fi'])
+
+    def test_trigger_terms_are_word_runs(self):
+        self.assertEqual(ranking.trigger_terms('Work stress'),
+                         {'trigger:work', 'trigger:stress', 'trigger:work stress'})
+
+    def test_unmatched_tips_follow_newest_first(self):
+        self.assertEqual(self.ranked(), ['Sleep', 'Phone', 'Work'])
+
+    def test_ranking_is_rebuilt_from_history(self):
+        self.checkin('Work stress again')
+        cache.clear()
+        self.assertEqual(self.ranked()[0], 'Work')
+
+    def test_checkins_update_cached_ranking_without_queries(self):
+        self.checkin('work stress', urge=3)
+        self.assertEqual(self.ranked()[0], 'Work')
+        self.checkin('my phone', urge=9)
+        with self.assertNumQueries(0):
+            ranked = ranking.ranked_ids(self.user.pk)
+        self.assertEqual(ranked[:2], [str(self.phone.pk), str(self.work.pk)])
+
+    def test_tip_changes_rebuild_index_and_rerank(self):
+        self.checkin('phone')
+        self.ranked()
+        late = Tip.objects.create(title='Late night', content='...', triggers=['phone'])
+        self.assertEqual(self.ranked()[:2], ['Late night', 'Phone'])
+        late.soft_delete()
+        self.assertNotIn('Late night', self.ranked())
+
+    def test_bulk_tip_writes_rebuild_index(self):
+        self.checkin('phone')
+        self.ranked()
+        [late] = Tip.objects.bulk_create([Tip(title='Late night', content='...', triggers=['Phone!'])])
+        self.assertEqual(self.ranked()[:2], ['Late night', 'Phone'])
+        Tip.objects.filter(pk=late.pk).soft_delete()
+        self.assertNotIn('Late night', self.ranked())
+        Tip.all_objects.filter(pk=late.pk).restore()
+        self.assertIn('Late night', self.ranked())
+        Tip.objects.filter(pk=self.phone.pk).update(triggers=['Sleep'])
+        self.assertEqual(self.ranked()[0], 'Late night')
+        Tip.objects.filter(pk=late.pk).delete()
+        self.assertNotIn('Late night', self.ranked())
+
+    def test_submitted_quiz_boosts_domain_tips(self):
+        tagged = Tip.objects.create(title='Space', content='...', tags=['sci_fi'])
+        self.ranked()
+        self.assertEqual(ranking.quiz_tips(self.user.pk, 'sci_fi', count=1), [str(tagged.pk)])
+        ranking.add_quiz(self.user.pk, 'sci_fi')
+        self.assertEqual(self.ranked()[0], 'Space')
+
+
+class TipFeedTestCase(TestCase):
+    """GET /tips pages through the precomputed ranking."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.tips = [Tip.objects.create(title=f'Tip {i}', content='...') for i in range(5)]
+        self.url = reverse('tips:tip-feed')
+
+    def test_pages_are_slices_of_the_ranking(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(1):
+            first = self.client.get(self.url + '?page_size=2').json()
+        self.assertEqual([tip['title'] for tip in first['results']], ['Tip 4', 'Tip 3'])
+        second = self.client.get(first['next']).json()
+        self.assertEqual([tip['title'] for tip in second['results']], ['Tip 2', 'Tip 1'])
+        last = self.client.get(self.url + f'?after_id={self.tips[1].pk}').json()
+        self.assertEqual([tip['title'] for tip in last['results']], ['Tip 0'])
+        self.assertIsNone(last['next'])
+
+    def test_unknown_after_id(self):
+        self.assertEqual(self.client.get(self.url + '?after_id=nope').status_code, 404)
+
+    def test_quiz_tips(self):
+        questions = [{'id': 'q0', 'question': 'Q?', 'options': ['a', 'b'], 'correct_answer': 0, 'tip': 'breathe'}]
+        attempt = QuizAttempt.objects.create(
+            user=self.user, quiz=Quiz.objects.create(domain='sci_fi', questions=questions)
+        )
+        tagged = Tip.objects.create(title='Space', content='...', tags=['sci_fi'])
+        Tip.objects.create(title='Newest', content='...')
+        url = reverse('quizzes:quiz-tips', args=[attempt.pk])
+
+        data = self.client.get(url).json()
+        self.assertEqual(data['lesson_tips'], [])
+        self.assertEqual([tip['id'] for tip in data['tips']][0], str(tagged.pk))
+        self.assertEqual(len(data['tips']), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('quizzes:quiz-submit', args=[attempt.pk]), {'answers': [0]},
+                             format='json')
+        self.assertEqual(self.client.get(url).json()['lesson_tips'], ['breathe'])
+        self.assertEqual(ranking.get_ranking(self.user.pk)['weights'], {'tag:sci_fi': 1.0})
@@ -0,0 +1,81 @@
+"""
+Tests for the cached session and authenticated-user lookup.
+"""
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from apps.authentication.models import UserProfile
+from core.user_cache import get_cached_user
+
+User = get_user_model()
+
+
+class UserCacheTestCase(TestCase):
+    """Authenticated requests resolve the session and user without queries."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='phoenix', email='phoenix@example.com', password='pass-1234-word'
+        )
+        UserProfile.objects.create(user=self.user)
+        self.client = APIClient()
+        response = self.client.post(reverse('authentication:login'),
+                                    {'username': 'phoenix', 'password': 'pass-1234-word'})
+        self.assertEqual(response.status_code, 200)
+
+    def profile(self):
+        return self.client.get(reverse('authentication:profile')).data
+
+    def test_steady_state_auth_costs_no_queries(self):
+        self.profile()
+        self.assertIsNotNone(get_cached_user(self.user.pk))
+        # Only the awards prefetch runs: no session, user or profile query.
+        with self.assertNumQueries(1):
+            self.profile()
+
+    def test_profile_update_invalidates(self):
+        self.profile()
+        self.client.patch(reverse('authentication:profile-update'), {'first_name': 'Ash'})
+        self.assertIsNone(get_cached_user(self.user.pk))
+        self.assertEqual(self.profile()['first_name'], 'Ash')
+
+    def test_password_change_invalidates(self):
+        self.profile()
+        response = self.client.post(reverse('authentication:password-change'), {
+            'old_password': 'pass-1234-word', 'new_password': 'new-pass-5678-word',
+            'new_password2': 'new-pass-5678-word',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(get_cached_user(self.user.pk))
+
+    def test_logout_invalidates(self):
+        self.profile()
+        self.client.post(reverse('authentication:logout'))
+        self.assertIsNone(get_cached_user(self.user.pk))
+        self.assertEqual(self.client.get(reverse('authentication:profile')).status_code, 403)
+
+    def test_checkin_streak_is_visible_immediately(self):
+        self.profile()
+        self.client.post(reverse('checkins:checkin-list'), {
+            'timestamp': timezone.now().isoformat(), 'mood': 6, 'urge_level': 3,
+        }, format='json')
+        self.assertEqual(self.profile()['profile']['streak_count'], 1)
+
+    def test_soft_delete_invalidates(self):
+        self.profile()
+        self.user.soft_delete()
+        self.assertIsNone(get_cached_user(self.user.pk))
+        self.assertEqual(self.client.get(reverse('authentication:profile')).status_code, 403)
+
+    def test_set_based_soft_delete_and_restore_invalidate(self):
+        for queryset in (User.all_objects.filter(pk=self.user.pk),
+                         UserProfile.all_objects.filter(user=self.user)):
+            for change in (queryset.soft_delete, queryset.restore):
+                self.profile()
+                self.assertIsNotNone(get_cached_user(self.user.pk))
+                self.assertEqual(change(), 1)
+                self.assertIsNone(get_cached_user(self.user.pk))